@@ -1,9 +1,10 @@
+import functools
 import logging
 
 from bpm_ai_core.classification.zero_shot_classifier import ZeroShotClassifier, ClassificationResult
 
 try:
-    from transformers import pipeline, AutoTokenizer
+    from transformers import pipeline
     has_transformers = True
 except ImportError:
     has_transformers = False
@@ -14,6 +15,11 @@ DEFAULT_MODEL_EN = "MoritzLaurer/deberta-v3-large-zeroshot-v1.1-all-33"
 DEFAULT_MODEL_MULTI = "MoritzLaurer/mDeBERTa-v3-base-mnli-xnli"
 
 
+@functools.lru_cache(maxsize=None)
+def _get_pipeline(model: str):
+    return pipeline("zero-shot-classification", model=model)
+
+
 class TransformersClassifier(ZeroShotClassifier):
     """
     Local zero-shot classification model based on Huggingface transformers library.
@@ -32,9 +38,9 @@ class TransformersClassifier(ZeroShotClassifier):
             classes: list[str],
             hypothesis_template: str | None = None
     ) -> ClassificationResult:
-        zeroshot_classifier = pipeline("zero-shot-classification", model=self.model)
+        zeroshot_classifier = _get_pipeline(self.model)
 
-        tokenizer = AutoTokenizer.from_pretrained(self.model)
+        tokenizer = zeroshot_classifier.tokenizer
         input_tokens = len(tokenizer.encode(text))
         max_tokens = tokenizer.model_max_length
         logger.debug(f"Input tokens: {input_tokens}")
@@ -1,12 +1,24 @@
-import httpx
+import functools
+
+from bpm_ai_core.util.image import ImageOptions
 
 DEFAULT_MODEL = "claude-3-opus-20240229"
 DEFAULT_TEMPERATURE = 0.0
 DEFAULT_MAX_RETRIES = 8
+DEFAULT_IMAGE_OPTIONS = ImageOptions(max_long_side=1568, max_pixels=1_150_000)
+"""Larger images are downscaled by the API, so sending them in full resolution only adds upload time."""
+PROMPT_CACHING_BETA = "prompt-caching-2024-07-31"
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+@functools.lru_cache(maxsize=None)
+def default_client_kwargs() -> dict:
+    # the shared http client is only created on first use, keeping imports cheap
+    import httpx
 
-default_client_kwargs = {
-    "http_client": httpx.AsyncClient(
-        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
-    ),
-    "max_retries": 0  # we use own retry logic
-}
\ No newline at end of file
+    return {
+        "http_client": httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+        ),
+        "max_retries": 0  # we use own retry logic
+    }
@@ -4,15 +4,17 @@ from typing import Dict, Any, Optional, List
 
 from bpm_ai_core.llm.anthropic_chat import get_anthropic_client
 from bpm_ai_core.llm.anthropic_chat._constants import DEFAULT_MODEL, DEFAULT_TEMPERATURE, \
-    DEFAULT_MAX_RETRIES
+    DEFAULT_MAX_RETRIES, DEFAULT_IMAGE_OPTIONS, PROMPT_CACHING_BETA
 from bpm_ai_core.llm.anthropic_chat.tools.tool import AnthropicTool
 from bpm_ai_core.llm.anthropic_chat.tools.tool_user import ToolUser
-from bpm_ai_core.llm.anthropic_chat.util import messages_to_anthropic_dicts
+from bpm_ai_core.llm.anthropic_chat.util import messages_to_anthropic_dicts, system_prompt_to_anthropic_blocks, \
+    add_cache_control, anthropic_usage_dict
 from bpm_ai_core.llm.common.llm import LLM
 from bpm_ai_core.llm.common.message import ChatMessage, ToolCallMessage, AssistantMessage, SystemMessage
 from bpm_ai_core.llm.common.tool import Tool
 from bpm_ai_core.prompt.prompt import Prompt
 from bpm_ai_core.tracing.tracing import Tracing
+from bpm_ai_core.util.image import ImageOptions
 from bpm_ai_core.util.json_schema import expand_simplified_json_schema
 
 logger = logging.getLogger(__name__)
@@ -39,7 +41,9 @@ class ChatAnthropic(LLM):
         model: str = DEFAULT_MODEL,
         temperature: float = DEFAULT_TEMPERATURE,
         max_retries: int = DEFAULT_MAX_RETRIES,
-        client: AsyncAnthropic = None
+        client: AsyncAnthropic = None,
+        image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS,
+        prompt_caching: bool = True
     ):
         if not has_anthropic:
             raise ImportError('anthropic is not installed')
@@ -54,6 +58,8 @@ class ChatAnthropic(LLM):
             ]
         )
         self.client = client
+        self.image_options = image_options
+        self.prompt_caching = prompt_caching
 
     @classmethod
     def for_anthropic(
@@ -80,35 +86,63 @@ class ChatAnthropic(LLM):
             result_dict = await self._run_output_schema_completion(messages, output_schema, current_try)
             return AssistantMessage(content=result_dict)
         elif tools:
-            result_dict = await self._run_tool_completion(messages, tools)
+            result_dict = await self._run_tool_completion(messages, tools, current_try)
             return self._tool_calls_to_tool_message(result_dict, tools)
         else:
             completion = await self._run_completion(messages, stop, current_try)
             return AssistantMessage(content=completion.content[0].text.strip())
 
-    async def _run_completion(self, messages: List[ChatMessage], stop: list[str] = None, current_try: int = None) -> Message:
+    async def _run_completion(
+        self,
+        messages: List[ChatMessage],
+        stop: list[str] = None,
+        current_try: int = None,
+        system_suffix: str = None
+    ) -> Message:
+        """
+        The system prompt and the messages before the last user message (e.g. few-shot examples) are marked as
+        cacheable prefix if prompt caching is enabled, a system_suffix is appended to the system prompt after it.
+        """
+        system = messages[0].content if (messages and messages[0].role == "system") else ""
+        conversation = messages[1:] if system else messages
+        system_blocks = system_prompt_to_anthropic_blocks(system, system_suffix, self.prompt_caching)
+        message_dicts = await messages_to_anthropic_dicts(conversation, self.image_options)
+        # trace the full prompt, including the system prompt and its suffix
+        if system_suffix:
+            full_system = f"{system}\n\n{system_suffix}" if system else system_suffix
+            messages = [SystemMessage(content=full_system), *conversation]
         Tracing.tracers().start_llm_trace(self, messages, current_try, None)
         completion = await self.client.messages.create(
             max_tokens=4096,
             model=self.model,
             temperature=self.temperature,
-            system=messages.pop(0).content if (messages and messages[0].role == "system") else "",
-            messages=messages_to_anthropic_dicts(messages),
-            stop_sequences=stop
+            **({"system": system_blocks} if system_blocks else {}),
+            messages=add_cache_control(message_dicts) if self.prompt_caching else message_dicts,
+            stop_sequences=stop,
+            **({"extra_headers": {"anthropic-beta": PROMPT_CACHING_BETA}} if self.prompt_caching else {})
         )
-        Tracing.tracers().end_llm_trace(completion.content[0].text)
+        Tracing.tracers().end_llm_trace(completion.content[0].text, usage=anthropic_usage_dict(completion.usage))
         return completion
 
-    async def _run_tool_completion(self, messages: list[ChatMessage], tools: list[Tool] = None) -> dict:
-        tool_user = ToolUser(tools=[
-            AnthropicTool(name=tool.name, description=tool.description, args_schema=tool.args_schema)
-            for tool in tools
-        ])
-        return await tool_user.use_tools(
-            messages=messages_to_anthropic_dicts(messages),
+    async def _run_tool_completion(self, messages: list[ChatMessage], tools: list[Tool] = None, current_try: int = None) -> dict:
+        tool_user = ToolUser(
+            tools=[
+                AnthropicTool(name=tool.name, description=tool.description, args_schema=tool.args_schema)
+                for tool in tools
+            ],
+            client=self.client,
+            model=self.model,
+            prompt_caching=self.prompt_caching
+        )
+        message_dicts = await messages_to_anthropic_dicts(messages, self.image_options)
+        Tracing.tracers().start_llm_trace(self, messages, current_try, tools)
+        result = await tool_user.use_tools(
+            messages=message_dicts,
             execution_mode='manual',
             verbose=0
         )
+        Tracing.tracers().end_llm_trace(result, usage=anthropic_usage_dict(tool_user.usage))
+        return result
 
     async def _run_output_schema_completion(self, messages: list[ChatMessage], output_schema: dict[str, Any], current_try: int = None) -> dict:
         output_schema = expand_simplified_json_schema(output_schema)
@@ -116,15 +150,13 @@ class ChatAnthropic(LLM):
             "output_schema",
             output_schema=json.dumps(output_schema, indent=2)
         ).format()[0].content
-        if messages[0].role == "system":
-            messages[0].content += f"\n\n{output_prompt}"
-        else:
-            messages.insert(0, SystemMessage(content=output_prompt))
+        # the messages are reused on retries, so they are not modified
         if messages[-1].role == "assistant":
             logger.warning("Ignoring trailing assistant message.")
-            messages.pop()
-        messages.append(AssistantMessage(content="<result>"))
-        completion = await self._run_completion(messages, stop=["</result>"], current_try=current_try)
+            messages = messages[:-1]
+        messages = [*messages, AssistantMessage(content="<result>")]
+        # the schema differs per task, so it goes after the cacheable system prompt
+        completion = await self._run_completion(messages, stop=["</result>"], current_try=current_try, system_suffix=output_prompt)
         try:
             json_object = json.loads(completion.content[0].text.strip())
         except ValueError:
@@ -1,5 +1,27 @@
 # This file contains prompt constructors for various pieces of code. Used primarily to keep other code legible.
+import json
+
+# tool use system prompts by tool definitions, the same tools are used for many calls
+_tool_use_system_prompts: dict[tuple, str] = {}
+_MAX_CACHED_TOOL_USE_SYSTEM_PROMPTS = 256
+
+
 def construct_tool_use_system_prompt(tools):
+    key = tuple(tool_cache_key(tool) for tool in tools)
+    tool_use_system_prompt = _tool_use_system_prompts.get(key)
+    if tool_use_system_prompt is None:
+        if len(_tool_use_system_prompts) >= _MAX_CACHED_TOOL_USE_SYSTEM_PROMPTS:
+            _tool_use_system_prompts.clear()
+        tool_use_system_prompt = _tool_use_system_prompts[key] = _construct_tool_use_system_prompt(tools)
+    return tool_use_system_prompt
+
+
+def tool_cache_key(tool):
+    """Identifies a tool by everything its description for Claude is formatted from."""
+    return type(tool).__qualname__, json.dumps(vars(tool), sort_keys=True, default=str)
+
+
+def _construct_tool_use_system_prompt(tools):
     tool_use_system_prompt = (
             "In this environment you have access to a set of tools you can use to answer the user's question.\n"
             "\n"
@@ -7,7 +7,7 @@ from .messages_api_converters import convert_completion_to_messages, \
 from .prompt_constructors import construct_use_tools_prompt, construct_successful_function_run_injection_prompt, \
     construct_error_function_run_injection_prompt, construct_prompt_from_messages
 from .. import get_anthropic_client
-from .._constants import DEFAULT_MODEL
+from .._constants import DEFAULT_MODEL, PROMPT_CACHING_BETA, CACHE_CONTROL
 
 
 class ToolUser:
@@ -23,6 +23,8 @@ class ToolUser:
     - model: The name of the model (default Claude-2.1).
     - current_prompt (str): The current prompt being used in the interaction. Is added to as Claude interacts with tools.
     - current_num_retries (int): The current number of retries that have been attempted. Resets to 0 after a successful function call.
+    - prompt_caching (bool, optional): Mark the system prompt with the tool definitions as cacheable prefix. Default is False.
+    - usage: Token usage of the last completion.
 
     Note/TODOs:
     -----
@@ -34,7 +36,7 @@ class ToolUser:
     To use this class, you should instantiate it with a list of tools (tool_user = ToolUser(tools)). You then interact with it as you would the normal claude API, by providing a prompt to tool_user.use_tools(prompt) and expecting a completion in return.
     """
 
-    def __init__(self, tools, client=None, model: str = DEFAULT_MODEL):
+    def __init__(self, tools, client=None, model: str = DEFAULT_MODEL, prompt_caching: bool = False):
         self.tools = tools
         self.max_retries = 0
         self.first_party = True
@@ -42,6 +44,8 @@ class ToolUser:
         self.model = model
         self.current_prompt = None
         self.current_num_retries = 0
+        self.prompt_caching = prompt_caching
+        self.usage = None
 
     async def use_tools(self, messages, verbose=0, execution_mode="manual", max_tokens_to_sample=2000, temperature=0):
         """
@@ -213,6 +217,16 @@ class ToolUser:
                 stop_sequences=["</function_calls>", "\n\nHuman:"],
                 messages=messages['messages']
             )
+        elif self.prompt_caching:
+            completion = await self.client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens_to_sample,
+                temperature=temperature,
+                stop_sequences=["</function_calls>", "\n\nHuman:"],
+                messages=messages['messages'],
+                system=[{"type": "text", "text": messages['system'], "cache_control": CACHE_CONTROL}],
+                extra_headers={"anthropic-beta": PROMPT_CACHING_BETA}
+            )
         else:
             completion = await self.client.messages.create(
                 model=self.model,
@@ -222,6 +236,7 @@ class ToolUser:
                 messages=messages['messages'],
                 system=messages['system']
             )
+        self.usage = completion.usage
         return convert_messages_completion_object_to_completions_completion_object(completion)
 
     def _completions_complete(self, prompt, max_tokens_to_sample, temperature):
@@ -1,19 +1,24 @@
+import asyncio
 import logging
-from typing import List
-
-from PIL.Image import Image
+from typing import List, TYPE_CHECKING
 
+from bpm_ai_core.llm.anthropic_chat._constants import DEFAULT_IMAGE_OPTIONS, CACHE_CONTROL
+from bpm_ai_core.llm.common.blob import Blob
 from bpm_ai_core.llm.common.message import ChatMessage, ToolResultMessage, AssistantMessage
-from bpm_ai_core.util.image import base64_encode_image
+from bpm_ai_core.util.image import ImageOptions, base64_encode_prepared_image, base64_encode_prepared_blob, \
+    is_pil_image
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 logger = logging.getLogger(__name__)
 
 
-def messages_to_anthropic_dicts(messages: List[ChatMessage]):
-    return [message_to_anthropic_dict(m) for m in messages]
+async def messages_to_anthropic_dicts(messages: List[ChatMessage], image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS):
+    return await asyncio.gather(*[message_to_anthropic_dict(m, image_options) for m in messages])
 
 
-def message_to_anthropic_dict(message: ChatMessage) -> dict:
+async def message_to_anthropic_dict(message: ChatMessage, image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS) -> dict:
     if isinstance(message, AssistantMessage) and message.has_tool_calls():
         return tool_calls_message_to_anthropic_dict(message)
     elif isinstance(message, ToolResultMessage):
@@ -25,16 +30,18 @@ def message_to_anthropic_dict(message: ChatMessage) -> dict:
         for e in message.content:
             if isinstance(e, str):
                 content.append(str_to_anthropic_text_dict(e))
-            elif isinstance(e, Image):
-                content.append(image_to_anthropic_image_dict(e))
+            elif is_pil_image(e):
+                content.append(image_to_anthropic_image_dict(e, image_options))
+            elif isinstance(e, Blob):
+                content.extend(await blob_to_anthropic_image_dicts(e, image_options))
             else:
                 raise ValueError(
-                    "Elements in ChatMessage.content must be of type str or PIL.Image."
+                    "Elements in ChatMessage.content must be of type str, Blob or PIL.Image."
                 )
     else:
         content = None
         logger.warning(
-            "ChatMessage.content must be of type str or List[Union[str, PIL.Image]] if used for chat completions."
+            "ChatMessage.content must be of type str or List[Union[str, Blob, PIL.Image]] if used for chat completions."
         )
     return {
         "role": message.role,
@@ -70,19 +77,80 @@ def tool_result_message_to_anthropic_dict(message: ToolResultMessage) -> dict:
     }
 
 
-def image_to_anthropic_image_dict(image: Image) -> dict:
+def image_to_anthropic_image_dict(image: "Image.Image", image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS) -> dict:
+    data, mimetype = base64_encode_prepared_image(image, image_options)
     return {
         "type": "image",
         "source": {
             "type": "base64",
-            "media_type": f"image/{image.format.lower()}",
-            "data": base64_encode_image(image),
+            "media_type": mimetype,
+            "data": data,
         }
     }
 
 
+async def blob_to_anthropic_image_dicts(blob: Blob, image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS) -> list[dict]:
+    # the API only accepts base64 encoded images, so remote images are downloaded
+    return [
+        {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": mimetype,
+                "data": data,
+            }
+        }
+        for data, mimetype in await base64_encode_prepared_blob(blob, image_options)
+    ]
+
+
 def str_to_anthropic_text_dict(text: str) -> dict:
     return {
         "type": "text",
         "text": text
-    }
\ No newline at end of file
+    }
+
+
+def system_prompt_to_anthropic_blocks(system: str, suffix: str | None = None, prompt_caching: bool = False) -> list[dict]:
+    """
+    Converts the system prompt into text blocks, the static part marked as cacheable and the (dynamic) suffix after it.
+    """
+    blocks = []
+    if system:
+        blocks.append({**str_to_anthropic_text_dict(system), **({"cache_control": CACHE_CONTROL} if prompt_caching else {})})
+    if suffix:
+        blocks.append(str_to_anthropic_text_dict(suffix))
+    return blocks
+
+
+def add_cache_control(messages: list[dict]) -> list[dict]:
+    """
+    Marks the conversation before the last user message (e.g. few-shot examples) as cacheable prefix.
+    """
+    last_user_idx = max((i for i, m in enumerate(messages) if m["role"] == "user"), default=0)
+    if last_user_idx == 0 or messages[last_user_idx - 1]["role"] not in ("user", "assistant"):
+        return messages
+    message = messages[last_user_idx - 1]
+    content = message.get("content")
+    blocks = [str_to_anthropic_text_dict(content)] if isinstance(content, str) else list(content or [])
+    if not blocks:
+        return messages
+    blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+    return [*messages[:last_user_idx - 1], {**message, "content": blocks}, *messages[last_user_idx:]]
+
+
+def anthropic_usage_dict(usage) -> dict | None:
+    """
+    Token usage of a completion including prompt cache hits (read from cache) and misses (processed or written to cache).
+    """
+    if usage is None:
+        return None
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_creation = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return {
+        "input_tokens": usage.input_tokens + cache_read + cache_creation,
+        "output_tokens": usage.output_tokens,
+        "cache_hit_tokens": cache_read,
+        "cache_miss_tokens": usage.input_tokens + cache_creation,
+        "cache_write_tokens": cache_creation
+    }
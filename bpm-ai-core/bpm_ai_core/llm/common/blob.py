@@ -1,13 +1,14 @@
+import asyncio
 import os
 from io import BytesIO
 from pathlib import PurePath
-from typing import Union, Optional, Dict, Any, Self, cast
+from typing import Union, Optional, Dict, Any, Self, cast, AsyncIterator
 
-import requests
 from pydantic import BaseModel, Field, model_validator
 
 from bpm_ai_core.util.file import guess_mimetype
-from bpm_ai_core.util.storage import read_file_from_azure_blob, read_file_from_s3, is_s3_url, is_azure_blob_url
+from bpm_ai_core.util.storage import read_file_from_azure_blob, read_file_from_s3, is_s3_url, is_azure_blob_url, \
+    stream_file_from_url, stream_file_from_s3, stream_file_from_azure_blob, DEFAULT_CHUNK_SIZE
 
 
 class Blob(BaseModel):
@@ -81,8 +82,7 @@ class Blob(BaseModel):
     async def as_bytes(self) -> bytes:
         """Read data as bytes."""
         if self.data is None and (self.path.startswith('http://') or self.path.startswith('https://')):
-            response = requests.get(self.path)
-            return response.content
+            return b"".join([chunk async for chunk in stream_file_from_url(self.path)])
         elif self.data is None and is_s3_url(self.path):
             return await read_file_from_s3(self.path)
         elif self.data is None and is_azure_blob_url(self.path):
@@ -100,6 +100,25 @@ class Blob(BaseModel):
     async def as_bytes_io(self) -> BytesIO:
         return BytesIO(await self.as_bytes())
 
+    async def stream(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Read data as chunks of bytes, without holding the whole content of referenced files in memory."""
+        path = str(self.path) if self.path else None
+        if self.data is not None:
+            yield await self.as_bytes()
+        elif path.startswith('http://') or path.startswith('https://'):
+            async for chunk in stream_file_from_url(path, chunk_size):
+                yield chunk
+        elif is_s3_url(path):
+            async for chunk in stream_file_from_s3(path, chunk_size):
+                yield chunk
+        elif is_azure_blob_url(path):
+            async for chunk in stream_file_from_azure_blob(path):
+                yield chunk
+        else:
+            with open(path, "rb") as f:
+                while chunk := await asyncio.to_thread(f.read, chunk_size):
+                    yield chunk
+
     @classmethod
     def from_path_or_url(
             cls,
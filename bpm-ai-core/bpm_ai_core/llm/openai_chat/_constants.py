@@ -1,16 +1,26 @@
-import httpx
+import functools
+
+from bpm_ai_core.util.image import ImageOptions
 
 DEFAULT_MODEL = "gpt-4-turbo-preview"
 DEFAULT_TEMPERATURE = 0.0
 DEFAULT_SEED = 42
 DEFAULT_MAX_RETRIES = 8
+DEFAULT_IMAGE_OPTIONS = ImageOptions(max_long_side=2048, max_short_side=768)
+"""High detail images are fit into 2048x2048 and scaled to 768 px on the short side by the API."""
 OPENAI_COMPATIBLE_API_KEY_ENV_VAR = "LLM_API_KEY"
 AZURE_API_KEY_ENV_VAR = "AZURE_OPENAI_API_KEY"
 
-default_client_kwargs = {
-    "http_client": httpx.AsyncClient(
-        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
-    ),
-    "timeout": 600,
-    "max_retries": 0  # we use own retry logic
-}
\ No newline at end of file
+
+@functools.lru_cache(maxsize=None)
+def default_client_kwargs() -> dict:
+    # the shared http client is only created on first use, keeping imports cheap
+    import httpx
+
+    return {
+        "http_client": httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+        ),
+        "timeout": 600,
+        "max_retries": 0  # we use own retry logic
+    }
@@ -10,9 +10,11 @@ from bpm_ai_core.llm.common.message import ChatMessage, ToolCallMessage, Assista
 from bpm_ai_core.llm.common.tool import Tool
 from bpm_ai_core.llm.openai_chat import get_openai_client, get_azure_openai_client
 from bpm_ai_core.llm.openai_chat._constants import DEFAULT_MODEL, DEFAULT_TEMPERATURE, DEFAULT_SEED, \
-    DEFAULT_MAX_RETRIES, AZURE_API_KEY_ENV_VAR, OPENAI_COMPATIBLE_API_KEY_ENV_VAR
-from bpm_ai_core.llm.openai_chat.util import messages_to_openai_dicts, json_schema_to_openai_function
+    DEFAULT_MAX_RETRIES, DEFAULT_IMAGE_OPTIONS, AZURE_API_KEY_ENV_VAR, OPENAI_COMPATIBLE_API_KEY_ENV_VAR
+from bpm_ai_core.llm.openai_chat.util import messages_to_openai_dicts, json_schema_to_openai_function, \
+    openai_usage_dict
 from bpm_ai_core.tracing.tracing import Tracing
+from bpm_ai_core.util.image import ImageOptions
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +43,8 @@ class ChatOpenAI(LLM):
         temperature: float = DEFAULT_TEMPERATURE,
         seed: Optional[int] = DEFAULT_SEED,
         max_retries: int = DEFAULT_MAX_RETRIES,
-        client: AsyncOpenAI = None
+        client: AsyncOpenAI = None,
+        image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS
     ):
         if not has_openai:
             raise ImportError('openai is not installed')
@@ -56,6 +59,7 @@ class ChatOpenAI(LLM):
             ]
         )
         self.client = client
+        self.image_options = image_options
         self.seed = seed
 
     @classmethod
@@ -134,7 +138,11 @@ class ChatOpenAI(LLM):
         current_try: int = None
     ) -> AssistantMessage:
         tools = [self._output_schema_to_tool(output_schema)] if output_schema else tools
-        openai_tools = [json_schema_to_openai_function(f.name, f.description, f.args_schema) for f in tools] if tools else []
+        # tool definitions are part of the cached prompt prefix, so they are sent in a stable order
+        openai_tools = [
+            json_schema_to_openai_function(f.name, f.description, f.args_schema)
+            for f in sorted(tools, key=lambda t: t.name)
+        ] if tools else []
         completion = await self._run_completion(messages, openai_tools, stop, current_try)
         message = completion.choices[0].message
         if message.tool_calls:
@@ -156,7 +164,7 @@ class ChatOpenAI(LLM):
             "model": self.model,
             "temperature": self.temperature,
             **({"seed": self.seed} if self.seed else {}),
-            "messages": messages_to_openai_dicts(messages),
+            "messages": await messages_to_openai_dicts(messages, self.image_options),
             "stop": stop or [],
             **({
                    "tool_choice": {
@@ -168,7 +176,7 @@ class ChatOpenAI(LLM):
         }
         Tracing.tracers().start_llm_trace(self, messages, current_try, tools)
         completion = await self.client.chat.completions.create(**args)
-        Tracing.tracers().end_llm_trace(completion.choices[0].message)
+        Tracing.tracers().end_llm_trace(completion.choices[0].message, usage=openai_usage_dict(completion.usage))
         return completion
 
     @staticmethod
@@ -1,10 +1,15 @@
+import asyncio
 import logging
-from typing import List, Dict, Any
-
-from PIL.Image import Image
+from typing import List, Dict, Any, TYPE_CHECKING
 
+from bpm_ai_core.llm.common.blob import Blob
 from bpm_ai_core.llm.common.message import ChatMessage, ToolResultMessage, AssistantMessage
-from bpm_ai_core.util.image import base64_encode_image
+from bpm_ai_core.llm.openai_chat._constants import DEFAULT_IMAGE_OPTIONS
+from bpm_ai_core.util.image import ImageOptions, base64_encode_prepared_image, base64_encode_prepared_blob, \
+    is_pil_image
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 logger = logging.getLogger(__name__)
 
@@ -25,11 +30,11 @@ def get_openai_tool_call_dict(message: AssistantMessage):
     }
 
 
-def messages_to_openai_dicts(messages: List[ChatMessage]):
-    return [message_to_openai_dict(m) for m in messages]
+async def messages_to_openai_dicts(messages: List[ChatMessage], image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS):
+    return await asyncio.gather(*[message_to_openai_dict(m, image_options) for m in messages])
 
 
-def message_to_openai_dict(message: ChatMessage) -> dict:
+async def message_to_openai_dict(message: ChatMessage, image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS) -> dict:
     if isinstance(message, AssistantMessage) and message.has_tool_calls():
         extra_dict = {
             **get_openai_tool_call_dict(message)
@@ -48,16 +53,18 @@ def message_to_openai_dict(message: ChatMessage) -> dict:
         for e in message.content:
             if isinstance(e, str):
                 content.append(str_to_openai_text_dict(e))
-            elif isinstance(e, Image):
-                content.append(image_to_openai_image_dict(e))
+            elif is_pil_image(e):
+                content.append(image_to_openai_image_dict(e, image_options))
+            elif isinstance(e, Blob):
+                content.extend(await blob_to_openai_image_dicts(e, image_options))
             else:
                 raise ValueError(
-                    "Elements in ChatMessage.content must be of type str or PIL.Image."
+                    "Elements in ChatMessage.content must be of type str, Blob or PIL.Image."
                 )
     else:
         content = None
         logger.warning(
-            "ChatMessage.content must be of type str or List[Union[str, PIL.Image]] if used for chat completions."
+            "ChatMessage.content must be of type str or List[Union[str, Blob, PIL.Image]] if used for chat completions."
         )
     return {
         "role": message.role,
@@ -67,15 +74,31 @@ def message_to_openai_dict(message: ChatMessage) -> dict:
     }
 
 
-def image_to_openai_image_dict(image: Image) -> dict:
+def image_to_openai_image_dict(image: "Image.Image", image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS) -> dict:
+    data, mimetype = base64_encode_prepared_image(image, image_options)
     return {
         "type": "image_url",
         "image_url": {
-            "url": f"data:image/{image.format.lower()};base64,{base64_encode_image(image)}"
+            "url": f"data:{mimetype};base64,{data}"
         }
     }
 
 
+async def blob_to_openai_image_dicts(blob: Blob, image_options: ImageOptions = DEFAULT_IMAGE_OPTIONS) -> list[dict]:
+    if blob.is_image() and blob.data is None and str(blob.path).startswith(("http://", "https://")):
+        # the API downloads (and downscales) remote images itself
+        return [{"type": "image_url", "image_url": {"url": str(blob.path)}}]
+    return [
+        {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:{mimetype};base64,{data}"
+            }
+        }
+        for data, mimetype in await base64_encode_prepared_blob(blob, image_options)
+    ]
+
+
 def str_to_openai_text_dict(text: str) -> dict:
     return {
         "type": "text",
@@ -92,3 +115,19 @@ def json_schema_to_openai_function(name: str, desc: str, schema: Dict[str, Any])
             "parameters": schema
         }
     }
+
+
+def openai_usage_dict(usage) -> dict | None:
+    """
+    Token usage of a completion including automatic prompt cache hits and misses.
+    """
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = (details.get("cached_tokens") if isinstance(details, dict) else getattr(details, "cached_tokens", None)) or 0
+    return {
+        "input_tokens": usage.prompt_tokens,
+        "output_tokens": usage.completion_tokens,
+        "cache_hit_tokens": cached,
+        "cache_miss_tokens": usage.prompt_tokens - cached
+    }
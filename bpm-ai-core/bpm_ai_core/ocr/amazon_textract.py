@@ -1,9 +1,10 @@
 import asyncio
+from typing import AsyncIterator
 
 from typing_extensions import override
 
 from bpm_ai_core.llm.common.blob import Blob
-from bpm_ai_core.ocr.ocr import OCR, OCRResult, OCRPage
+from bpm_ai_core.ocr.ocr import OCR, OCRResult, OCRPage, validate_pages
 from bpm_ai_core.util.image import blob_as_images
 from bpm_ai_core.util.storage import is_s3_url, parse_s3_url
 
@@ -28,19 +29,42 @@ class AmazonTextractOCR(OCR):
     async def _do_process(
         self,
         blob: Blob,
-        language: str = None
+        language: str = None,
+        pages: list[int] | None = None
     ) -> OCRResult:
+        return OCRResult(pages=[page async for page in self._do_process_stream(blob, language, pages)])
+
+    @override
+    async def _do_process_stream(
+        self,
+        blob: Blob,
+        language: str = None,
+        pages: list[int] | None = None
+    ) -> AsyncIterator[OCRPage]:
         if not (blob.is_pdf() or blob.is_image()):
             raise ValueError("Blob must be a PDF or an image")
+        validate_pages(pages)
 
         if is_s3_url(blob.path):
-            pages = await self._get_pages_async(blob.path)
+            ocr_pages = self._get_pages_async(blob.path)
         else:
-            pages = await self._get_pages_sync(blob)
-
-        return OCRResult(pages=pages)
+            ocr_pages = self._get_pages_sync(blob)
+
+        # Textract always analyzes the whole document, so page selection can only be applied to the results
+        page_number = 0
+        try:
+            async for page in ocr_pages:
+                page_number += 1
+                if pages is None or page_number in pages:
+                    yield page
+                if pages is not None and page_number >= max(pages):
+                    break
+        finally:
+            await ocr_pages.aclose()
+        # the page count is only known once all results are in
+        validate_pages(pages, page_number)
 
-    async def _get_pages_sync(self, document: Blob):
+    async def _get_pages_sync(self, document: Blob) -> AsyncIterator[OCRPage]:
         if document.is_pdf():
             _bytes = await document.as_bytes()
         else:
@@ -58,9 +82,10 @@ class AmazonTextractOCR(OCR):
             table_format="github",
             generate_markdown=True
         )
-        return self.parse_pages(markdown_pages, response)
+        for page in self.parse_pages(markdown_pages, response):
+            yield page
 
-    async def _get_pages_async(self, s3_url: str):
+    async def _get_pages_async(self, s3_url: str) -> AsyncIterator[OCRPage]:
         bucket_name, file_path = await parse_s3_url(s3_url)
         # Create a document from the image bytes asynchronously
         async with get_session().create_client("textract", region_name=self.region_name) as client:
@@ -87,31 +112,50 @@ class AmazonTextractOCR(OCR):
             if status == "FAILED":
                 raise Exception(f"Document analysis failed with error: {response['StatusMessage']}")
 
-            # Retrieve the results from the completed job
-            pages = []
-            markdown_pages = {}
-            next_token = None
+            # Retrieve the results from the completed job. Results are split by block count, not by page,
+            # so the blocks of the last page in a result may continue in the next one: a page is only
+            # complete once a later PAGE block arrives or there are no more results.
+            buffered_blocks = []
             while True:
+                buffered_blocks.extend(response["Blocks"])
+                next_token = response.get("NextToken")
                 if next_token:
-                    response = await client.get_document_analysis(JobId=job_id, NextToken=next_token)
+                    page_starts = [i for i, b in enumerate(buffered_blocks) if b["BlockType"] == "PAGE"]
+                    complete = page_starts[-1] if page_starts else 0
                 else:
-                    response = await client.get_document_analysis(JobId=job_id)
+                    complete = len(buffered_blocks)
 
-                # Convert Textract response to markdown using amazon-textract-prettyprinter
-                markdown_pages.update(get_text_from_layout_json(
-                    textract_json=response,
-                    table_format="github",
-                    generate_markdown=True
-                ))
-                pages.extend(self.parse_pages(markdown_pages, response))
+                if complete:
+                    for page in self.pages_from_blocks(buffered_blocks[:complete], response):
+                        yield page
+                    buffered_blocks = buffered_blocks[complete:]
 
-                next_token = response.get("NextToken")
                 if not next_token:
                     break
-            return pages
+                response = await client.get_document_analysis(JobId=job_id, NextToken=next_token)
+
+    @classmethod
+    def pages_from_blocks(cls, blocks: list[dict], response: dict) -> list[OCRPage]:
+        """
+        Parses the given complete pages worth of blocks, taking the remaining fields from `response`.
+        """
+        textract_json = {
+            **{k: v for k, v in response.items() if k not in ("Blocks", "NextToken")},
+            "Blocks": blocks,
+            "DocumentMetadata": {"Pages": sum(1 for b in blocks if b["BlockType"] == "PAGE")}
+        }
+        # Convert Textract response to markdown using amazon-textract-prettyprinter
+        markdown_pages = get_text_from_layout_json(
+            textract_json=textract_json,
+            table_format="github",
+            generate_markdown=True
+        )
+        return cls.parse_pages(markdown_pages, textract_json)
 
     @staticmethod
-    def parse_pages(markdown_pages, response):
+    def parse_pages(markdown_pages, response) -> list[OCRPage]:
+        blocks_by_id = {b["Id"]: b for b in response["Blocks"]}
+        markdown_texts = list(markdown_pages.values())
         pages = []
         page_idx = -1
         for block in response["Blocks"]:
@@ -119,18 +163,18 @@ class AmazonTextractOCR(OCR):
                 page_idx += 1
                 bboxes = []
                 words = []
-                for _block in block["Relationships"][0]["Ids"]:
-                    block_data = next(b for b in response["Blocks"] if b["Id"] == _block)
-                    if block_data["BlockType"] == "LINE":
+                for _block in block.get("Relationships", [{"Ids": []}])[0]["Ids"]:
+                    block_data = blocks_by_id.get(_block)
+                    if block_data and block_data["BlockType"] == "LINE":
                         for word_block_id in block_data["Relationships"][0]["Ids"]:
-                            word_block = next(b for b in response["Blocks"] if b["Id"] == word_block_id)
-                            if word_block["BlockType"] == "WORD":
+                            word_block = blocks_by_id.get(word_block_id)
+                            if word_block and word_block["BlockType"] == "WORD":
                                 bbox = word_block["Geometry"]["BoundingBox"]
                                 x, y, w, h = bbox["Left"], bbox["Top"], bbox["Width"], bbox["Height"]
                                 bboxes.append((x, y, x + w, y + h))
                                 words.append(word_block["Text"])
                 page_data = OCRPage(
-                    text=list(markdown_pages.values())[page_idx],
+                    text=markdown_texts[page_idx] if page_idx < len(markdown_texts) else " ".join(words),
                     words=words,
                     bboxes=bboxes
                 )
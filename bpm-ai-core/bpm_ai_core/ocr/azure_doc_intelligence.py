@@ -1,15 +1,19 @@
+import asyncio
 import logging
 import os
 from io import BytesIO
+from typing import AsyncIterator
 
 from typing_extensions import override
 
 from bpm_ai_core.llm.common.blob import Blob
 from bpm_ai_core.ocr.ocr import OCR, OCRResult, OCRPage
-from bpm_ai_core.util.image import blob_as_images
+from bpm_ai_core.util.image import blob_as_images, pdf_page_count
+from bpm_ai_core.util.storage import is_azure_blob_url
 
 try:
     from azure.ai.documentintelligence.aio import DocumentIntelligenceClient as AsyncDocumentIntelligenceClient
+    from azure.ai.documentintelligence.models import AnalyzeDocumentRequest
     from azure.core.credentials import AzureKeyCredential
 
     has_azure_doc = True
@@ -19,27 +23,59 @@ except ImportError:
 azure_logger = logging.getLogger('azure')
 azure_logger.setLevel(logging.WARNING)
 
+logger = logging.getLogger(__name__)
+
 IMAGE_FORMATS = ["png", "jpeg", "tiff"]
 
 
 class AzureOCR(OCR):
-    def __init__(self, endpoint: str = None):
+    def __init__(self, endpoint: str = None, pages_per_request: int = 4, max_concurrency: int = 4):
+        """
+        :param endpoint: Document Intelligence endpoint, defaults to the AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT env variable
+        :param pages_per_request: PDFs are analyzed in page ranges of this size, so that pages can be streamed as soon as their range is done.
+            Documents at a public http(s) URL are fetched by the service itself, local documents are uploaded once per range.
+            Splitting into ranges needs the page count from poppler (`pdfinfo`), without it the document is analyzed in one request.
+        :param max_concurrency: max number of page ranges analyzed at the same time
+        """
         if not has_azure_doc:
             raise ImportError('azure-ai-documentintelligence is not installed')
         self.endpoint = endpoint or os.environ.get("AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT")
+        self.pages_per_request = pages_per_request
+        self.max_concurrency = max_concurrency
 
     @override
     async def _do_process(
         self,
         blob: Blob,
-        language: str = None
+        language: str = None,
+        pages: list[int] | None = None
     ) -> OCRResult:
+        return OCRResult(pages=[page async for page in self._do_process_stream(blob, language, pages)])
+
+    @override
+    async def _do_process_stream(
+        self,
+        blob: Blob,
+        language: str = None,
+        pages: list[int] | None = None
+    ) -> AsyncIterator[OCRPage]:
         if not (blob.is_pdf() or blob.is_image()):
             raise ValueError("Blob must be a PDF or an image")
         if blob.is_pdf():
-            bytes_io = await blob.as_bytes_io()
+            source = await self._analyze_request(blob)
+            page_numbers = pages or await self._page_numbers(blob)
+            if page_numbers:
+                page_ranges = [
+                    ",".join(str(p) for p in page_numbers[i:i + self.pages_per_request])
+                    for i in range(0, len(page_numbers), self.pages_per_request)
+                ]
+            else:
+                page_ranges = [None]
         else:
-            bytes_io = BytesIO((await blob_as_images(blob, accept_formats=IMAGE_FORMATS, return_bytes=True))[0])
+            source = (await blob_as_images(blob, accept_formats=IMAGE_FORMATS, return_bytes=True))[0]
+            page_ranges = [None]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
         async with AsyncDocumentIntelligenceClient(
                 self.endpoint,
@@ -47,33 +83,77 @@ class AzureOCR(OCR):
                     os.environ.get("AZURE_DOCUMENT_INTELLIGENCE_KEY")
                 )
         ) as client:
+            tasks = [
+                asyncio.create_task(self._analyze(client, semaphore, source, pages))
+                for pages in page_ranges
+            ]
+            try:
+                # yield in document order, each range as soon as it (and all ranges before it) are done
+                for task in tasks:
+                    for page in await task:
+                        yield page
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _analyze_request(blob: Blob) -> "AnalyzeDocumentRequest | bytes":
+        """
+        Lets the service fetch documents at a public URL itself, so that they are not uploaded again for every page range.
+        """
+        path = str(blob.path) if blob.path else ""
+        if blob.data is None and path.startswith(("http://", "https://")) and not is_azure_blob_url(path):
+            return AnalyzeDocumentRequest(url_source=path)
+        return await blob.as_bytes()
+
+    @staticmethod
+    async def _page_numbers(blob: Blob) -> list[int] | None:
+        from pdf2image.exceptions import PDFInfoNotInstalledError
+
+        try:
+            page_count = await asyncio.to_thread(pdf_page_count, await blob.as_bytes())
+        except PDFInfoNotInstalledError:
+            logger.warning("poppler is not installed, analyzing the whole PDF in a single request")
+            return None
+        return list(range(1, page_count + 1))
+
+    @staticmethod
+    async def _analyze(
+        client,
+        semaphore: asyncio.Semaphore,
+        source: "AnalyzeDocumentRequest | bytes",
+        pages: str | None
+    ) -> list[OCRPage]:
+        async with semaphore:
             document = await client.begin_analyze_document(
                 model_id="prebuilt-layout",
-                analyze_request=bytes_io,
-                content_type="application/octet-stream",
-                output_content_format="markdown"
+                **({
+                    "analyze_request": BytesIO(source),
+                    "content_type": "application/octet-stream"
+                } if isinstance(source, bytes) else {"analyze_request": source}),
+                output_content_format="markdown",
+                **({"pages": pages} if pages else {})
             )
 
             # Wait for the extraction to complete asynchronously
             result = await document.result()
-            markdown_content = result.content
-
-            pages = []
-            for page in result.pages:
-                bboxes = []
-                words = []
-                for word in page.words:
-                    polygon = word.polygon
-                    x, y = polygon[0], polygon[1]
-                    w, h = polygon[2] - x, polygon[5] - y
-                    bboxes.append((x / page['width'], y / page['height'], (x + w) / page['width'], (y + h) / page['height']))
-                    words.append(word.content)
-
-                page_data = OCRPage(
-                    text=" ".join(words),
-                    words=words,
-                    bboxes=bboxes
-                )
-                pages.append(page_data)
 
-        return OCRResult(pages=pages)
+        ocr_pages = []
+        for page in result.pages:
+            bboxes = []
+            words = []
+            for word in page.words:
+                polygon = word.polygon
+                x, y = polygon[0], polygon[1]
+                w, h = polygon[2] - x, polygon[5] - y
+                bboxes.append((x / page['width'], y / page['height'], (x + w) / page['width'], (y + h) / page['height']))
+                words.append(word.content)
+
+            page_data = OCRPage(
+                text=" ".join(words),
+                words=words,
+                bboxes=bboxes
+            )
+            ocr_pages.append(page_data)
+        return ocr_pages
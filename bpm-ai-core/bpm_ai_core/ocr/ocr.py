@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Tuple, AsyncIterator
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from bpm_ai_core.llm.common.blob import Blob
+from bpm_ai_core.ocr.spatial_index import SpatialIndex
 from bpm_ai_core.tracing.decorators import span
+from bpm_ai_core.tracing.tracing import Tracing
 
 
 class OCRPage(BaseModel):
@@ -13,6 +15,15 @@ class OCRPage(BaseModel):
     bboxes: list[Tuple[float, float, float, float]] = Field(..., exclude=True)
     """Format: (x, y, x + w, y + h), normalized to 1"""
 
+    _spatial_index: SpatialIndex | None = PrivateAttr(default=None)
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Spatial index over the words of this page, built lazily on first access."""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self.words, self.bboxes)
+        return self._spatial_index
+
 
 class OCRResult(BaseModel):
     pages: list[OCRPage]
@@ -22,6 +33,21 @@ class OCRResult(BaseModel):
         return "\n".join([p.text for p in self.pages])
 
 
+def validate_pages(pages: list[int] | None, page_count: int | None = None):
+    """
+    Raises a ValueError if the selected 1-based page numbers are empty or out of range (if the page count is known).
+    """
+    if pages is None:
+        return
+    if not pages:
+        raise ValueError("pages must not be empty, pass None to process all pages")
+    invalid = [p for p in pages if p < 1 or (page_count is not None and p > page_count)]
+    if invalid:
+        raise ValueError(
+            f"Invalid page numbers {invalid}" + (f", document has {page_count} pages" if page_count is not None else "")
+        )
+
+
 class OCR(ABC):
     """
     Optical Character Recognition (OCR) Model
@@ -31,21 +57,73 @@ class OCR(ABC):
     async def _do_process(
             self,
             blob: Blob,
-            language: str = None
+            language: str = None,
+            pages: list[int] | None = None
     ) -> OCRResult:
         pass
 
+    async def _do_process_stream(
+            self,
+            blob: Blob,
+            language: str = None,
+            pages: list[int] | None = None
+    ) -> AsyncIterator[OCRPage]:
+        """
+        Yields the pages of the document as soon as they are recognized.
+        Backends that can produce pages incrementally should override this, by default the full result is awaited.
+        """
+        result = await self._do_process(blob=blob, language=language, pages=pages)
+        for page in result.pages:
+            yield page
+
     @span(name="ocr")
     async def process(
             self,
             blob_or_path: Blob | str,
-            language: str = None
+            language: str = None,
+            pages: list[int] | None = None
     ) -> OCRResult:
+        """
+        Recognizes the text of an image or PDF.
+
+        :param blob_or_path: Blob or path/URL of the document
+        :param language: language of the document, detected automatically by some backends if not given
+        :param pages: 1-based page numbers of a PDF to process, defaults to all pages
+        """
+        validate_pages(pages)
         if isinstance(blob_or_path, str):
             blob = Blob.from_path_or_url(blob_or_path)
         else:  # Blob
             blob = blob_or_path
         return await self._do_process(
             blob=blob,
-            language=language
+            language=language,
+            pages=pages
         )
+
+    async def process_stream(
+            self,
+            blob_or_path: Blob | str,
+            language: str = None,
+            pages: list[int] | None = None
+    ) -> AsyncIterator[OCRPage]:
+        """
+        Like `process`, but yields each OCRPage as soon as it is available,
+        so consumers can start working on (or stop after) the first pages.
+        """
+        validate_pages(pages)
+        if isinstance(blob_or_path, str):
+            blob = Blob.from_path_or_url(blob_or_path)
+        else:  # Blob
+            blob = blob_or_path
+        page_count = 0
+        try:
+            async for page in self._do_process_stream(blob=blob, language=language, pages=pages):
+                page_count += 1
+                yield page
+        finally:
+            Tracing.tracers().event(
+                "ocr-stream",
+                inputs={"blob_or_path": blob_or_path, "language": language, "pages": pages},
+                outputs={"pages": page_count}
+            )
@@ -0,0 +1,79 @@
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import xml.etree.ElementTree as ET
+
+from bpm_ai_core.ocr.ocr import OCRPage
+
+logger = logging.getLogger(__name__)
+
+_XHTML_NS = {"x": "http://www.w3.org/1999/xhtml"}
+
+
+def has_pdftotext() -> bool:
+    return shutil.which("pdftotext") is not None
+
+
+def extract_pdf_text_layer(pdf: bytes, first_page: int = None, last_page: int = None) -> dict[int, OCRPage]:
+    """
+    Extracts the embedded text layer of a born-digital PDF including word bounding boxes,
+    using ``pdftotext`` from poppler (which is also required by pdf2image).
+
+    Args:
+        pdf: The PDF bytes.
+        first_page: First page (1-based) to extract, defaults to the first page of the document.
+        last_page: Last page (1-based, inclusive) to extract, defaults to the last page of the document.
+
+    Returns:
+        A dict of 1-based page number to OCRPage. Pages without a text layer (e.g. scans) have no words.
+    """
+    with tempfile.TemporaryDirectory() as path:
+        pdf_path = os.path.join(path, "input.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(pdf)
+        args = ["pdftotext", "-bbox-layout", "-enc", "UTF-8"]
+        if first_page is not None:
+            args += ["-f", str(first_page)]
+        if last_page is not None:
+            args += ["-l", str(last_page)]
+        result = subprocess.run(args + [pdf_path, "-"], capture_output=True, check=True)
+    return parse_bbox_layout(result.stdout, first_page or 1)
+
+
+def parse_bbox_layout(xhtml: bytes | str, first_page: int = 1) -> dict[int, OCRPage]:
+    """
+    Parses the XHTML output of ``pdftotext -bbox-layout`` into OCRPages with normalized word boxes.
+    """
+    root = ET.fromstring(xhtml)
+    pages = {}
+    for page_number, page in enumerate(root.iter(f"{{{_XHTML_NS['x']}}}page"), start=first_page):
+        width, height = float(page.get("width")), float(page.get("height"))
+        words, bboxes, blocks = [], [], []
+        for block in page.iterfind(".//x:block", _XHTML_NS):
+            lines = []
+            for line in block.iterfind("x:line", _XHTML_NS):
+                line_words = []
+                for word in line.iterfind("x:word", _XHTML_NS):
+                    text = (word.text or "").strip()
+                    if not text:
+                        continue
+                    line_words.append(text)
+                    words.append(text)
+                    bboxes.append((
+                        float(word.get("xMin")) / width,
+                        float(word.get("yMin")) / height,
+                        float(word.get("xMax")) / width,
+                        float(word.get("yMax")) / height
+                    ))
+                if line_words:
+                    lines.append(" ".join(line_words))
+            if lines:
+                blocks.append("\n".join(lines))
+        pages[page_number] = OCRPage(
+            text="\n\n".join(blocks),
+            words=words,
+            bboxes=bboxes
+        )
+    return pages
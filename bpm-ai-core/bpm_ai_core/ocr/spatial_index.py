@@ -0,0 +1,185 @@
+import heapq
+import math
+from collections import defaultdict
+from typing import Tuple, NamedTuple, Iterable
+
+BBox = Tuple[float, float, float, float]
+"""Format: (x, y, x + w, y + h), normalized to 1"""
+
+
+class OCRWord(NamedTuple):
+    index: int
+    """Position of the word in OCRPage.words"""
+    text: str
+    bbox: BBox
+
+
+class SpatialIndex:
+    """
+    Uniform grid index over the word bounding boxes of a single OCR page.
+
+    Every word is registered in each grid cell its bounding box overlaps, so region queries only
+    have to look at the words of the touched cells instead of scanning the whole page.
+    """
+
+    def __init__(self, words: list[str], bboxes: list[BBox], cell_size: float = 0.05):
+        if len(words) != len(bboxes):
+            raise ValueError("words and bboxes must have the same length")
+        self.words = [OCRWord(i, w, b) for i, (w, b) in enumerate(zip(words, bboxes))]
+        self.cell_size = cell_size
+        self._cells: dict[Tuple[int, int], list[int]] = defaultdict(list)
+        for word in self.words:
+            for cell in self._cells_for_rect(word.bbox):
+                self._cells[cell].append(word.index)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def _cells_for_rect(self, rect: BBox) -> Iterable[Tuple[int, int]]:
+        x1, y1 = self._cell(rect[0], rect[1])
+        x2, y2 = self._cell(rect[2], rect[3])
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                yield cx, cy
+
+    def _candidates(self, rect: BBox) -> set[int]:
+        candidates = set()
+        for cell in self._cells_for_rect(rect):
+            candidates.update(self._cells.get(cell, ()))
+        return candidates
+
+    def inside(self, rect: BBox, partial: bool = False) -> list[OCRWord]:
+        """
+        Returns all words inside the given rectangle in reading order.
+
+        :param rect: (x1, y1, x2, y2), normalized to 1
+        :param partial: if True, words that only overlap the rectangle are included as well
+        """
+        rx1, ry1, rx2, ry2 = rect
+        result = []
+        for idx in self._candidates(rect):
+            x1, y1, x2, y2 = self.words[idx].bbox
+            if partial:
+                hit = x1 <= rx2 and x2 >= rx1 and y1 <= ry2 and y2 >= ry1
+            else:
+                hit = x1 >= rx1 and x2 <= rx2 and y1 >= ry1 and y2 <= ry2
+            if hit:
+                result.append(self.words[idx])
+        return self._reading_order(result)
+
+    def nearest(self, x: float, y: float, k: int = 1, max_distance: float | None = None) -> list[OCRWord]:
+        """
+        Returns the k words whose bounding boxes are closest to the point (x, y), nearest first.
+        """
+        if not self.words or k <= 0:
+            return []
+        cx, cy = self._cell(x, y)
+        max_ring = max(
+            abs(c) for cell in self._cells for c in (cell[0] - cx, cell[1] - cy)
+        ) if self._cells else 0
+        best: list[Tuple[float, int]] = []  # max-heap via negated distances
+        seen = set()
+        ring = 0
+        while ring <= max_ring:
+            for cell in self._ring(cx, cy, ring):
+                for idx in self._cells.get(cell, ()):
+                    if idx in seen:
+                        continue
+                    seen.add(idx)
+                    dist = self._distance(x, y, self.words[idx].bbox)
+                    if max_distance is not None and dist > max_distance:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist, idx))
+                    elif dist < -best[0][0]:
+                        heapq.heapreplace(best, (-dist, idx))
+            # every unvisited cell is at least `ring * cell_size` away from the query point
+            if len(best) == k and -best[0][0] <= ring * self.cell_size:
+                break
+            if max_distance is not None and ring * self.cell_size > max_distance:
+                break
+            ring += 1
+        return [self.words[idx] for _, idx in sorted(best, key=lambda e: (-e[0], e[1]))]
+
+    def find(self, text: str, case_sensitive: bool = False) -> list[OCRWord]:
+        """
+        Returns all words matching the given text (ignoring surrounding punctuation), in reading order.
+        """
+        def normalize(s: str) -> str:
+            s = s.strip(" .,;:!?()[]")
+            return s if case_sensitive else s.lower()
+        needle = normalize(text)
+        return self._reading_order([w for w in self.words if normalize(w.text) == needle])
+
+    def right_of(self, word: OCRWord, max_distance: float = 1.0) -> list[OCRWord]:
+        """
+        Returns words on the same line to the right of the given word, left to right.
+        """
+        x1, y1, x2, y2 = word.bbox
+        cy = (y1 + y2) / 2
+        candidates = self.inside((x2, y1, min(x2 + max_distance, 1.0), y2), partial=True)
+        return sorted(
+            [w for w in candidates if w.index != word.index and w.bbox[0] >= x2 and w.bbox[1] <= cy <= w.bbox[3]],
+            key=lambda w: w.bbox[0]
+        )
+
+    def below(self, word: OCRWord, max_distance: float = 1.0) -> list[OCRWord]:
+        """
+        Returns words horizontally overlapping the given word below it, top to bottom.
+        """
+        x1, y1, x2, y2 = word.bbox
+        candidates = self.inside((x1, y2, x2, min(y2 + max_distance, 1.0)), partial=True)
+        return sorted(
+            [w for w in candidates if w.index != word.index and w.bbox[1] >= y2],
+            key=lambda w: (w.bbox[1], w.bbox[0])
+        )
+
+    def lines(self, words: list[OCRWord] | None = None, tolerance: float = 0.5) -> list[list[OCRWord]]:
+        """
+        Clusters words into text lines, top to bottom, each line left to right.
+
+        :param words: subset of words to cluster, defaults to all words of the page
+        :param tolerance: fraction of a word's height its vertical center may deviate from the line center
+        """
+        words = self.words if words is None else words
+        lines: list[list[OCRWord]] = []
+        line_centers: list[float] = []
+        for word in sorted(words, key=lambda w: (w.bbox[1] + w.bbox[3]) / 2):
+            x1, y1, x2, y2 = word.bbox
+            center = (y1 + y2) / 2
+            if lines and abs(center - line_centers[-1]) <= tolerance * max(y2 - y1, 1e-9):
+                lines[-1].append(word)
+                n = len(lines[-1])
+                line_centers[-1] += (center - line_centers[-1]) / n
+            else:
+                lines.append([word])
+                line_centers.append(center)
+        return [sorted(line, key=lambda w: w.bbox[0]) for line in lines]
+
+    def text_inside(self, rect: BBox, partial: bool = True) -> str:
+        """
+        Returns the text of the words inside the given rectangle, one line per text line.
+        Useful to prune the context passed to question answering models to a region of interest.
+        """
+        return "\n".join(" ".join(w.text for w in line) for line in self.lines(self.inside(rect, partial=partial)))
+
+    def _reading_order(self, words: list[OCRWord]) -> list[OCRWord]:
+        return [w for line in self.lines(words) for w in line]
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int) -> Iterable[Tuple[int, int]]:
+        if ring == 0:
+            yield cx, cy
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
+
+    @staticmethod
+    def _distance(x: float, y: float, bbox: BBox) -> float:
+        dx = max(bbox[0] - x, 0.0, x - bbox[2])
+        dy = max(bbox[1] - y, 0.0, y - bbox[3])
+        return math.hypot(dx, dy)
@@ -1,13 +1,16 @@
+import asyncio
 import logging
 import os
 import urllib
+from typing import AsyncIterator
 
 from PIL import Image
 from typing_extensions import override
 
 from bpm_ai_core.llm.common.blob import Blob
-from bpm_ai_core.ocr.ocr import OCR, OCRResult, OCRPage
-from bpm_ai_core.util.image import pdf_to_images
+from bpm_ai_core.ocr.ocr import OCR, OCRResult, OCRPage, validate_pages
+from bpm_ai_core.ocr.pdf_text_layer import extract_pdf_text_layer, has_pdftotext
+from bpm_ai_core.util.image import pdf_to_images, pdf_page_count
 from bpm_ai_core.util.language import indentify_language_iso_639_3
 
 try:
@@ -26,54 +29,102 @@ class TesseractOCR(OCR):
     Local OCR model based on tesseract.
 
     To use, you should have the ``tesseract`` or ``tesseract-ocr`` package installed.
+
+    Pages of born-digital PDFs are not rasterized and OCR'd, but their embedded text layer is
+    extracted directly (requires ``pdftotext`` from poppler, which pdf2image depends on anyway).
     """
-    def __init__(self):
+    def __init__(self, use_text_layer: bool = True, min_text_layer_words: int = 3):
+        """
+        :param use_text_layer: extract the embedded text of born-digital PDF pages instead of running OCR on them
+        :param min_text_layer_words: min number of words in the text layer for a page to be considered born-digital
+        """
         if not has_pytesseract:
             raise ImportError('pytesseract is not installed')
         os.makedirs(TESSDATA_DIR, exist_ok=True)
         os.environ["TESSDATA_PREFIX"] = TESSDATA_DIR
+        self.use_text_layer = use_text_layer
+        self.min_text_layer_words = min_text_layer_words
 
     @override
     async def _do_process(
             self,
             blob: Blob,
-            language: str = None
+            language: str = None,
+            pages: list[int] | None = None
     ) -> OCRResult:
+        return OCRResult(pages=[page async for page in self._do_process_stream(blob, language, pages)])
+
+    @override
+    async def _do_process_stream(
+            self,
+            blob: Blob,
+            language: str = None,
+            pages: list[int] | None = None
+    ) -> AsyncIterator[OCRPage]:
         if blob.is_pdf():
-            images = pdf_to_images(await blob.as_bytes())
+            pdf = await blob.as_bytes()
+            page_count = await asyncio.to_thread(pdf_page_count, pdf)
+            validate_pages(pages, page_count)
+            page_numbers = pages or range(1, page_count + 1)
+            text_layer = await self._text_layer(pdf, page_numbers)
+            for page_number in page_numbers:
+                text_page = text_layer.get(page_number)
+                if text_page is not None and len(text_page.words) >= self.min_text_layer_words:
+                    yield text_page
+                    continue
+                # scanned page: rasterize only this page
+                image = (await asyncio.to_thread(pdf_to_images, pdf, first_page=page_number, last_page=page_number))[0]
+                language = await self._ensure_language(image, language)
+                yield await asyncio.to_thread(self._ocr_page, image)
         elif blob.is_image():
-            images = [Image.open(await blob.as_bytes_io())]
+            image = Image.open(await blob.as_bytes_io())
+            language = await self._ensure_language(image, language)
+            yield await asyncio.to_thread(self._ocr_page, image)
         else:
             raise ValueError("Blob must be a PDF or an image")
+
+    async def _text_layer(self, pdf: bytes, page_numbers) -> dict[int, OCRPage]:
+        if not self.use_text_layer:
+            return {}
+        if not has_pdftotext():
+            logger.debug("tesseract: pdftotext not found, skipping text layer extraction")
+            return {}
+        try:
+            return await asyncio.to_thread(
+                extract_pdf_text_layer, pdf, first_page=min(page_numbers), last_page=max(page_numbers)
+            )
+        except Exception as e:
+            logger.warning(f"tesseract: text layer extraction failed, falling back to OCR: {e}")
+            return {}
+
+    async def _ensure_language(self, image: Image, language: str | None) -> str:
         if language is None:
-            language = self.identify_image_language(images[0])
+            language = await asyncio.to_thread(self.identify_image_language, image)
             logger.info(f"tesseract: auto detected language '{language}'")
         self.download_if_missing(language)
+        return language
 
-        pages = []
-        for image in images:
-            text = pytesseract.image_to_string(image)
-            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-            bboxes = []
-            words = []
-
-            # For each word in the data...
-            for i in range(len(data['text'])):
-                # ...if the word isn't empty
-                if data['text'][i].strip():
-                    x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
-                    # add bounding box
-                    bboxes.append((x / image.width, y / image.height, (x + w) / image.width, (y + h) / image.height))
-                    words.append(data['text'][i])
-
-            page = OCRPage(
-                text=text,
-                words=words,
-                bboxes=bboxes
-            )
-            pages.append(page)
+    @staticmethod
+    def _ocr_page(image: Image) -> OCRPage:
+        text = pytesseract.image_to_string(image)
+        data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        bboxes = []
+        words = []
+
+        # For each word in the data...
+        for i in range(len(data['text'])):
+            # ...if the word isn't empty
+            if data['text'][i].strip():
+                x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
+                # add bounding box
+                bboxes.append((x / image.width, y / image.height, (x + w) / image.width, (y + h) / image.height))
+                words.append(data['text'][i])
 
-        return OCRResult(pages=pages)
+        return OCRPage(
+            text=text,
+            words=words,
+            bboxes=bboxes
+        )
 
     def identify_image_language(self, image: Image) -> str:
         self.download_if_missing('eng')
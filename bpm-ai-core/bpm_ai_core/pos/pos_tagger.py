@@ -14,3 +14,9 @@ class POSTagger(ABC):
         [('I', 'PRON'), ('am', 'AUX'), ('30', 'NUM'), ('years', 'NOUN'), ('old', 'ADJ'), ('.', 'PUNCT')]
         """
         pass
+
+    def tag_many(self, texts: list[str]) -> list[list[Tuple[str, str]]]:
+        """
+        Tags multiple texts, implementations may batch them.
+        """
+        return [self.tag(text) for text in texts]
@@ -11,6 +11,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+EXCLUDED_COMPONENTS = ["parser", "ner", "lemmatizer"]
+"""Not needed for POS tagging, so not even loaded."""
+
+_pipelines: dict[str, "spacy.Language"] = {}
+"""Loaded pipelines shared by all taggers, keyed by pipeline name."""
+
 
 def _get_pipeline_for_language(language: str):
     match language:
@@ -42,6 +48,20 @@ def _get_pipeline_for_language(language: str):
             return "en_core_web_md"
 
 
+def _load_pipeline(pipeline: str) -> "spacy.Language":
+    if pipeline not in _pipelines:
+        for i in range(3):
+            try:
+                _pipelines[pipeline] = spacy.load(pipeline, exclude=EXCLUDED_COMPONENTS)
+                break
+            except OSError:
+                if i == 2:
+                    raise
+                from spacy.cli import download
+                download(pipeline)
+    return _pipelines[pipeline]
+
+
 class SpacyPOSTagger(POSTagger):
     """
     Local POS Tagger based on spaCy library.
@@ -49,21 +69,25 @@ class SpacyPOSTagger(POSTagger):
     To use, you should have the ``spacy`` python package installed.
     """
 
-    def __init__(self, language: str = "en"):
+    def __init__(self, language: str = "en", batch_size: int = 64, n_process: int = 1):
+        """
+        :param language: Language of the texts, selects the spaCy pipeline
+        :param batch_size: Number of texts per batch in tag_many
+        :param n_process: Number of processes used by tag_many, only worth it for large numbers of texts
+        """
         if not has_spacy:
             raise ImportError('spacy is not installed')
-        pipeline = _get_pipeline_for_language(language)
-        for i in range(3):
-            try:
-                self.nlp = spacy.load(pipeline, disable=["lemmatizer"])
-            except OSError:
-                from spacy.cli import download
-                download(pipeline)
-                continue
+        self.nlp = _load_pipeline(_get_pipeline_for_language(language))
+        self.batch_size = batch_size
+        self.n_process = n_process
 
     def tag(self, text: str) -> list[Tuple[str, str]]:
         doc = self.nlp(text)
         return [(token.text_with_ws, token.pos_) for token in doc]
 
+    def tag_many(self, texts: list[str]) -> list[list[Tuple[str, str]]]:
+        docs = self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+        return [[(token.text_with_ws, token.pos_) for token in doc] for doc in docs]
+
 
 
@@ -1,3 +1,4 @@
+import functools
 import logging
 
 from typing_extensions import override
@@ -6,7 +7,7 @@ from bpm_ai_core.llm.common.blob import Blob
 from bpm_ai_core.question_answering.question_answering import QuestionAnswering, QAResult
 
 try:
-    from transformers import pipeline, AutoTokenizer
+    from transformers import pipeline
     has_transformers = True
 except ImportError:
     has_transformers = False
@@ -14,6 +15,11 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_pipeline(model: str):
+    return pipeline("question-answering", model=model)
+
+
 class TransformersExtractiveQA(QuestionAnswering):
     """
     Local extractive question answering model based on Huggingface transformers library.
@@ -37,10 +43,9 @@ class TransformersExtractiveQA(QuestionAnswering):
         else:
             context = context_str_or_blob
 
-        qa_model = pipeline("question-answering", model=self.model)
+        qa_model = _get_pipeline(self.model)
 
-        tokenizer = AutoTokenizer.from_pretrained(self.model)
-        tokens = tokenizer.encode(context + question)
+        tokens = qa_model.tokenizer.encode(context + question)
         logger.debug(f"Input tokens: {len(tokens)}")
 
         prediction = qa_model(
@@ -1,9 +1,22 @@
+import asyncio
 import io
 from abc import ABC, abstractmethod
-from typing import Optional, Union
+from typing import Optional, Union, AsyncIterator, BinaryIO, Callable, Awaitable, Any
+
+from pydantic import BaseModel
 
 from bpm_ai_core.tracing.decorators import span
-from bpm_ai_core.util.audio import load_audio
+from bpm_ai_core.tracing.tracing import Tracing
+from bpm_ai_core.llm.common.blob import Blob
+from bpm_ai_core.util.audio import load_audio_blob, split_on_silence, AudioChunk, SAMPLING_RATE
+
+
+class TranscriptionSegment(BaseModel):
+    text: str
+    start: float = 0.0
+    """Start of the segment in seconds."""
+    end: float | None = None
+    """End of the segment in seconds, None if unknown."""
 
 
 class ASRModel(ABC):
@@ -12,13 +25,103 @@ class ASRModel(ABC):
     """
 
     @abstractmethod
-    async def _do_transcribe(self, audio: io.BytesIO, language: Optional[str] = None) -> str:
+    async def _do_transcribe(self, audio: BinaryIO, language: Optional[str] = None) -> str:
         pass
 
+    async def _do_transcribe_stream(self, audio: BinaryIO, language: Optional[str] = None) -> AsyncIterator[TranscriptionSegment]:
+        """
+        Yields the transcribed segments as soon as they are decoded.
+        Backends that can decode incrementally should override this, by default the full transcript is awaited.
+        """
+        yield TranscriptionSegment(text=await self._do_transcribe(audio, language))
+
     @span(name="asr")
-    async def transcribe(self, audio_or_path: Union[io.BytesIO, str], language: Optional[str] = None) -> str:
-        if isinstance(audio_or_path, str):
-            audio = load_audio(audio_or_path)
-        else:
-            audio = audio_or_path
-        return await self._do_transcribe(audio, language)
+    async def transcribe(self, audio_or_path: Union[io.BytesIO, str, Blob], language: Optional[str] = None) -> str:
+        audio = await _load_audio(audio_or_path)
+        try:
+            return await self._do_transcribe(audio, language)
+        finally:
+            if audio is not audio_or_path:
+                audio.close()
+
+    async def transcribe_stream(
+            self,
+            audio_or_path: Union[io.BytesIO, str, Blob],
+            language: Optional[str] = None
+    ) -> AsyncIterator[TranscriptionSegment]:
+        """
+        Like `transcribe`, but yields timed segments as soon as they are available,
+        giving early partial results for long recordings.
+        """
+        audio = await _load_audio(audio_or_path)
+        segment_count = 0
+        try:
+            async for segment in self._do_transcribe_stream(audio, language):
+                segment_count += 1
+                yield segment
+        finally:
+            if audio is not audio_or_path:
+                audio.close()
+            Tracing.tracers().event(
+                "asr-stream",
+                inputs={"audio_or_path": audio_or_path if isinstance(audio_or_path, str) else "<audio>", "language": language},
+                outputs={"segments": segment_count}
+            )
+
+
+async def _load_audio(audio_or_path: Union[io.BytesIO, str, Blob]) -> BinaryIO:
+    # paths and URLs are streamed into a (disk-backed if large) temporary file
+    if isinstance(audio_or_path, str):
+        audio_or_path = Blob.from_path_or_url(audio_or_path)
+    if isinstance(audio_or_path, Blob):
+        return await load_audio_blob(audio_or_path)
+    return audio_or_path
+
+
+async def transcribe_chunked(
+        samples,
+        transcribe_samples: Callable[[Any, Optional[str]], Awaitable[list[TranscriptionSegment]]],
+        language: Optional[str] = None,
+        max_chunk_seconds: float = 30.0,
+        overlap_seconds: float = 1.0,
+        max_concurrency: int = 4
+) -> list[TranscriptionSegment]:
+    """
+    Splits long audio (decoded mono samples at SAMPLING_RATE) on silence and transcribes up to max_concurrency
+    chunks at the same time using transcribe_samples. The segments are stitched back in order,
+    with timestamps relative to the whole recording.
+    """
+    chunks = split_on_silence(samples, max_chunk_seconds=max_chunk_seconds, overlap_seconds=overlap_seconds)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def transcribe_chunk(chunk: AudioChunk) -> list[TranscriptionSegment]:
+        async with semaphore:
+            segments = await transcribe_samples(samples[chunk.start:chunk.end], language)
+        offset = chunk.start / SAMPLING_RATE
+        return [
+            TranscriptionSegment(
+                text=segment.text,
+                start=segment.start + offset,
+                end=segment.end + offset if segment.end is not None else None
+            )
+            for segment in segments
+        ]
+
+    results = await asyncio.gather(*[transcribe_chunk(chunk) for chunk in chunks])
+    return stitch_segments(chunks, results)
+
+
+def stitch_segments(chunks: list[AudioChunk], chunk_segments: list[list[TranscriptionSegment]]) -> list[TranscriptionSegment]:
+    """
+    Merges the segments of overlapping chunks: each chunk keeps the segments centered before the middle
+    of its overlap with the next chunk, so speech in the overlap is only kept once.
+    """
+    stitched = []
+    for i, segments in enumerate(chunk_segments):
+        lower = (chunks[i - 1].end + chunks[i].start) / 2 / SAMPLING_RATE if i > 0 else float("-inf")
+        upper = (chunks[i].end + chunks[i + 1].start) / 2 / SAMPLING_RATE if i < len(chunks) - 1 else float("inf")
+        for segment in segments:
+            center = (segment.start + segment.end) / 2 if segment.end is not None else segment.start
+            if lower <= center < upper:
+                stitched.append(segment)
+    return stitched
@@ -1,8 +1,10 @@
-import io
+import asyncio
+from typing import AsyncIterator, BinaryIO
 
 from typing_extensions import override
 
-from bpm_ai_core.speech_recognition.asr import ASRModel
+from bpm_ai_core.speech_recognition.asr import ASRModel, TranscriptionSegment, transcribe_chunked
+from bpm_ai_core.util.audio import decode_audio
 
 try:
     from faster_whisper import WhisperModel
@@ -10,6 +12,16 @@ try:
 except ImportError:
     has_faster_whisper = False
 
+_models: dict[tuple, "WhisperModel"] = {}
+"""Loaded models shared by all instances, keyed by (model_size, device, compute_type, num_workers)."""
+
+
+def _get_model(model_size: str, device: str, compute_type: str, num_workers: int = 1) -> "WhisperModel":
+    key = (model_size, device, compute_type, num_workers)
+    if key not in _models:
+        _models[key] = WhisperModel(model_size, device=device, compute_type=compute_type, num_workers=num_workers)
+    return _models[key]
+
 
 class FasterWhisperASR(ASRModel):
     """
@@ -22,18 +34,84 @@ class FasterWhisperASR(ASRModel):
         self,
         model_size: str = "small",
         device: str = "cpu",
-        compute_type: str = "int8"
+        compute_type: str = "int8",
+        beam_size: int = 5,
+        vad_filter: bool = False,
+        vad_parameters: dict | None = None,
+        batch_size: int | None = None,
+        num_workers: int = 1,
+        chunk_seconds: float | None = None,
+        overlap_seconds: float = 1.0
     ):
+        """
+        :param beam_size: Beam size for decoding, 1 for greedy decoding
+        :param vad_filter: Skip parts of the audio without speech using the Silero VAD model
+        :param vad_parameters: Options of the VAD model, e.g. {"min_silence_duration_ms": 500}
+        :param batch_size: If set, speech chunks are decoded in batches of this size (requires faster-whisper >= 1.1)
+        :param num_workers: Number of CTranslate2 workers, i.e. chunks that can be transcribed in parallel
+        :param chunk_seconds: If set, longer recordings are split on silence into chunks of this length, transcribed in parallel
+        :param overlap_seconds: Overlap of consecutive chunks
+        """
         if not has_faster_whisper:
             raise ImportError('faster_whisper is not installed')
         self.model_size = model_size
-        self.model = WhisperModel(
-            model_size,
-            device=device,
-            compute_type=compute_type
-        )
+        self.model = _get_model(model_size, device, compute_type, num_workers)
+        self.beam_size = beam_size
+        self.vad_filter = vad_filter
+        self.vad_parameters = vad_parameters
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+
+    def _segments(self, audio, language: str = None):
+        """Returns faster-whisper's lazy segment generator, audio is only decoded while it is iterated."""
+        kwargs = {"language": language, "beam_size": self.beam_size, "vad_parameters": self.vad_parameters}
+        if self.batch_size:
+            from faster_whisper import BatchedInferencePipeline
+            segments, info = BatchedInferencePipeline(model=self.model).transcribe(
+                audio, batch_size=self.batch_size, **kwargs
+            )
+        else:
+            segments, info = self.model.transcribe(audio, vad_filter=self.vad_filter, **kwargs)
+        return segments
+
+    @override
+    async def _do_transcribe(self, audio: BinaryIO, language: str = None) -> str:
+        if self.chunk_seconds:
+            samples = await asyncio.to_thread(decode_audio, audio)
+            segments = await transcribe_chunked(
+                samples,
+                self._transcribe_samples,
+                language,
+                max_chunk_seconds=self.chunk_seconds,
+                overlap_seconds=self.overlap_seconds,
+                max_concurrency=self.num_workers
+            )
+            return "".join([s.text for s in segments])
+        return "".join([s.text async for s in self._do_transcribe_stream(audio, language)])
+
+    async def _transcribe_samples(self, samples, language: str = None) -> list[TranscriptionSegment]:
+        # each call runs on its own thread, CTranslate2 spreads concurrent calls over num_workers model replicas
+        def transcribe():
+            return [
+                TranscriptionSegment(text=s.text, start=s.start, end=s.end)
+                for s in self._segments(samples, language)
+            ]
+        return await asyncio.to_thread(transcribe)
 
     @override
-    async def _do_transcribe(self, audio: io.BytesIO, language: str = None) -> str:
-        segments, info = self.model.transcribe(audio, language=language)
-        return "".join([s.text for s in list(segments)])
+    async def _do_transcribe_stream(self, audio: BinaryIO, language: str = None) -> AsyncIterator[TranscriptionSegment]:
+        segments = await asyncio.to_thread(self._segments, audio, language)
+        try:
+            while True:
+                # decode one segment at a time on a worker thread, keeping the event loop free and memory bounded
+                segment = await asyncio.to_thread(next, segments, None)
+                if segment is None:
+                    break
+                yield TranscriptionSegment(text=segment.text, start=segment.start, end=segment.end)
+        finally:
+            try:
+                segments.close()
+            except ValueError:
+                pass  # still running on the worker thread after cancellation, ends with the next segment
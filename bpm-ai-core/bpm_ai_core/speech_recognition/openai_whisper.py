@@ -1,28 +1,39 @@
+import asyncio
+import importlib.util
 import io
 import logging
-from typing import Optional
+from typing import Optional, BinaryIO
 
 from typing_extensions import override
 
-from bpm_ai_core.speech_recognition.asr import ASRModel
+from bpm_ai_core.speech_recognition.asr import ASRModel, TranscriptionSegment, transcribe_chunked
+from bpm_ai_core.util.audio import decode_audio, encode_wav, SAMPLING_RATE
 
 logger = logging.getLogger(__name__)
 
-try:
-    from openai import AsyncOpenAI, OpenAIError
-    import httpx
+has_openai = importlib.util.find_spec("openai") is not None
 
-    has_openai = True
-    try:
-        client = AsyncOpenAI(
+MAX_FILE_BYTES = 25 * 1024 * 1024
+"""Max size of an uploaded audio file."""
+
+MAX_CHUNK_SECONDS = (MAX_FILE_BYTES - 44) // (2 * SAMPLING_RATE)
+"""Max length (including overlap) of a chunk uploaded as 16 bit mono WAV file, about 819 seconds."""
+
+_client = None
+
+
+def _get_client():
+    # created on first use, so importing this module neither imports openai nor requires an API key
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+        import httpx
+        _client = AsyncOpenAI(
             http_client=httpx.AsyncClient(
                 limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
             ),
         )
-    except OpenAIError as e:
-        logger.error(e)
-except ImportError:
-    has_openai = False
+    return _client
 
 
 class OpenAIWhisperASR(ASRModel):
@@ -35,17 +46,74 @@ class OpenAIWhisperASR(ASRModel):
 
     def __init__(
         self,
-        whisper_model: str = "whisper-1"
+        whisper_model: str = "whisper-1",
+        chunk_seconds: float = 600.0,
+        overlap_seconds: float = 1.0,
+        max_concurrency: int = 4
     ):
+        """
+        :param whisper_model: Whisper model name
+        :param chunk_seconds: Recordings exceeding the upload size limit are split on silence into chunks of this length,
+            chunk_seconds + overlap_seconds must not exceed MAX_CHUNK_SECONDS
+        :param overlap_seconds: Overlap of consecutive chunks
+        :param max_concurrency: Max number of chunks uploaded at the same time
+        """
+        if chunk_seconds + overlap_seconds > MAX_CHUNK_SECONDS:
+            raise ValueError(
+                f"chunk_seconds + overlap_seconds must not exceed {MAX_CHUNK_SECONDS} seconds, "
+                f"as longer chunks exceed the upload size limit"
+            )
         if not has_openai:
             raise ImportError('openai is not installed')
         self.whisper_model = whisper_model
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.max_concurrency = max_concurrency
 
     @override
-    async def _do_transcribe(self, audio: io.BytesIO, language: Optional[str] = None) -> str:
-        transcript = await client.audio.transcriptions.create(
+    async def _do_transcribe(self, audio: BinaryIO, language: Optional[str] = None) -> str:
+        if _size(audio) <= MAX_FILE_BYTES:
+            transcript = await _get_client().audio.transcriptions.create(
+                model=self.whisper_model,
+                file=audio,
+                **{"language": language} if language else {}
+            )
+            return transcript.text
+        logger.info("Audio exceeds the upload size limit, transcribing in chunks")
+        samples = await asyncio.to_thread(decode_audio, audio)
+        segments = await transcribe_chunked(
+            samples,
+            self._transcribe_samples,
+            language,
+            max_chunk_seconds=self.chunk_seconds,
+            overlap_seconds=self.overlap_seconds,
+            max_concurrency=self.max_concurrency
+        )
+        return "".join([s.text for s in segments]).strip()
+
+    async def _transcribe_samples(self, samples, language: Optional[str] = None) -> list[TranscriptionSegment]:
+        transcript = await _get_client().audio.transcriptions.create(
             model=self.whisper_model,
-            file=audio,
+            file=encode_wav(samples),
+            response_format="verbose_json",
             **{"language": language} if language else {}
         )
-        return transcript.text
+        segments = getattr(transcript, "segments", None)
+        if not segments:
+            return [TranscriptionSegment(text=transcript.text)]
+        return [
+            TranscriptionSegment(text=_field(s, "text"), start=_field(s, "start"), end=_field(s, "end"))
+            for s in segments
+        ]
+
+
+def _size(audio: BinaryIO) -> int:
+    position = audio.tell()
+    size = audio.seek(0, io.SEEK_END)
+    audio.seek(position)
+    return size
+
+
+def _field(segment, name: str):
+    # older openai versions return verbose segments as plain dicts
+    return segment[name] if isinstance(segment, dict) else getattr(segment, name)
@@ -1,6 +1,15 @@
+import functools
+import inspect
+
 from bpm_ai_core.tracing.tracer import Tracer
 
 
+@functools.lru_cache(maxsize=None)
+def _accepts_usage(tracer_type: type) -> bool:
+    parameters = inspect.signature(tracer_type.end_llm_trace).parameters
+    return "usage" in parameters or any(p.kind == p.VAR_KEYWORD for p in parameters.values())
+
+
 class DelegateTracer(Tracer):
     def __init__(self, tracers: list[Tracer]):
         self.tracers = tracers
@@ -25,9 +34,13 @@ class DelegateTracer(Tracer):
         for tracer in self.tracers:
             tracer.start_llm_trace(llm, messages, current_try, tools)
 
-    def end_llm_trace(self, completion=None, error_msg=None):
+    def end_llm_trace(self, completion=None, error_msg=None, usage=None):
         for tracer in self.tracers:
-            tracer.end_llm_trace(completion, error_msg)
+            # usage is only passed to tracers accepting it, so tracers implementing the older signature keep working
+            if usage is None or not _accepts_usage(type(tracer)):
+                tracer.end_llm_trace(completion, error_msg)
+            else:
+                tracer.end_llm_trace(completion, error_msg, usage=usage)
 
     def start_tool_trace(self, tool, inputs):
         for tracer in self.tracers:
@@ -95,13 +95,17 @@ class LangfuseTracer(Tracer):
             }
         )
 
-    def end_llm_trace(self, completion=None, error_msg: str = None):
+    def end_llm_trace(self, completion=None, error_msg: str = None, usage: dict = None):
         if not self.generation:
             raise Exception("No generation started for this thread")
         self.generation.end(
             output=completion,
             level="ERROR" if error_msg else None,
-            status_message=error_msg
+            status_message=error_msg,
+            **({
+                "usage": {"input": usage["input_tokens"], "output": usage["output_tokens"], "unit": "TOKENS"},
+                "metadata": {"usage": usage}
+            } if usage else {})
         )
         if self.implicit_trace:
             self.end_trace(outputs=completion)
@@ -43,11 +43,11 @@ class LoggingTracer(Tracer):
     def start_llm_trace(self, llm, messages, current_try, tools=None):
         logger.info(self._indent() + f"[LLM <] {llm.model}, current_try: {current_try}, tools={tools}, messages={messages}")
 
-    def end_llm_trace(self, completion=None, error_msg=None):
+    def end_llm_trace(self, completion=None, error_msg=None, usage=None):
         if error_msg:
             logger.error(self._indent() + f"[LLM COMPLETION ERROR] {error_msg}")
             return
-        logger.info(self._indent() + f"[LLM >] {completion}")
+        logger.info(self._indent() + f"[LLM >] {completion}{f', usage={usage}' if usage else ''}")
 
     def start_tool_trace(self, tool, inputs):
         logger.info(self._indent() + f"[TOOL] {tool.name}({inputs})")
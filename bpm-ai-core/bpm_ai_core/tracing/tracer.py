@@ -23,7 +23,7 @@ class Tracer(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def end_llm_trace(self, completion=None, error_msg=None):
+    def end_llm_trace(self, completion=None, error_msg=None, usage: dict | None = None):
         pass
 
     @abstractmethod
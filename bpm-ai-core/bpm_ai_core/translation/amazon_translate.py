@@ -1,38 +1,189 @@
 import asyncio
+import logging
+import weakref
 from typing import List
 
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential, retry_if_exception
 from typing_extensions import override
 
-from bpm_ai_core.translation.nmt import NMTModel
+from bpm_ai_core.translation.nmt import NMTModel, split_text, join_translated_parts
+from bpm_ai_core.translation.translation_memory import TranslationMemory
+from bpm_ai_core.util.language import identify_language_with_confidence, has_lingua
 
 try:
     from aiobotocore.session import get_session
+    from botocore.exceptions import ClientError
 
     has_amazon_translate = True
 except ImportError:
     has_amazon_translate = False
 
+logger = logging.getLogger(__name__)
+
+MAX_REQUEST_BYTES = 10_000
+"""Max UTF-8 size of the text of a single TranslateText request."""
+
+PACKING_DELIMITER = "\n\n|||\n\n"
+"""Joins small texts into a single request, Amazon Translate keeps it untouched."""
+
+MIN_PACKING_CONFIDENCE = 0.5
+"""Texts are only packed with others of the same detected language if the detection is at least this confident."""
+
+RETRYABLE_ERROR_CODES = ["ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException", "InternalServerException"]
+
 
 class AmazonTranslate(NMTModel):
     """Amazon Translate NMT Model"""
-    def __init__(self, region_name: str = None):
+    def __init__(
+            self,
+            region_name: str = None,
+            translation_memory: TranslationMemory = None,
+            max_concurrency: int = 8,
+            max_retries: int = 8,
+            pack_texts: bool = True
+    ):
+        """
+        :param region_name: AWS region
+        :param translation_memory: If set, already translated texts are not translated again
+        :param max_concurrency: Max number of simultaneous TranslateText requests
+        :param max_retries: Max attempts per request on throttling and server errors
+        :param pack_texts: Join small texts of the same language into single requests up to the API size limit
+        """
         if not has_amazon_translate:
             raise ImportError("aiobotocore is not installed")
         self.region_name = region_name
+        self.translation_memory = translation_memory
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.pack_texts = pack_texts
+        # aiobotocore clients are bound to the event loop they were created in
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object] = weakref.WeakKeyDictionary()
 
-    async def _translate_single(self, text: str, target_language: str) -> str:
-        async with get_session().create_client('translate', region_name=self.region_name) as client:
-            response = await client.translate_text(
-                Text=text,
-                SourceLanguageCode='auto',
-                TargetLanguageCode=target_language
-            )
-            return response['TranslatedText']
+    async def _get_client(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            self._clients[loop] = await get_session().create_client('translate', region_name=self.region_name).__aenter__()
+        return self._clients[loop]
+
+    async def aclose(self):
+        """Closes the client of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.__aexit__(None, None, None)
+
+    async def _translate_single(self, text: str, target_language: str, source_language: str = 'auto') -> str:
+        return (await self._translate_text(text, target_language, source_language))['TranslatedText']
+
+    async def _translate_text(self, text: str, target_language: str, source_language: str = 'auto') -> dict:
+        if not text.strip():
+            return {'TranslatedText': text}
+        client = await self._get_client()
+        async for attempt in AsyncRetrying(
+            wait=wait_exponential(multiplier=0.5, min=0.5, max=30),
+            stop=stop_after_attempt(self.max_retries),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        ):
+            with attempt:
+                response = await client.translate_text(
+                    Text=text,
+                    SourceLanguageCode=source_language,
+                    TargetLanguageCode=target_language
+                )
+        return response
 
     @override
     async def _do_translate(self, text: str | List[str], target_language: str) -> str | List[str]:
         if isinstance(text, str):
-            return await self._translate_single(text, target_language)
+            return (await self._translate_many([text], target_language))[0]
         else:
-            tasks = [self._translate_single(t, target_language) for t in text]
-            return await asyncio.gather(*tasks)
+            return await self._translate_many(text, target_language)
+
+    async def _translate_many(self, texts: List[str], target_language: str) -> List[str]:
+        # texts over the request size limit are translated in parts
+        parts = [split_text(text, MAX_REQUEST_BYTES, _utf8_size) for text in texts]
+        translated_parts = await self._translate_requests([p.strip() for ps in parts for p in ps], target_language)
+        translated, start = [], 0
+        for ps in parts:
+            translated.append(join_translated_parts(ps, translated_parts[start:start + len(ps)]))
+            start += len(ps)
+        return translated
+
+    async def _translate_requests(self, texts: List[str], target_language: str) -> List[str]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def translate_request(request_text: str) -> dict:
+            async with semaphore:
+                return await self._translate_text(request_text, target_language)
+
+        requests = self._pack(texts) if self.pack_texts else [([i], texts[i], None) for i in range(len(texts))]
+        responses = await asyncio.gather(*[translate_request(request_text) for _, request_text, _ in requests])
+
+        translated = [None] * len(texts)
+        retranslate = []
+        for (indices, _, language), response in zip(requests, responses):
+            if len(indices) == 1:
+                translated[indices[0]] = response['TranslatedText']
+                continue
+            parts = response['TranslatedText'].split(PACKING_DELIMITER.strip())
+            detected_language = response.get('SourceLanguageCode')
+            if detected_language and detected_language.split("-")[0] != language:
+                logger.warning(f"Packed texts detected as {language} were translated from {detected_language}, translating texts individually")
+                retranslate.extend(indices)
+            elif len(parts) != len(indices):
+                logger.warning("Packed translation could not be split back, translating texts individually")
+                retranslate.extend(indices)
+            else:
+                for idx, part in zip(indices, parts):
+                    translated[idx] = part.strip()
+
+        if retranslate:
+            responses = await asyncio.gather(*[translate_request(texts[idx]) for idx in retranslate])
+            for idx, response in zip(retranslate, responses):
+                translated[idx] = response['TranslatedText']
+        return translated
+
+    def _pack(self, texts: List[str]) -> list[tuple[list[int], str, str | None]]:
+        """
+        Groups texts into requests of (text indices, request text, detected source language).
+        Small texts confidently detected as the same language are joined by the packing delimiter up to the max request size.
+        All requests use automatic source language detection, which runs once per request.
+        """
+        delimiter_size = _utf8_size(PACKING_DELIMITER)
+        requests = []
+        open_requests: dict[str, tuple[list[int], int]] = {}  # source language -> (indices, size)
+        for idx, text in enumerate(texts):
+            size = _utf8_size(text)
+            source_language = None
+            if size + delimiter_size <= MAX_REQUEST_BYTES and PACKING_DELIMITER.strip() not in text and text.strip():
+                source_language = self._detect_language(text)
+            if source_language is None:
+                requests.append(([idx], text, None))
+                continue
+            indices, request_size = open_requests.get(source_language, ([], 0))
+            if indices and request_size + delimiter_size + size > MAX_REQUEST_BYTES:
+                requests.append((indices, PACKING_DELIMITER.join(texts[i] for i in indices), source_language))
+                indices, request_size = [], 0
+            open_requests[source_language] = (indices + [idx], request_size + (delimiter_size if indices else 0) + size)
+        for source_language, (indices, _) in open_requests.items():
+            requests.append((indices, PACKING_DELIMITER.join(texts[i] for i in indices), source_language))
+        return requests
+
+    @staticmethod
+    def _detect_language(text: str) -> str | None:
+        # texts packed into one request must share a source language, as auto detection runs per request
+        if not has_lingua:
+            return None
+        try:
+            language, confidence = identify_language_with_confidence(text)
+        except Exception:
+            return None
+        return language if confidence >= MIN_PACKING_CONFIDENCE else None
+
+
+def _utf8_size(text: str) -> int:
+    return len(text.encode())
+
+
+def _is_retryable(e: BaseException) -> bool:
+    return isinstance(e, ClientError) and e.response.get('Error', {}).get('Code') in RETRYABLE_ERROR_CODES
@@ -1,9 +1,13 @@
+import asyncio
 import logging
 import os
+import weakref
+from typing import Awaitable, Callable
 
 from typing_extensions import override
 
-from bpm_ai_core.translation.nmt import NMTModel
+from bpm_ai_core.translation.nmt import NMTModel, split_text, join_translated_parts
+from bpm_ai_core.translation.translation_memory import TranslationMemory
 
 try:
     from azure.ai.translation.text import TranslatorCredential
@@ -17,27 +21,113 @@ except ImportError:
 azure_logger = logging.getLogger('azure')
 azure_logger.setLevel(logging.WARNING)
 
+MAX_ELEMENTS_PER_REQUEST = 1000
+MAX_CHARACTERS_PER_REQUEST = 50_000
+
 
 class AzureTranslation(NMTModel):
     """Azure Text Translation NMT Model"""
 
-    def __init__(self, endpoint: str = None, region: str = "westeurope"):
+    def __init__(
+            self,
+            endpoint: str = None,
+            region: str = "westeurope",
+            translation_memory: TranslationMemory = None,
+            max_concurrency: int = 4
+    ):
+        """
+        :param endpoint: Translator endpoint, defaults to the AZURE_TRANSLATION_ENDPOINT env variable
+        :param region: Translator resource region
+        :param translation_memory: If set, already translated texts are not translated again
+        :param max_concurrency: Max number of chunks submitted at the same time
+        """
         if not has_azure_translation:
             raise ImportError('azure-ai-translation-text  is not installed')
         self.key = os.getenv('AZURE_TRANSLATION_KEY')
         self.endpoint = endpoint or os.getenv('AZURE_TRANSLATION_ENDPOINT')
         self.region = region or os.getenv('AZURE_TRANSLATION_REGION')
+        self.translation_memory = translation_memory
+        self.max_concurrency = max_concurrency
+        # the client's transport is bound to the event loop it is used in
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object] = weakref.WeakKeyDictionary()
 
-    @override
-    async def _do_translate(self, text: str | list[str], target_language: str) -> str | list[str]:
-        async with TextTranslationClient(
+    def _get_client(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            self._clients[loop] = TextTranslationClient(
                 endpoint=self.endpoint,
                 credential=TranslatorCredential(self.key, self.region)
-        ) as client:
-            if isinstance(text, str):
-                texts = [text]
-            else:
-                texts = text
-            items = [InputTextItem(text=text) for text in texts]
-            response = await client.translate(content=items, to=[target_language])
+            )
+        return self._clients[loop]
+
+    async def aclose(self):
+        """Closes the client of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    @override
+    async def _do_translate(self, text: str | list[str], target_language: str) -> str | list[str]:
+        if isinstance(text, str):
+            texts = [text]
+        else:
+            texts = text
+
+        client = self._get_client()
+
+        async def translate_chunk(chunk: list[str]) -> list[str]:
+            response = await client.translate(content=[InputTextItem(text=t) for t in chunk], to=[target_language])
             return [doc.translations[0].text for doc in response]
+
+        translated = await translate_in_chunks(texts, translate_chunk, max_concurrency=self.max_concurrency)
+        return translated[0] if isinstance(text, str) else translated
+
+
+async def translate_in_chunks(
+        texts: list[str],
+        translate_chunk: Callable[[list[str]], Awaitable[list[str]]],
+        max_elements: int = MAX_ELEMENTS_PER_REQUEST,
+        max_characters: int = MAX_CHARACTERS_PER_REQUEST,
+        max_concurrency: int = 4
+) -> list[str]:
+    """
+    Translates texts in concurrent chunks within the per-request limits.
+    Texts exceeding the character limit are translated in parts, split at paragraph, sentence or word boundaries.
+    """
+    parts = [split_text(text, max_characters) for text in texts]
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def translate(chunk: list[str]) -> list[str]:
+        async with semaphore:
+            return await translate_chunk(chunk)
+
+    chunks = chunk_texts([p.strip() for ps in parts for p in ps], max_elements, max_characters)
+    results = await asyncio.gather(*[translate(chunk) for chunk in chunks])
+    translated_parts = [t for chunk in results for t in chunk]
+    translated, start = [], 0
+    for ps in parts:
+        translated.append(join_translated_parts(ps, translated_parts[start:start + len(ps)]))
+        start += len(ps)
+    return translated
+
+
+def chunk_texts(
+        texts: list[str],
+        max_elements: int = MAX_ELEMENTS_PER_REQUEST,
+        max_characters: int = MAX_CHARACTERS_PER_REQUEST
+) -> list[list[str]]:
+    """
+    Splits texts into consecutive chunks that stay within the per-request element and character limits.
+    A single text exceeding the character limit gets a chunk of its own, see translate_in_chunks for splitting it.
+    """
+    chunks = []
+    current, current_characters = [], 0
+    for text in texts:
+        if current and (len(current) >= max_elements or current_characters + len(text) > max_characters):
+            chunks.append(current)
+            current, current_characters = [], 0
+        current.append(text)
+        current_characters += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,58 @@
+import os
+
+from bpm_ai_core.translation.easy_nmt.ctranslate2_opus_mt import CTranslate2OpusMT
+from bpm_ai_core.translation.easy_nmt.easy_nmt import EasyNMT
+from bpm_ai_core.translation.translation_memory import TranslationMemory
+
+_translators: dict[tuple, CTranslate2OpusMT] = {}
+
+
+class CTranslate2NMT(EasyNMT):
+    """
+    Local Opus-MT NMT model running on CTranslate2, by default int8 quantized for fast CPU inference.
+    Uses the same sentence splitting and length-sorted batching as EasyNMT.
+
+    To use, you should have the ``ctranslate2``, ``transformers`` and ``torch`` python packages installed
+    (torch is only needed to convert the models on first use).
+    """
+
+    def __init__(
+            self,
+            cache_folder: str = None,
+            device: str = "cpu",
+            compute_type: str = "int8",
+            inter_threads: int = 1,
+            intra_threads: int = 0,
+            max_loaded_models: int = 10,
+            max_memory_mb: int | None = None,
+            max_length: int = None,
+            translation_memory: TranslationMemory = None
+    ):
+        super().__init__(
+            model_name="opus-mt",
+            cache_folder=cache_folder,
+            load_translator=False,
+            device=device,
+            max_length=max_length,
+            translation_memory=translation_memory
+        )
+        key = (self._cache_folder, compute_type, inter_threads, intra_threads, max_loaded_models, max_memory_mb)
+        if key not in _translators:
+            _translators[key] = CTranslate2OpusMT(
+                cache_folder=os.path.join(self._cache_folder, "ctranslate2"),
+                compute_type=compute_type,
+                inter_threads=inter_threads,
+                intra_threads=intra_threads,
+                max_loaded_models=max_loaded_models,
+                max_memory_mb=max_memory_mb
+            )
+        self.translator = _translators[key]
+        self._worker_kwargs = dict(
+            cache_folder=self._cache_folder,
+            compute_type=compute_type,
+            inter_threads=inter_threads,
+            intra_threads=intra_threads,
+            max_loaded_models=max_loaded_models,
+            max_memory_mb=max_memory_mb,
+            max_length=max_length
+        )
@@ -0,0 +1,134 @@
+import logging
+import os
+import shutil
+from typing import List
+
+from bpm_ai_core.translation.easy_nmt.opus_mt import OpusMT
+
+try:
+    import ctranslate2
+    has_ctranslate2 = True
+except ImportError:
+    has_ctranslate2 = False
+
+logger = logging.getLogger(__name__)
+
+
+class CTranslate2OpusMT(OpusMT):
+    """
+    Opus-MT translator running on CTranslate2.
+
+    Helsinki-NLP models are converted (and quantized) on first use and the converted
+    models are cached on disk, so later loads skip the conversion.
+    """
+
+    def __init__(
+            self,
+            easynmt_path: str = None,
+            cache_folder: str = None,
+            compute_type: str = "int8",
+            inter_threads: int = 1,
+            intra_threads: int = 0,
+            max_loaded_models: int = 10,
+            max_memory_mb: int | None = None
+    ):
+        """
+        :param easynmt_path: Path of the EasyNMT model folder
+        :param cache_folder: Folder for converted models, defaults to ``ctranslate2`` inside easynmt_path
+        :param compute_type: CTranslate2 quantization/compute type, e.g. int8, int8_float16, float16, float32
+        :param inter_threads: Max number of batches translated in parallel
+        :param intra_threads: Number of computation threads per batch (0 = CTranslate2 default)
+        :param max_loaded_models: Max number of language pair models kept in memory
+        :param max_memory_mb: Max total size of the loaded models, least recently used models are evicted first
+        """
+        if not has_ctranslate2:
+            raise ImportError('ctranslate2 is not installed')
+        super().__init__(easynmt_path=easynmt_path, max_loaded_models=max_loaded_models, max_memory_mb=max_memory_mb)
+        self.cache_folder = cache_folder or os.path.join(easynmt_path or ".", "ctranslate2")
+        self.compute_type = compute_type
+        self.inter_threads = inter_threads
+        self.intra_threads = intra_threads
+
+    def converted_model_path(self, model_name: str) -> str:
+        quantization = self.compute_type if self.compute_type != "default" else "none"
+        return os.path.join(self.cache_folder, f"{model_name.replace('/', '--')}-{quantization}")
+
+    def convert_model(self, model_name: str) -> str:
+        output_dir = self.converted_model_path(model_name)
+        if os.path.exists(os.path.join(output_dir, "model.bin")):
+            return output_dir
+        logger.info(f"Convert model {model_name} to CTranslate2 ({self.compute_type}) at {output_dir}")
+        tmp_dir = output_dir + "_part"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        converter = ctranslate2.converters.TransformersConverter(model_name)
+        converter.convert(
+            tmp_dir,
+            quantization=self.compute_type if self.compute_type != "default" else None,
+            force=True
+        )
+        os.replace(tmp_dir, output_dir)
+        return output_dir
+
+    def _load_model(self, model_name: str, device: str):
+        if model_name in self.models:
+            self.models.move_to_end(model_name)
+            entry = self.models[model_name]
+            if entry['device'] == device:
+                return entry['model']
+            del self.models[model_name]
+
+        model_path = self.convert_model(model_name)
+        logger.info("Load model: " + model_path)
+        model = ctranslate2.Translator(
+            model_path,
+            device=device,
+            compute_type=self.compute_type,
+            inter_threads=self.inter_threads,
+            intra_threads=self.intra_threads
+        )
+        memory_mb = os.path.getsize(os.path.join(model_path, "model.bin")) / (1024 * 1024)
+        self.models[model_name] = {'model': model, 'device': device, 'memory_mb': memory_mb}
+        self._evict()
+        return model
+
+    def translate_sentences(
+            self,
+            sentences: List[str],
+            source_lang: str,
+            target_lang: str,
+            device: str,
+            beam_size: int = 5,
+            max_length: int = None,
+            **kwargs
+    ):
+        model_name = 'Helsinki-NLP/opus-mt-{}-{}'.format(source_lang, target_lang)
+        tokenizer = self.load_tokenizer(model_name)
+        translator = self.load_model(model_name, device)
+
+        max_length = max_length or self.max_length
+        source_tokens = [
+            tokenizer.convert_ids_to_tokens(
+                tokenizer.encode(sentence, truncation=max_length is not None, max_length=max_length)
+            )
+            for sentence in sentences
+        ]
+        results = translator.translate_batch(
+            source_tokens,
+            beam_size=beam_size,
+            max_batch_size=len(source_tokens),
+            **({"max_decoding_length": max_length} if max_length else {}),
+            **kwargs
+        )
+        return [
+            tokenizer.decode(tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True)
+            for result in results
+        ]
+
+    def save(self, output_path):
+        return {
+            "max_loaded_models": self.max_loaded_models,
+            "max_memory_mb": self.max_memory_mb,
+            "compute_type": self.compute_type,
+            "inter_threads": self.inter_threads,
+            "intra_threads": self.intra_threads
+        }
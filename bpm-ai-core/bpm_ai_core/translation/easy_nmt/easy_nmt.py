@@ -1,17 +1,17 @@
+import asyncio
+import functools
 import json
 import logging
 import math
 import os
-import queue
 import re
-import time
-from typing import List, Union, Dict, FrozenSet, Iterable
+import threading
+from typing import List, Union, FrozenSet
 
 try:
     import nltk
     import numpy as np
     import torch
-    import torch.multiprocessing as mp
     import tqdm
     has_easynmt = True
 except ImportError:
@@ -19,13 +19,33 @@ except ImportError:
 
 from bpm_ai_core.translation.easy_nmt.opus_mt import OpusMT
 from bpm_ai_core.translation.easy_nmt.util import http_get, fullname
+from bpm_ai_core.translation.easy_nmt.worker_pool import TranslationWorkerPool
 from bpm_ai_core.translation.nmt import NMTModel
-from bpm_ai_core.util.language import indentify_language
+from bpm_ai_core.translation.translation_memory import TranslationMemory
+from bpm_ai_core.util.language import indentify_language, identify_languages
 
 logger = logging.getLogger(__name__)
 
 DOWNLOAD_URL = 'http://easynmt.net/models/v2'
 
+_translators: dict[str, OpusMT] = {}
+"""Translators shared by all EasyNMT instances, keyed by model path, so loaded models survive instance creation."""
+
+_translators_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_config(model_path: str) -> dict:
+    with open(os.path.join(model_path, 'easynmt.json')) as fIn:
+        return json.load(fIn)
+
+
+def _get_translator(model_path: str, model_args: dict) -> OpusMT:
+    with _translators_lock:
+        if model_path not in _translators:
+            _translators[model_path] = OpusMT(easynmt_path=model_path, **model_args)
+        return _translators[model_path]
+
 
 class EasyNMT(NMTModel):
     """
@@ -41,6 +61,7 @@ class EasyNMT(NMTModel):
             load_translator: bool = True,
             device=None,
             max_length: int = None,
+            translation_memory: TranslationMemory = None,
             **kwargs
     ):
         """
@@ -51,6 +72,7 @@ class EasyNMT(NMTModel):
         :param load_translator: If set to false, it will only load the config but not the translation engine
         :param device: CPU / GPU device for PyTorch
         :param max_length: Max number of token per sentence for translation. Longer text will be truncated
+        :param translation_memory: If set, already translated documents and sentences are not translated again
         :param kwargs: Further optional parameters for the different models
         """
         if not has_easynmt:
@@ -107,21 +129,58 @@ class EasyNMT(NMTModel):
                     except Exception:
                         pass
 
-            with open(os.path.join(model_path, 'easynmt.json')) as fIn:
-                self.config = json.load(fIn)
+            self.config = _load_config(model_path)
 
             if 'lang_pairs' in self.config:
                 self._lang_pairs = frozenset(self.config['lang_pairs'])
 
             if load_translator:
-                self.translator = OpusMT(easynmt_path=model_path, **self.config['model_args'])
-                self.translator.max_length = max_length
+                self.translator = _get_translator(model_path, self.config['model_args'])
+
+        self.max_length = max_length
+        self.translation_memory = translation_memory
+
+        self.pool = None
+        # arguments used to create the model inside worker processes of the multi-process pool
+        self._worker_kwargs = dict(model_name=self._model_name, cache_folder=self._cache_folder, max_length=max_length)
 
     async def _do_translate(self, text: str | list[str], target_language: str) -> str | list[str]:
+        if self.pool is not None:
+            return await self._translate_in_pool(text, target_language)
+        # run inference off the event loop, so streaming input can be consumed while a batch is translated
+        return await asyncio.to_thread(self._translate_grouped, text, target_language)
+
+    def _translate_grouped(self, text: str | list[str], target_language: str) -> str | list[str]:
         if isinstance(text, str):
             return self.do_translate(text, target_language, indentify_language(text))
-        else:
-            return [self.do_translate(t, target_language, indentify_language(t)) for t in text]
+
+        # group texts by source language, so each language is translated in a single (batched) call
+        texts_by_language: dict[str, list[int]] = {}
+        for idx, language in enumerate(identify_languages(text)):
+            texts_by_language.setdefault(language, []).append(idx)
+
+        translated = [None] * len(text)
+        for source_language, indices in texts_by_language.items():
+            group_translated = self.do_translate([text[i] for i in indices], target_language, source_language)
+            for idx, t in zip(indices, group_translated):
+                translated[idx] = t
+        return translated
+
+    async def _translate_in_pool(self, text: str | list[str], target_language: str) -> str | list[str]:
+        texts = [text] if isinstance(text, str) else text
+        texts_by_language: dict[str, list[int]] = {}
+        for idx, language in enumerate(await asyncio.to_thread(identify_languages, texts)):
+            texts_by_language.setdefault(language, []).append(idx)
+
+        results = await asyncio.gather(*[
+            self.pool.translate([texts[i] for i in indices], source_language, target_language)
+            for source_language, indices in texts_by_language.items()
+        ])
+        translated = [None] * len(texts)
+        for indices, group_translated in zip(texts_by_language.values(), results):
+            for idx, t in zip(indices, group_translated):
+                translated[idx] = t
+        return translated[0] if isinstance(text, str) else translated
 
     def do_translate(
             self,
@@ -166,23 +225,13 @@ class EasyNMT(NMTModel):
             is_single_doc = True
 
         if perform_sentence_splitting:
-            if sentence_splitter is None:
-                sentence_splitter = self.sentence_splitting
-
-            # Split document into sentences
-            start_time = time.time()
+            # Split documents into sentences, recording the character span of each sentence in its document
             splitted_sentences = []
-            sent2doc = []
+            doc_spans = []
             for doc in documents:
-                paragraphs = doc.split(paragraph_split) if paragraph_split is not None else [doc]
-                for para in paragraphs:
-                    for sent in sentence_splitter(para.strip(), source_lang):
-                        sent = sent.strip()
-                        if len(sent) > 0:
-                            splitted_sentences.append(sent)
-                sent2doc.append(len(splitted_sentences))
-            # logger.info("Sentence splitting done after: {:.2f} sec".format(time.time() - start_time))
-            # logger.info("Translate {} sentences".format(len(splitted_sentences)))
+                spans = self._sentence_spans(doc, source_lang, paragraph_split, sentence_splitter)
+                splitted_sentences.extend(doc[start:end] for start, end in spans)
+                doc_spans.append(spans)
 
             translated_sentences = self.translate_sentences(splitted_sentences, target_lang=target_lang,
                                                             source_lang=source_lang,
@@ -190,16 +239,12 @@ class EasyNMT(NMTModel):
                                                             batch_size=batch_size, **kwargs)
 
             # Merge sentences back to documents
-            start_time = time.time()
             translated_docs = []
-            for doc_idx in range(len(documents)):
-                start_idx = sent2doc[doc_idx - 1] if doc_idx > 0 else 0
-                end_idx = sent2doc[doc_idx]
-                translated_docs.append(
-                    self._reconstruct_document(documents[doc_idx], splitted_sentences[start_idx:end_idx],
-                                               translated_sentences[start_idx:end_idx]))
-
-            # logger.info("Document reconstruction done after: {:.2f} sec".format(time.time() - start_time))
+            start_idx = 0
+            for doc, spans in zip(documents, doc_spans):
+                end_idx = start_idx + len(spans)
+                translated_docs.append(self._reconstruct_document(doc, spans, translated_sentences[start_idx:end_idx]))
+                start_idx = end_idx
         else:
             translated_docs = self.translate_sentences(documents, target_lang=target_lang, source_lang=source_lang,
                                                        show_progress_bar=show_progress_bar, beam_size=beam_size,
@@ -211,23 +256,44 @@ class EasyNMT(NMTModel):
         return translated_docs
 
     @staticmethod
-    def _reconstruct_document(doc, org_sent, translated_sent):
+    def _sentence_spans(doc: str, lang: str, paragraph_split: str | None, sentence_splitter=None) -> List[tuple[int, int]]:
         """
-        This method reconstructs the translated document and
-        keeps white space in the beginning / at the end of sentences.
+        Returns the (start, end) character offsets of all non-empty sentences in the document.
+        No sentence crosses a paragraph_split symbol.
         """
-        sent_idx = 0
-        char_idx = 0
-        translated_doc = ""
-        while char_idx < len(doc):
-            if sent_idx < len(org_sent) and doc[char_idx] == org_sent[sent_idx][0]:
-                translated_doc += translated_sent[sent_idx]
-                char_idx += len(org_sent[sent_idx])
-                sent_idx += 1
+        spans = []
+        para_start = 0
+        paragraphs = doc.split(paragraph_split) if paragraph_split is not None else [doc]
+        for para in paragraphs:
+            stripped = para.strip()
+            offset = para_start + len(para) - len(para.lstrip())
+            if sentence_splitter is None:
+                para_spans = sentence_spans(stripped, lang)
             else:
-                translated_doc += doc[char_idx]
-                char_idx += 1
-        return translated_doc
+                para_spans = _locate_sentences(stripped, sentence_splitter(stripped, lang))
+            for start, end in para_spans:
+                sent = stripped[start:end]
+                start += len(sent) - len(sent.lstrip())
+                end -= len(sent) - len(sent.rstrip())
+                if end > start:
+                    spans.append((offset + start, offset + end))
+            para_start += len(para) + (len(paragraph_split) if paragraph_split is not None else 0)
+        return spans
+
+    @staticmethod
+    def _reconstruct_document(doc: str, spans: List[tuple[int, int]], translated_sent: List[str]) -> str:
+        """
+        This method reconstructs the translated document by replacing each sentence span with its translation,
+        keeping all text between sentences (white space, paragraph separators) as is.
+        """
+        parts = []
+        char_idx = 0
+        for (start, end), translated in zip(spans, translated_sent):
+            parts.append(doc[char_idx:start])
+            parts.append(translated)
+            char_idx = end
+        parts.append(doc[char_idx:])
+        return "".join(parts)
 
     def translate_sentences(
             self,
@@ -259,6 +325,33 @@ class EasyNMT(NMTModel):
             sentences = [sentences]
             is_single_sentence = True
 
+        if self.translation_memory is not None:
+            cached = self.translation_memory.get_many(sentences, source_lang, target_lang, self.model_id())
+            misses = list(dict.fromkeys(sen for sen, c in zip(sentences, cached) if c is None))
+            if misses:
+                translated = self._translate_sentences_batched(misses, target_lang, source_lang, show_progress_bar, beam_size, batch_size, **kwargs)
+                self.translation_memory.put_many(misses, translated, source_lang, target_lang, self.model_id())
+                translated = dict(zip(misses, translated))
+                cached = [c if c is not None else translated[sen] for sen, c in zip(sentences, cached)]
+            output = cached
+        else:
+            output = self._translate_sentences_batched(sentences, target_lang, source_lang, show_progress_bar, beam_size, batch_size, **kwargs)
+
+        if is_single_sentence:
+            output = output[0]
+
+        return output
+
+    def _translate_sentences_batched(
+            self,
+            sentences: List[str],
+            target_lang: str,
+            source_lang: str,
+            show_progress_bar: bool = False,
+            beam_size: int = 5,
+            batch_size: int = 32,
+            **kwargs
+    ) -> List[str]:
         output = []
 
         # Sort by length to speed up processing
@@ -273,23 +366,20 @@ class EasyNMT(NMTModel):
         for start_idx in iterator:
             output.extend(self.translator.translate_sentences(sentences_sorted[start_idx:start_idx + batch_size],
                                                               source_lang=source_lang, target_lang=target_lang,
-                                                              beam_size=beam_size, device=self.device, **kwargs))
+                                                              beam_size=beam_size, device=self.device,
+                                                              max_length=self.max_length, **kwargs))
 
         # Restore original sorting of sentences
-        output = [output[idx] for idx in np.argsort(length_sorted_idx)]
+        return [output[idx] for idx in np.argsort(length_sorted_idx)]
 
-        if is_single_sentence:
-            output = output[0]
-
-        return output
-
-    def start_multi_process_pool(self, target_devices: List[str] = None):
+    def start_multi_process_pool(self, target_devices: List[str] = None, chunk_size: int = 32) -> TranslationWorkerPool:
         """
-        Starts multi process to process the encoding with several, independent processes.
-        This method is recommended if you want to encode on multiple GPUs. It is advised
-        to start only one process per GPU. This method works together with encode_multi_process
+        Starts a pool of independent worker processes, each loading its own model from the cache folder.
+        This method is recommended if you want to translate on multiple GPUs. It is advised
+        to start only one process per GPU. While the pool is running, translate() is routed through it.
         :param target_devices: PyTorch target devices, e.g. cuda:0, cuda:1... If None, all available CUDA devices will be used
-        :return: Returns a dict with the target processes, an input queue and and output queue.
+        :param chunk_size: Max number of documents sent to a worker in a single job
+        :return: Returns the started pool
         """
         if target_devices is None:
             if torch.cuda.is_available():
@@ -298,115 +388,60 @@ class EasyNMT(NMTModel):
                 logger.info("CUDA is not available. Start 4 CPU worker")
                 target_devices = ['cpu'] * 4
 
-        logger.info("Start multi-process pool on devices: {}".format(', '.join(map(str, target_devices))))
-
-        ctx = mp.get_context('spawn')
-        input_queue = ctx.Queue()
-        output_queue = ctx.Queue()
-        processes = []
-
-        for cuda_id in target_devices:
-            p = ctx.Process(target=EasyNMT._encode_multi_process_worker,
-                            args=(cuda_id, self, input_queue, output_queue), daemon=True)
-            p.start()
-            processes.append(p)
-
-        return {'input': input_queue, 'output': output_queue, 'processes': processes}
+        self.pool = TranslationWorkerPool(
+            model_factory=functools.partial(type(self), **self._worker_kwargs),
+            target_devices=target_devices,
+            chunk_size=chunk_size
+        ).start()
+        return self.pool
 
     def translate_multi_process(
             self,
-            pool: Dict[str, object],
+            pool: TranslationWorkerPool,
             documents: List[str],
+            target_lang: str,
+            source_lang: str,
             show_progress_bar: bool = True,
-            chunk_size: int = None, **kwargs
+            chunk_size: int = None,
+            **kwargs
     ) -> List[str]:
         """
-        This method allows to run encode() on multiple GPUs. The sentences are chunked into smaller packages
-        and sent to individual processes, which encode these on the different GPUs. This method is only suitable
-        for encoding large sets of sentences
-        :param pool: A pool of workers started with SentenceTransformer.start_multi_process_pool
-        :param chunk_size: Sentences are chunked and sent to the individual processes. If none, it determine a sensible size.
+        This method allows to run do_translate() on multiple GPUs. The documents are chunked into smaller packages
+        and sent to individual processes, which translate these on the different GPUs. This method is only suitable
+        for translating large sets of documents
+        :param pool: A pool of workers started with start_multi_process_pool
+        :param chunk_size: Documents are chunked and sent to the individual processes. If none, it determine a sensible size.
         """
-
         if chunk_size is None:
-            chunk_size = min(math.ceil(len(documents) / len(pool["processes"]) / 10), 1000)
+            chunk_size = max(min(math.ceil(len(documents) / len(pool.target_devices) / 10), 1000), 1)
 
         logger.info("Chunk data into packages of size {}".format(chunk_size))
 
-        input_queue = pool['input']
-        last_chunk_id = 0
-
-        for start_idx in range(0, len(documents), chunk_size):
-            input_queue.put([last_chunk_id, documents[start_idx:start_idx + chunk_size], kwargs])
-            last_chunk_id += 1
-
-        output_queue = pool['output']
-        results_list = sorted([output_queue.get() for _ in
-                               tqdm.tqdm(range(last_chunk_id), total=last_chunk_id, unit_scale=chunk_size, smoothing=0,
-                                         disable=not show_progress_bar)], key=lambda chunk: chunk[0])
+        futures = [
+            pool.submit(documents[start_idx:start_idx + chunk_size], source_lang, target_lang, **kwargs)
+            for start_idx in range(0, len(documents), chunk_size)
+        ]
         translated = []
-        for chunk in results_list:
-            translated.extend(chunk[1])
+        for future in tqdm.tqdm(futures, total=len(futures), unit_scale=chunk_size, smoothing=0, disable=not show_progress_bar):
+            translated.extend(future.result())
         return translated
 
-    def translate_stream(self, stream: Iterable[str], show_progress_bar: bool = True, chunk_size: int = 128,
-                         **kwargs) -> List[str]:
-        batch = []
-        for doc in tqdm.tqdm(stream, smoothing=0.0, disable=not show_progress_bar):
-            batch.append(doc)
-
-            if len(batch) >= chunk_size:
-                translated = self._do_translate(batch, show_progress_bar=False, **kwargs)
-                for trans_doc in translated:
-                    yield trans_doc
-                batch = []
-
-        if len(batch) > 0:
-            translated = self._do_translate(batch, show_progress_bar=False, **kwargs)
-            for trans_doc in translated:
-                yield trans_doc
-
-    @staticmethod
-    def stop_multi_process_pool(pool):
+    def stop_multi_process_pool(self, pool: TranslationWorkerPool = None, timeout: float = 10.0):
         """
-        Stops all processes started with start_multi_process_pool
+        Stops all processes started with start_multi_process_pool, letting them finish their current job first
         """
-        for p in pool['processes']:
-            p.terminate()
-
-        for p in pool['processes']:
-            p.join()
-            p.close()
-
-        pool['input'].close()
-        pool['output'].close()
-
-    @staticmethod
-    def _encode_multi_process_worker(target_device: str, model, input_queue, results_queue):
-        """
-        Internal working process to encode sentences in multi-process setup
-        """
-        model.device = target_device
-        while True:
-            try:
-                id, documents, kwargs = input_queue.get()
-                translated = model.do_translate(documents, **kwargs)
-                results_queue.put([id, translated])
-            except queue.Empty:
-                break
+        pool = pool or self.pool
+        if pool is None:
+            return
+        pool.stop(timeout)
+        if pool is self.pool:
+            self.pool = None
 
     def sentence_splitting(self, text: str, lang: str = None):
-        if lang in ['ar', 'jp', 'ko', 'zh']:
-            sentences = list(re.findall(u'[^!?。\.]+[!?。\.]*', text, flags=re.U))
-        else:
-            try:
-                nltk.data.find('tokenizers/punkt')
-            except LookupError:
-                nltk.download('punkt')
-
-            sentences = nltk.sent_tokenize(text)
+        return [text[start:end] for start, end in sentence_spans(text, lang)]
 
-        return sentences
+    def model_id(self) -> str:
+        return f"easynmt/{self._model_name}/{type(self.translator).__name__}"
 
     @property
     def lang_pairs(self) -> FrozenSet[str]:
@@ -450,3 +485,57 @@ class EasyNMT(NMTModel):
 
         with open(filepath, 'w') as fOut:
             json.dump(config, fOut)
+
+
+PUNKT_LANGUAGES = {
+    'cs': 'czech', 'da': 'danish', 'de': 'german', 'el': 'greek', 'en': 'english', 'es': 'spanish',
+    'et': 'estonian', 'fi': 'finnish', 'fr': 'french', 'it': 'italian', 'nl': 'dutch', 'no': 'norwegian',
+    'pl': 'polish', 'pt': 'portuguese', 'ru': 'russian', 'sl': 'slovene', 'sv': 'swedish', 'tr': 'turkish'
+}
+
+_CJK_SENTENCE_PATTERN = re.compile(r'[^!?。\.]+[!?。\.]*', flags=re.U)
+
+
+def sentence_spans(text: str, lang: str = None) -> List[tuple[int, int]]:
+    """
+    Returns the (start, end) character offsets of the sentences in the text.
+    """
+    if lang in ['ar', 'jp', 'ko', 'zh']:
+        return [m.span() for m in _CJK_SENTENCE_PATTERN.finditer(text)]
+    return list(_get_punkt_tokenizer(PUNKT_LANGUAGES.get(lang, 'english')).span_tokenize(text))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_punkt_tokenizer(language: str):
+    try:
+        # nltk >= 3.8.2 ships punkt as (non-pickled) parameter tables
+        from nltk.tokenize import PunktTokenizer
+        try:
+            nltk.data.find('tokenizers/punkt_tab')
+        except LookupError:
+            nltk.download('punkt_tab')
+        return PunktTokenizer(language)
+    except ImportError:
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            nltk.download('punkt')
+        return nltk.data.load(f'tokenizers/punkt/{language}.pickle')
+
+
+def _locate_sentences(text: str, sentences: List[str]) -> List[tuple[int, int]]:
+    """
+    Maps sentences returned by a custom sentence splitter back to their offsets in the text.
+    """
+    spans = []
+    char_idx = 0
+    for sent in sentences:
+        sent = sent.strip()
+        if not sent:
+            continue
+        start = text.find(sent, char_idx)
+        if start < 0:
+            continue
+        spans.append((start, start + len(sent)))
+        char_idx = start + len(sent)
+    return spans
@@ -1,5 +1,6 @@
 import logging
-import time
+import threading
+from collections import OrderedDict
 from typing import List
 
 try:
@@ -13,41 +14,91 @@ logger = logging.getLogger(__name__)
 
 
 class OpusMT:
-    def __init__(self, easynmt_path: str = None, max_loaded_models: int = 10):
+    def __init__(
+            self,
+            easynmt_path: str = None,
+            max_loaded_models: int = 10,
+            max_memory_mb: int | None = None,
+            torch_compile: bool = False
+    ):
+        """
+        :param easynmt_path: Path of the EasyNMT model folder
+        :param max_loaded_models: Max number of language pair models kept in memory
+        :param max_memory_mb: Max total parameter memory of the loaded models, least recently used models are evicted first
+        :param torch_compile: Compile the forward pass of loaded models with torch.compile
+        """
         if not has_transformers:
             raise ImportError('transformers is not installed')
-        self.models = {}
+        self.models: OrderedDict[str, dict] = OrderedDict()
+        self.tokenizers: dict[str, MarianTokenizer] = {}
         self.max_loaded_models = max_loaded_models
+        self.max_memory_mb = max_memory_mb
+        self.torch_compile = torch_compile
         self.max_length = None
+        # guards loading and evicting models, translator instances are shared between threads
+        self._lock = threading.Lock()
 
-    def load_model(self, model_name):
+    def load_tokenizer(self, model_name: str):
+        # tokenizers are small, so they are kept even if their model gets evicted
+        with self._lock:
+            if model_name not in self.tokenizers:
+                self.tokenizers[model_name] = MarianTokenizer.from_pretrained(model_name)
+            return self.tokenizers[model_name]
+
+    def load_model(self, model_name: str, device: str = "cpu"):
+        with self._lock:
+            return self._load_model(model_name, device)
+
+    def _load_model(self, model_name: str, device: str):
         if model_name in self.models:
-            self.models[model_name]['last_loaded'] = time.time()
-            return self.models[model_name]['tokenizer'], self.models[model_name]['model']
+            self.models.move_to_end(model_name)
+            entry = self.models[model_name]
+            if entry['device'] != device:
+                entry['model'].to(device)
+                entry['device'] = device
+            return entry['model']
         else:
             logger.info("Load model: "+model_name)
-            tokenizer = MarianTokenizer.from_pretrained(model_name)
             model = MarianMTModel.from_pretrained(model_name)
             model.eval()
+            model.to(device)
+            memory_mb = sum(p.numel() * p.element_size() for p in model.parameters()) / (1024 * 1024)
+            if self.torch_compile:
+                model.forward = torch.compile(model.forward, dynamic=True)
 
-            if len(self.models) >= self.max_loaded_models:
-                oldest_time = time.time()
-                oldest_model = None
-                for loaded_model_name in self.models:
-                    if self.models[loaded_model_name]['last_loaded'] <= oldest_time:
-                        oldest_model = loaded_model_name
-                        oldest_time = self.models[loaded_model_name]['last_loaded']
-                del self.models[oldest_model]
+            self.models[model_name] = {'model': model, 'device': device, 'memory_mb': memory_mb}
+            self._evict()
+            return model
 
-            self.models[model_name] = {'tokenizer': tokenizer, 'model': model, 'last_loaded': time.time()}
-            return tokenizer, model
+    def _evict(self):
+        """Evicts least recently used models until both the model count and the memory budget are met."""
+        def over_budget():
+            if len(self.models) > self.max_loaded_models:
+                return True
+            if self.max_memory_mb is not None:
+                return sum(e['memory_mb'] for e in self.models.values()) > self.max_memory_mb
+            return False
 
-    def translate_sentences(self, sentences: List[str], source_lang: str, target_lang: str, device: str, beam_size: int = 5, **kwargs):
+        # always keep the most recently used model, even if it alone exceeds the budget
+        while len(self.models) > 1 and over_budget():
+            evicted, _ = self.models.popitem(last=False)
+            logger.info("Evict model: " + evicted)
+
+    def translate_sentences(
+            self,
+            sentences: List[str],
+            source_lang: str,
+            target_lang: str,
+            device: str,
+            beam_size: int = 5,
+            max_length: int = None,
+            **kwargs
+    ):
         model_name = 'Helsinki-NLP/opus-mt-{}-{}'.format(source_lang, target_lang)
-        tokenizer, model = self.load_model(model_name)
-        model.to(device)
+        tokenizer = self.load_tokenizer(model_name)
+        model = self.load_model(model_name, device)
 
-        inputs = tokenizer(sentences, truncation=True, padding=True, max_length=self.max_length, return_tensors="pt")
+        inputs = tokenizer(sentences, truncation=True, padding=True, max_length=max_length or self.max_length, return_tensors="pt")
 
         for key in inputs:
             inputs[key] = inputs[key].to(device)
@@ -59,5 +110,8 @@ class OpusMT:
         return output
 
     def save(self, output_path):
-        return {"max_loaded_models": self.max_loaded_models}
-
+        return {
+            "max_loaded_models": self.max_loaded_models,
+            "max_memory_mb": self.max_memory_mb,
+            "torch_compile": self.torch_compile
+        }
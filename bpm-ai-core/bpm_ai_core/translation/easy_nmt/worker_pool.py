@@ -0,0 +1,248 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+_STOP = None
+"""Sentinel telling a worker (or the result reader) to exit."""
+
+
+def _worker_loop(worker_idx: int, device: str, model_factory: Callable, input_queue, output_queue, current_job):
+    """
+    Worker process: loads its own model (from the shared cache folder) and translates jobs until it receives the stop sentinel.
+    The id of the job being translated is kept in the shared value current_job, so it is known even if the worker dies.
+    """
+    try:
+        model = model_factory(device=device)
+    except Exception as e:
+        output_queue.put(("failed", worker_idx, f"{type(e).__name__}: {e}"))
+        return
+    output_queue.put(("ready", worker_idx, os.getpid()))
+    while True:
+        job = input_queue.get()
+        if job is _STOP:
+            break
+        job_id, documents, source_lang, target_lang, kwargs = job
+        current_job.value = job_id
+        try:
+            translated = model.do_translate(documents, target_lang=target_lang, source_lang=source_lang, **kwargs)
+            output_queue.put(("result", job_id, translated))
+        except Exception as e:
+            output_queue.put(("error", job_id, f"{type(e).__name__}: {e}"))
+    output_queue.put(("stopped", worker_idx, os.getpid()))
+
+
+class TranslationWorkerPool:
+    """
+    Pool of translation worker processes, each holding its own EasyNMT model.
+
+    Jobs carry their source and target language and are pulled by idle workers from a shared queue,
+    results are delivered as asyncio-awaitable futures.
+    """
+
+    def __init__(self, model_factory: Callable, target_devices: List[str], chunk_size: int = 32):
+        """
+        :param model_factory: Picklable callable creating the model in a worker, called with the keyword argument ``device``
+        :param target_devices: One worker is started per device, e.g. ['cpu'] * 4 or ['cuda:0', 'cuda:1']
+        :param chunk_size: Max number of documents per job when translating through the pool
+        """
+        self.model_factory = model_factory
+        self.target_devices = target_devices
+        self.chunk_size = chunk_size
+        self._ctx = multiprocessing.get_context('spawn')
+        self._input_queue = None
+        self._output_queue = None
+        self._processes = []
+        self._ready = {}
+        self._failed = {}
+        self._pending: dict[int, Future] = {}
+        self._current_jobs = []
+        self._dead = set()
+        self._stopping = False
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._reader = None
+
+    def start(self) -> "TranslationWorkerPool":
+        self._stopping = False
+        logger.info("Start translation worker pool on devices: {}".format(', '.join(map(str, self.target_devices))))
+        self._input_queue = self._ctx.Queue()
+        self._output_queue = self._ctx.Queue()
+        for worker_idx, device in enumerate(self.target_devices):
+            current_job = self._ctx.Value('q', -1, lock=False)
+            p = self._ctx.Process(
+                target=_worker_loop,
+                args=(worker_idx, device, self.model_factory, self._input_queue, self._output_queue, current_job),
+                daemon=True
+            )
+            p.start()
+            self._processes.append(p)
+            self._current_jobs.append(current_job)
+        self._reader = threading.Thread(target=self._read_results, daemon=True)
+        self._reader.start()
+        return self
+
+    def _read_results(self):
+        while True:
+            if not self._check_workers():
+                break
+            try:
+                message = self._output_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if not self._handle_message(message):
+                break
+
+    def _handle_message(self, message) -> bool:
+        """
+        Handles a message from the workers, returns False on the stop sentinel.
+        """
+        if message is _STOP:
+            return False
+        kind, key, payload = message
+        if kind == "ready":
+            self._ready[key] = payload
+        elif kind == "failed":
+            logger.error(f"Translation worker {key} failed to start: {payload}")
+            self._failed[key] = payload
+        elif kind == "stopped":
+            self._ready.pop(key, None)
+        else:
+            with self._lock:
+                future = self._pending.pop(key, None)
+            if future is not None and not future.done():
+                if kind == "result":
+                    future.set_result(payload)
+                else:
+                    future.set_exception(RuntimeError(f"Translation job failed: {payload}"))
+        return True
+
+    def _check_workers(self) -> bool:
+        """
+        Fails the job of workers that died without reporting back (e.g. killed by the OOM killer),
+        and all pending jobs once no worker is left to pick them up. Returns False on the stop sentinel.
+        """
+        if self._stopping:
+            return True
+        died = [
+            worker_idx for worker_idx, p in enumerate(self._processes)
+            if worker_idx not in self._dead and not p.is_alive()
+        ]
+        if not died:
+            return True
+        # everything a dead worker managed to send is in the queue by now, handle it before failing its job
+        running = True
+        while running:
+            try:
+                running = self._handle_message(self._output_queue.get_nowait())
+            except queue.Empty:
+                break
+        for worker_idx in died:
+            p = self._processes[worker_idx]
+            self._dead.add(worker_idx)
+            self._ready.pop(worker_idx, None)
+            if worker_idx not in self._failed:
+                logger.error(f"Translation worker {worker_idx} died with exit code {p.exitcode}")
+            with self._lock:
+                if len(self._dead) == len(self._processes):
+                    job_ids = list(self._pending)
+                else:
+                    job_ids = [self._current_jobs[worker_idx].value]
+                futures = [self._pending.pop(job_id) for job_id in job_ids if job_id in self._pending]
+            for future in futures:
+                if not future.done():
+                    future.set_exception(RuntimeError(f"Translation worker {worker_idx} died (exit code {p.exitcode})"))
+        return running
+
+    def submit(self, documents: List[str], source_lang: str, target_lang: str, **kwargs) -> Future:
+        """
+        Submits a translation job and returns a concurrent.futures.Future of the translated documents.
+        """
+        if self._input_queue is None:
+            raise RuntimeError("Translation worker pool is not started")
+        if len(self._dead) == len(self._processes):
+            raise RuntimeError("All translation workers died")
+        future = Future()
+        with self._lock:
+            job_id = next(self._job_ids)
+            self._pending[job_id] = future
+        self._input_queue.put((job_id, documents, source_lang, target_lang, kwargs))
+        return future
+
+    async def translate(self, documents: List[str], source_lang: str, target_lang: str, **kwargs) -> List[str]:
+        """
+        Translates documents of a single language pair, spread over the workers in chunks of ``chunk_size``.
+        """
+        chunks = [documents[i:i + self.chunk_size] for i in range(0, len(documents), self.chunk_size)]
+        results = await asyncio.gather(*[
+            asyncio.wrap_future(self.submit(chunk, source_lang, target_lang, **kwargs)) for chunk in chunks
+        ])
+        return [doc for chunk in results for doc in chunk]
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until all workers have loaded their models. Returns False on timeout or if a worker failed to start.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(self._ready) + len(self._failed) < len(self._processes):
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            if not any(p.is_alive() for p in self._processes):
+                break
+            time.sleep(0.1)
+        return not self._failed and len(self._ready) == len(self._processes)
+
+    def health(self) -> dict:
+        return {
+            "workers": [
+                {
+                    "device": device,
+                    "pid": p.pid,
+                    "alive": p.is_alive(),
+                    "ready": worker_idx in self._ready,
+                    "error": self._failed.get(worker_idx)
+                }
+                for worker_idx, (device, p) in enumerate(zip(self.target_devices, self._processes))
+            ],
+            "pending_jobs": len(self._pending)
+        }
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stops all workers, letting them finish their current job first. Pending jobs are cancelled.
+        """
+        if self._input_queue is None:
+            return
+        self._stopping = True
+        for _ in self._processes:
+            self._input_queue.put(_STOP)
+        for p in self._processes:
+            p.join(timeout)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        self._output_queue.put(_STOP)
+        self._reader.join(timeout)
+        for p in self._processes:
+            p.close()
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+        self._input_queue.close()
+        self._output_queue.close()
+        self._input_queue = None
+        self._output_queue = None
+        self._processes = []
+        self._current_jobs = []
+        self._ready.clear()
+        self._failed.clear()
+        self._dead.clear()
@@ -1,6 +1,10 @@
+import asyncio
+import re
 from abc import ABC, abstractmethod
+from typing import AsyncIterable, AsyncIterator, Iterable, Callable
 
 from bpm_ai_core.tracing.decorators import span
+from bpm_ai_core.translation.translation_memory import TranslationMemory, translate_with_memory
 
 
 class NMTModel(ABC):
@@ -8,10 +12,126 @@ class NMTModel(ABC):
     Neural Machine Translation Model
     """
 
+    translation_memory: TranslationMemory | None = None
+    """If set, previously translated texts are served from this memory and only cache misses are translated."""
+
     @abstractmethod
     async def _do_translate(self, text: str | list[str], target_language: str) -> str | list[str]:
         pass
 
+    def model_id(self) -> str:
+        """Identifies the model in translation memory keys."""
+        return type(self).__name__
+
     @span(name="nmt")
     async def translate(self, text: str | list[str], target_language: str) -> str | list[str]:
-        return await self._do_translate(text, target_language)
+        if self.translation_memory is None:
+            return await self._do_translate(text, target_language)
+
+        async def translate_misses(texts: list[str]) -> list[str]:
+            return await self._do_translate(texts, target_language)
+
+        translated = await translate_with_memory(
+            self.translation_memory,
+            [text] if isinstance(text, str) else text,
+            source_language=None,
+            target_language=target_language,
+            model=self.model_id(),
+            translate=translate_misses
+        )
+        return translated[0] if isinstance(text, str) else translated
+
+    async def translate_stream(
+            self,
+            texts: AsyncIterable[str] | Iterable[str],
+            target_language: str,
+            chunk_size: int = 32
+    ) -> AsyncIterator[str]:
+        """
+        Translates a stream of texts in batches of ``chunk_size``, yielding the translations in input order.
+
+        The next batch is consumed from the input while the previous one is being translated,
+        and at most one batch is in flight, so memory stays constant for arbitrarily long streams.
+        """
+        pending: asyncio.Task | None = None
+        batch = []
+        try:
+            async for text in _aiter(texts):
+                batch.append(text)
+                if len(batch) >= chunk_size:
+                    if pending is not None:
+                        for translated in await pending:
+                            yield translated
+                    pending = asyncio.create_task(self.translate(batch, target_language))
+                    batch = []
+            if pending is not None:
+                for translated in await pending:
+                    yield translated
+                pending = None
+            if batch:
+                for translated in await self.translate(batch, target_language):
+                    yield translated
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+
+async def _aiter(texts: AsyncIterable[str] | Iterable[str]) -> AsyncIterator[str]:
+    if hasattr(texts, '__aiter__'):
+        async for text in texts:
+            yield text
+    else:
+        for text in texts:
+            yield text
+
+
+_SPLIT_PATTERNS = [r"\n\s*\n", r"\n", r"(?<=[.!?。！？])\s+", r"\s+"]
+"""Boundaries to split texts at, in order of preference: paragraphs, lines, sentences, words."""
+
+
+def split_text(text: str, max_size: int, size: Callable[[str], int] = len) -> list[str]:
+    """
+    Splits a text that exceeds a request size limit into consecutive parts of at most max_size (as measured by size),
+    preferably at paragraph, then line, sentence and word boundaries. The parts join back to the original text.
+    """
+    return _split_text(text, max_size, size, 0)
+
+
+def _split_text(text: str, max_size: int, size: Callable[[str], int], level: int) -> list[str]:
+    if size(text) <= max_size:
+        return [text]
+    if level == len(_SPLIT_PATTERNS):
+        # no boundary left, cut within the word
+        parts, current = [], ""
+        for char in text:
+            if current and size(current + char) > max_size:
+                parts.append(current)
+                current = ""
+            current += char
+        return parts + [current]
+    pieces = re.split(f"({_SPLIT_PATTERNS[level]})", text)
+    # every separator stays attached to the text before it
+    units = [pieces[i] + (pieces[i + 1] if i + 1 < len(pieces) else "") for i in range(0, len(pieces), 2)]
+    parts, current = [], ""
+    for unit in units:
+        if current and size(current + unit) > max_size:
+            parts.append(current)
+            current = ""
+        current += unit
+    parts.append(current)
+    return [p for part in parts for p in _split_text(part, max_size, size, level + 1)]
+
+
+def join_translated_parts(parts: list[str], translated_parts: list[str]) -> str:
+    """
+    Joins the translations of the (stripped) parts of split_text, restoring the whitespace around each part.
+    """
+    joined = []
+    for part, translated in zip(parts, translated_parts):
+        stripped = part.strip()
+        if not stripped:
+            joined.append(part)
+            continue
+        start = part.index(stripped)
+        joined.append(part[:start] + translated.strip() + part[start + len(stripped):])
+    return "".join(joined)
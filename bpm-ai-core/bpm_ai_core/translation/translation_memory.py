@@ -0,0 +1,120 @@
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+AUTO_LANGUAGE = "auto"
+"""Source language key used if the source language is not known (e.g. detected by a remote API)."""
+
+
+class TranslationMemory:
+    """
+    Cache of previously translated texts, keyed by source text, source language, target language and model.
+
+    Entries are kept in an in-memory LRU and, if a path is given, persisted in a SQLite database
+    so they survive restarts and can be shared between worker processes on the same host.
+    """
+
+    def __init__(self, max_entries: int = 100_000, path: str | None = None):
+        """
+        :param max_entries: Max number of entries kept in memory
+        :param path: Path of the SQLite database for persistence, in-memory only if None
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "model TEXT, source_language TEXT, target_language TEXT, source_text TEXT, translation TEXT, "
+                "PRIMARY KEY (model, source_language, target_language, source_text))"
+            )
+            self._db.commit()
+
+    def get_many(self, texts: list[str], source_language: str | None, target_language: str, model: str) -> list[str | None]:
+        """
+        Returns the cached translation for each text, or None for cache misses.
+        """
+        source_language = source_language or AUTO_LANGUAGE
+        results = []
+        with self._lock:
+            for text in texts:
+                key = (model, source_language, target_language, text)
+                translation = self._entries.get(key)
+                if translation is not None:
+                    self._entries.move_to_end(key)
+                elif self._db is not None:
+                    row = self._db.execute(
+                        "SELECT translation FROM translations "
+                        "WHERE model = ? AND source_language = ? AND target_language = ? AND source_text = ?",
+                        key
+                    ).fetchone()
+                    if row is not None:
+                        translation = row[0]
+                        self._remember(key, translation)
+                results.append(translation)
+        return results
+
+    def put_many(self, texts: list[str], translations: list[str], source_language: str | None, target_language: str, model: str):
+        source_language = source_language or AUTO_LANGUAGE
+        keys = [(model, source_language, target_language, text) for text in texts]
+        with self._lock:
+            for key, translation in zip(keys, translations):
+                self._remember(key, translation)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                    [(*key, translation) for key, translation in zip(keys, translations)]
+                )
+                self._db.commit()
+
+    def get(self, text: str, source_language: str | None, target_language: str, model: str) -> str | None:
+        return self.get_many([text], source_language, target_language, model)[0]
+
+    def put(self, text: str, translation: str, source_language: str | None, target_language: str, model: str):
+        self.put_many([text], [translation], source_language, target_language, model)
+
+    def _remember(self, key: tuple, translation: str):
+        self._entries[key] = translation
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+async def translate_with_memory(
+        memory: TranslationMemory | None,
+        texts: list[str],
+        source_language: str | None,
+        target_language: str,
+        model: str,
+        translate
+) -> list[str]:
+    """
+    Translates texts using the given memory, only cache misses are passed to the async `translate(texts)` function.
+    Identical texts are only translated once.
+    """
+    if memory is None:
+        return await translate(texts)
+    results = memory.get_many(texts, source_language, target_language, model)
+    misses = list(dict.fromkeys(t for t, r in zip(texts, results) if r is None))
+    if misses:
+        logger.debug(f"translation memory: {len(texts) - len(misses)} hits, {len(misses)} misses")
+        translated = dict(zip(misses, await translate(misses)))
+        memory.put_many(misses, [translated[t] for t in misses], source_language, target_language, model)
+        results = [r if r is not None else translated[t] for t, r in zip(texts, results)]
+    return results
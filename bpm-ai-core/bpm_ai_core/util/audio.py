@@ -1,7 +1,12 @@
+import asyncio
 import io
-import os
+import tempfile
+import wave
+from typing import NamedTuple, TYPE_CHECKING, BinaryIO
 
-import requests
+if TYPE_CHECKING:
+    import numpy as np
+    from bpm_ai_core.llm.common.blob import Blob
 
 
 audio_ext_map = {
@@ -17,28 +22,131 @@ audio_ext_map = {
 }
 
 
-def load_audio(path: str) -> io.BytesIO:
+class AudioFile(tempfile.SpooledTemporaryFile):
     """
-    Load an audio file from a local path or a web URL into a BytesIO object.
+    Temporary audio file kept in memory up to max_size bytes and moved to disk beyond that.
+    Has a name with the file extension, as ASR APIs derive the audio format from it.
+    """
+
+    def __init__(self, name: str, max_size: int):
+        super().__init__(max_size=max_size)
+        self._audio_name = name
+
+    @property
+    def name(self):
+        return self._audio_name
+
+    def on_disk_after(self, size: int) -> bool:
+        """Whether the file is (or will be) on disk after writing size more bytes."""
+        return self._rolled or self.tell() + size > self._max_size
+
+
+async def load_audio_blob(blob: "Blob", max_memory_bytes: int = 16 * 1024 * 1024) -> AudioFile:
+    """
+    Streams the audio of a Blob (local file, URL, S3 or Azure Blob Storage) into a spooled temporary file,
+    without blocking the event loop or holding large recordings in memory.
+    """
+    extension = None
+    if blob.path and str(blob.path).rsplit('.', 1)[-1].lower() in audio_ext_map:
+        extension = str(blob.path).rsplit('.', 1)[-1].lower()
+    elif blob.mimetype:
+        extension = next((ext for ext, mimetype in audio_ext_map.items() if mimetype == blob.mimetype), None)
+    audio = AudioFile(f"audio.{extension}" if extension else "audio", max_size=max_memory_bytes)
+    try:
+        async for chunk in blob.stream():
+            if audio.on_disk_after(len(chunk)):
+                # rolling over to and writing to disk can block
+                await asyncio.to_thread(audio.write, chunk)
+            else:
+                audio.write(chunk)
+    except BaseException:
+        audio.close()
+        raise
+    audio.seek(0)
+    return audio
+
+
+SAMPLING_RATE = 16_000
+"""Sampling rate expected by Whisper models."""
+
+
+class AudioChunk(NamedTuple):
+    start: int
+    """First sample of the chunk."""
+    end: int
+    """End sample of the chunk (exclusive)."""
 
-    Parameters:
-    - path (str): A file system path or a URL of an audio file.
 
-    Returns:
-    - BytesIO: A BytesIO object containing the audio data.
+def decode_audio(audio: BinaryIO | str, sampling_rate: int = SAMPLING_RATE) -> "np.ndarray":
     """
-    if path.startswith('http://') or path.startswith('https://'):
-        # Handle web URL
-        response = requests.get(path)
-        audio = io.BytesIO(response.content)
-        if path.endswith(tuple(audio_ext_map.keys())):
-            audio.name = f"audio.{path.rsplit('.', 1)[-1]}"
-    elif os.path.isfile(path):
-        # Handle local file path
-        with open(path, 'rb') as f:
-            audio = io.BytesIO(f.read())
-            audio.name = f.name
-    else:
-        raise ValueError("The path provided is neither a valid URL nor a file path.")
+    Decodes an audio file into mono float32 samples in [-1, 1] at the given sampling rate.
+    Requires the ``av`` (PyAV) package.
+    """
+    import av
+    import numpy as np
+
+    if not isinstance(audio, str):
+        audio.seek(0)
+    resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=sampling_rate)
+    frames = []
+    with av.open(audio, mode="r", metadata_errors="ignore") as container:
+        for frame in container.decode(audio=0):
+            frames.extend(f.to_ndarray() for f in resampler.resample(frame))
+        frames.extend(f.to_ndarray() for f in resampler.resample(None))
+    if not isinstance(audio, str):
+        audio.seek(0)
+    if not frames:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(frames, axis=1).ravel().astype(np.float32) / 32768.0
+
+
+def encode_wav(samples: "np.ndarray", sampling_rate: int = SAMPLING_RATE) -> io.BytesIO:
+    """
+    Encodes float32 samples as 16 bit mono PCM WAV file.
+    """
+    import numpy as np
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sampling_rate)
+        wav.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+    buffer.seek(0)
+    buffer.name = "audio.wav"
+    return buffer
+
+
+def split_on_silence(
+        samples: "np.ndarray",
+        sampling_rate: int = SAMPLING_RATE,
+        max_chunk_seconds: float = 30.0,
+        overlap_seconds: float = 1.0,
+        search_seconds: float = 5.0,
+        frame_seconds: float = 0.03
+) -> list[AudioChunk]:
+    """
+    Splits audio into chunks of at most max_chunk_seconds (plus overlap).
+    Each split is placed at the quietest frame within the last search_seconds before the max chunk length,
+    so words are rarely cut, and consecutive chunks overlap by overlap_seconds.
+    """
+    import numpy as np
+
+    max_chunk = int(max_chunk_seconds * sampling_rate)
+    overlap = int(overlap_seconds * sampling_rate)
+    search = min(int(search_seconds * sampling_rate), max_chunk // 2)
+    frame = max(int(frame_seconds * sampling_rate), 1)
 
-    return audio
\ No newline at end of file
+    chunks = []
+    start = 0
+    while len(samples) - start > max_chunk:
+        # RMS energy of the frames in the search window [start + max_chunk - search, start + max_chunk)
+        window_start = start + max_chunk - search
+        n_frames = search // frame
+        window = samples[window_start:window_start + n_frames * frame].reshape(n_frames, frame)
+        energy = np.sqrt(np.mean(window.astype(np.float32) ** 2, axis=1))
+        split = window_start + int(np.argmin(energy)) * frame + frame // 2
+        chunks.append(AudioChunk(start, min(split + overlap // 2, len(samples))))
+        start = max(split - overlap // 2, start + 1)
+    chunks.append(AudioChunk(start, len(samples)))
+    return chunks
@@ -1,12 +1,16 @@
+import asyncio
 import base64
 import io
 import logging
+import sys
 import tempfile
+import weakref
 from io import BytesIO
-from typing import Union, Tuple
+from typing import Union, Tuple, TYPE_CHECKING, NamedTuple, Literal
 
-from PIL import Image, ImageDraw
-from pdf2image import convert_from_path, convert_from_bytes
+if TYPE_CHECKING:
+    # Pillow and pdf2image are imported on first use to keep the import of this module cheap
+    from PIL import Image
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +39,15 @@ pdf_ext_map = {
 }
 
 
-async def blob_as_images(blob, accept_formats: list[str], return_bytes: bool = False) -> Union[list[Image.Image], list[bytes]]:
+def is_pil_image(value) -> bool:
+    """
+    Checks whether value is a Pillow image without importing Pillow, if it is not loaded there can be no image.
+    """
+    pil_image = sys.modules.get("PIL.Image")
+    return pil_image is not None and isinstance(value, pil_image.Image)
+
+
+async def blob_as_images(blob, accept_formats: list[str], return_bytes: bool = False) -> Union[list["Image.Image"], list[bytes]]:
     """
     Load an image, PDF, or other file in a Blob into a Pillow Image object or raw bytes of accepted format.
 
@@ -47,6 +59,8 @@ async def blob_as_images(blob, accept_formats: list[str], return_bytes: bool = F
     Returns:
         A list of PIL Image objects or a list of bytes representing the converted images.
     """
+    from PIL import Image
+
     if blob.is_pdf():
         # Convert PDF to a list of images
         logger.info("Converting PDF to a list of images...")
@@ -93,16 +107,49 @@ async def blob_as_images(blob, accept_formats: list[str], return_bytes: bool = F
     return converted_images
 
 
-def pdf_to_images(pdf: bytes | str) -> list[Image]:
+def pdf_to_images(pdf: bytes | str, first_page: int = None, last_page: int = None) -> list["Image.Image"]:
+    """
+    Rasterizes the pages of a PDF, optionally only the (1-based, inclusive) range first_page to last_page.
+    """
+    from pdf2image import convert_from_path, convert_from_bytes
+
     with tempfile.TemporaryDirectory() as path:
         if isinstance(pdf, bytes):
             func = convert_from_bytes
         else:
             func = convert_from_path
-        return func(pdf, output_folder=path, dpi=100, use_pdftocairo=True)
+        return func(pdf, output_folder=path, dpi=100, use_pdftocairo=True, first_page=first_page, last_page=last_page)
+
+
+def pdf_page_count(pdf: bytes | str) -> int:
+    from pdf2image import pdfinfo_from_bytes, pdfinfo_from_path
+
+    info = pdfinfo_from_bytes(pdf) if isinstance(pdf, bytes) else pdfinfo_from_path(pdf)
+    return int(info["Pages"])
+
+
+_encoded_images: dict[tuple[int, object], object] = {}
+
 
+def _cached_per_image(image, key, compute):
+    """
+    Memoizes compute() for the lifetime of the image (or image Blob) object, e.g. across retries and turns of a conversation.
+    Images must therefore not be modified in place after they were encoded.
+    """
+    result = _encoded_images.get((id(image), key))
+    if result is None:
+        result = compute()
+        _remember_for_image(image, key, result)
+    return result
+
+
+def _remember_for_image(image, key, result):
+    cache_key = (id(image), key)
+    _encoded_images[cache_key] = result
+    weakref.finalize(image, _encoded_images.pop, cache_key, None)
 
-def base64_encode_image(image: Image):
+
+def base64_encode_image(image: "Image.Image"):
     """
     Get a base64 encoded string from a Pillow Image object.
 
@@ -112,13 +159,124 @@ def base64_encode_image(image: Image):
     Returns:
     - str: Base64 encoded string of the image.
     """
+    def encode():
+        buffered = BytesIO()
+        image.save(buffered, format=image.format or "JPEG")  # Assuming JPEG if format is not provided
+        return base64.b64encode(buffered.getvalue()).decode('utf-8')
+    return _cached_per_image(image, "original", encode)
+
+
+class ImageOptions(NamedTuple):
+    """How images are downscaled and re-encoded before they are sent to a model."""
+
+    max_long_side: int | None = None
+    """Max length of the longer image side in pixels."""
+
+    max_short_side: int | None = None
+    """Max length of the shorter image side in pixels."""
+
+    max_pixels: int | None = None
+    """Max number of pixels (width * height)."""
+
+    format: Literal["JPEG", "WEBP", "PNG"] = "JPEG"
+
+    quality: int = 85
+    """Encoder quality for lossy formats, 0 to 100."""
+
+
+def prepare_image(image: "Image.Image", options: ImageOptions) -> tuple[bytes, str]:
+    """
+    Downscales the image to fit the size limits of the options and re-encodes it in the configured format.
+    The result is cached for as long as the image object is alive.
+
+    Returns:
+        The encoded image and its mimetype.
+    """
+    return _cached_per_image(image, options, lambda: _prepare_image(image, options))
+
+
+def base64_encode_prepared_image(image: "Image.Image", options: ImageOptions) -> tuple[str, str]:
+    """
+    Like prepare_image, but returns the base64 encoded image, which is cached instead of the raw bytes.
+    """
+    return _cached_per_image(image, ("base64", options), lambda: _base64_prepare_image(image, options))
+
+
+async def base64_encode_prepared_blob(blob, options: ImageOptions) -> list[tuple[str, str]]:
+    """
+    Base64 encodes the image (or the pages of the PDF) in a Blob for a model.
+    JPEG and PNG images within the size limits of the options are passed through without decoding and re-encoding them,
+    others are prepared like in prepare_image. The result is cached for as long as the blob object is alive.
+
+    Returns:
+        A list of base64 encoded images and their mimetypes, one per image or PDF page.
+    """
+    key = ("base64", options)
+    result = _encoded_images.get((id(blob), key))
+    if result is None:
+        if blob.is_image():
+            data = await blob.as_bytes()
+            result = [await asyncio.to_thread(_encode_image_bytes, data, options)]
+        elif blob.is_pdf():
+            pages = await asyncio.to_thread(pdf_to_images, await blob.as_bytes())
+            result = [await asyncio.to_thread(_base64_prepare_image, page, options) for page in pages]
+        else:
+            raise ValueError(f"Unsupported blob type for images: {blob.mimetype}")
+        _remember_for_image(blob, key, result)
+    return result
+
+
+def _encode_image_bytes(data: bytes, options: ImageOptions) -> tuple[str, str]:
+    from PIL import Image
+
+    # only reads the header, pixel data is decoded on first access
+    image = Image.open(BytesIO(data))
+    if image.format in ("JPEG", "PNG") and _image_scale(image.width, image.height, options) >= 1:
+        return base64.b64encode(data).decode('utf-8'), Image.MIME[image.format]
+    return _base64_prepare_image(image, options)
+
+
+def _base64_prepare_image(image: "Image.Image", options: ImageOptions) -> tuple[str, str]:
+    data, mimetype = _prepare_image(image, options)
+    return base64.b64encode(data).decode('utf-8'), mimetype
+
+
+def _image_scale(width: int, height: int, options: ImageOptions) -> float:
+    scale = 1.0
+    if options.max_long_side:
+        scale = min(scale, options.max_long_side / max(width, height))
+    if options.max_short_side:
+        scale = min(scale, options.max_short_side / min(width, height))
+    if options.max_pixels:
+        scale = min(scale, (options.max_pixels / (width * height)) ** 0.5)
+    return scale
+
+
+def _prepare_image(image: "Image.Image", options: ImageOptions) -> tuple[bytes, str]:
+    from PIL import Image, ImageOps
+
+    # re-encoding drops the EXIF orientation, so it has to be applied to the pixels
+    image = ImageOps.exif_transpose(image)
+    scale = _image_scale(image.width, image.height, options)
+    if scale < 1:
+        size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        logger.debug(f"Downscaling image from {image.size} to {size}")
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    if options.format == "JPEG" and image.mode != "RGB":
+        if image.mode in ("RGBA", "LA", "P"):
+            # transparent areas become white instead of black
+            rgba = image.convert("RGBA")
+            background = Image.new("RGB", rgba.size, (255, 255, 255))
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            image = background
+        else:
+            image = image.convert("RGB")
     buffered = BytesIO()
-    image.save(buffered, format=image.format or "JPEG")  # Assuming JPEG if format is not provided
-    img_str = base64.b64encode(buffered.getvalue())
-    return img_str.decode('utf-8')
+    image.save(buffered, format=options.format, quality=options.quality)
+    return buffered.getvalue(), f"image/{options.format.lower()}"
 
 
-def draw_boxes_on_image(image: Image, normalized_boxes: list[Tuple[float, float, float, float]]):
+def draw_boxes_on_image(image: "Image.Image", normalized_boxes: list[Tuple[float, float, float, float]]):
     """
     Draws bounding boxes on a given PIL image and displays the resulting image.
 
@@ -132,6 +290,8 @@ def draw_boxes_on_image(image: Image, normalized_boxes: list[Tuple[float, float,
     Returns:
         None
     """
+    from PIL import ImageDraw
+
     draw = ImageDraw.Draw(image)
     width, height = image.size
     # Iterate over the normalized bounding boxes
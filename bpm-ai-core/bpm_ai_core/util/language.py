@@ -1,19 +1,111 @@
-try:
-    from lingua import Language, LanguageDetectorBuilder
+import importlib.util
+import threading
+from collections import OrderedDict
 
-    has_lingua = True
+has_lingua = importlib.util.find_spec("lingua") is not None
 
-    languages = [Language.ENGLISH, Language.FRENCH, Language.GERMAN, Language.SPANISH, Language.ITALIAN,
-                 Language.PORTUGUESE, Language.DUTCH, Language.DANISH, Language.SWEDISH, Language.NYNORSK,
-                 Language.FINNISH, Language.POLISH, Language.UKRAINIAN]
-    lang_detector = LanguageDetectorBuilder.from_languages(*languages).build()
-except ImportError:
-    has_lingua = False
+DEFAULT_LANGUAGES = ["ENGLISH", "FRENCH", "GERMAN", "SPANISH", "ITALIAN", "PORTUGUESE", "DUTCH", "DANISH", "SWEDISH",
+                     "NYNORSK", "FINNISH", "POLISH", "UKRAINIAN"]
+"""lingua language names the detector distinguishes by default."""
+
+_config = {"languages": DEFAULT_LANGUAGES, "sample_chars": 2_000, "cache_size": 10_000, "low_accuracy": False}
+_detector = None
+_cache: OrderedDict[str, object] = OrderedDict()
+_lock = threading.Lock()
+
+
+def configure_language_detector(
+        languages: list[str] = None,
+        sample_chars: int = None,
+        cache_size: int = None,
+        low_accuracy: bool = None
+):
+    """
+    Configures the language detector, which is (re)built lazily on the next detection.
+
+    :param languages: lingua language names to distinguish, e.g. ["ENGLISH", "GERMAN"]
+    :param sample_chars: Only the first sample_chars characters of longer texts are used for detection
+    :param cache_size: Max number of cached detection results
+    :param low_accuracy: Use lingua's low accuracy mode, which is faster and needs less memory
+    """
+    global _detector
+    with _lock:
+        for key, value in [("languages", languages), ("sample_chars", sample_chars),
+                           ("cache_size", cache_size), ("low_accuracy", low_accuracy)]:
+            if value is not None:
+                _config[key] = value
+        _detector = None
+        _cache.clear()
+
+
+def _get_detector():
+    global _detector
+    if _detector is None:
+        with _lock:
+            if _detector is None:
+                from lingua import Language, LanguageDetectorBuilder
+                builder = LanguageDetectorBuilder.from_languages(*[getattr(Language, name) for name in _config["languages"]])
+                if _config["low_accuracy"]:
+                    builder = builder.with_low_accuracy_mode()
+                _detector = builder.build()
+    return _detector
+
+
+def _sample(text: str) -> str:
+    return text[:_config["sample_chars"]]
+
+
+def detect_languages(texts: list[str]) -> list:
+    """
+    Detects the lingua Language of each text (None if unknown), using cached results where possible.
+    Cache misses are detected in a single parallel batch.
+    """
+    samples = [_sample(text) for text in texts]
+    results = {}
+    with _lock:
+        for sample in samples:
+            if sample in _cache:
+                _cache.move_to_end(sample)
+                results[sample] = _cache[sample]
+    misses = list(dict.fromkeys(s for s in samples if s not in results))
+    if misses:
+        detector = _get_detector()
+        if len(misses) == 1:
+            detected = [detector.detect_language_of(misses[0])]
+        else:
+            detected = detector.detect_languages_in_parallel_of(misses)
+        with _lock:
+            for sample, language in zip(misses, detected):
+                results[sample] = language
+                _cache[sample] = language
+            while len(_cache) > _config["cache_size"]:
+                _cache.popitem(last=False)
+    return [results[sample] for sample in samples]
 
 
 def indentify_language(text: str) -> str | None:
-    return lang_detector.detect_language_of(text).iso_code_639_1.name.lower()
+    return identify_languages([text])[0]
 
 
 def indentify_language_iso_639_3(text: str) -> str | None:
-    return lang_detector.detect_language_of(text).iso_code_639_3.name.lower()
+    language = detect_languages([text])[0]
+    return language.iso_code_639_3.name.lower() if language is not None else None
+
+
+def identify_languages(texts: list[str]) -> list[str | None]:
+    """
+    Returns the ISO 639-1 code of the language of each text.
+    """
+    return [language.iso_code_639_1.name.lower() if language is not None else None
+            for language in detect_languages(texts)]
+
+
+def identify_language_with_confidence(text: str) -> tuple[str | None, float]:
+    """
+    Returns the ISO 639-1 code of the most likely of the configured languages and its confidence (0 to 1).
+    Texts in languages the detector does not distinguish typically get a low confidence.
+    """
+    values = _get_detector().compute_language_confidence_values(_sample(text))
+    if not values or not values[0].value:
+        return None, 0.0
+    return values[0].language.iso_code_639_1.name.lower(), values[0].value
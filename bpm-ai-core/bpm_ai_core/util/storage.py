@@ -1,15 +1,8 @@
 import os
+from typing import AsyncIterator
 from urllib.parse import urlparse
 
-try:
-    from aiobotocore.session import get_session
-except ImportError:
-    pass
-
-try:
-    from azure.storage.blob.aio import BlobClient
-except ImportError:
-    pass
+DEFAULT_CHUNK_SIZE = 1024 * 1024
 
 
 def is_s3_url(url: str) -> bool:
@@ -30,6 +23,8 @@ async def read_file_from_s3(file_url: str) -> bytes:
         bytes: The contents of the file.
     """
     try:
+        from aiobotocore.session import get_session
+
         bucket_name, file_path = await parse_s3_url(file_url)
 
         async with get_session().create_client('s3') as s3:
@@ -40,6 +35,20 @@ async def read_file_from_s3(file_url: str) -> bytes:
         raise Exception(f"Error reading file from S3: {str(e)}")
 
 
+async def stream_file_from_s3(file_url: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Like `read_file_from_s3`, but yields the file contents in chunks.
+    """
+    from aiobotocore.session import get_session
+
+    bucket_name, file_path = await parse_s3_url(file_url)
+    async with get_session().create_client('s3') as s3:
+        response = await s3.get_object(Bucket=bucket_name, Key=file_path)
+        async with response['Body'] as stream:
+            async for chunk in stream.iter_chunks(chunk_size):
+                yield chunk
+
+
 async def parse_s3_url(s3_url: str):
     # Extract bucket name and file path based on the URL format
     parsed_url = urlparse(s3_url)
@@ -70,9 +79,37 @@ async def read_file_from_azure_blob(file_url: str) -> bytes:
            str: The contents of the file as a string.
        """
     try:
+        from azure.storage.blob.aio import BlobClient
+
         access_key = os.environ.get('AZURE_STORAGE_ACCESS_KEY')
         async with BlobClient.from_blob_url(file_url, credential=access_key) as blob_client:
             blob = await blob_client.download_blob()
             return await blob.readall()
     except Exception as e:
         raise Exception(f"Error reading file from Azure Blob Storage: {str(e)}")
+
+
+async def stream_file_from_azure_blob(file_url: str) -> AsyncIterator[bytes]:
+    """
+    Like `read_file_from_azure_blob`, but yields the file contents in chunks.
+    """
+    from azure.storage.blob.aio import BlobClient
+
+    access_key = os.environ.get('AZURE_STORAGE_ACCESS_KEY')
+    async with BlobClient.from_blob_url(file_url, credential=access_key) as blob_client:
+        blob = await blob_client.download_blob()
+        async for chunk in blob.chunks():
+            yield chunk
+
+
+async def stream_file_from_url(file_url: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Downloads a file over HTTP(S) without blocking the event loop, yielding its contents in chunks.
+    """
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session:
+        async with session.get(file_url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
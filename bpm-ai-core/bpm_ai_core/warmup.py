@@ -0,0 +1,179 @@
+"""
+Preloads local models into their shared caches, e.g. at container start before reporting readiness:
+
+    python -m bpm_ai_core.warmup '[{"backend": "faster-whisper", "options": {"model_size": "small"}}]'
+
+The argument is a JSON list of model specs or the path of a JSON file containing one.
+"""
+import asyncio
+import json
+import logging
+import os
+import resource
+import sys
+import time
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupSpec(BaseModel):
+    backend: str
+    """One of the keys of BACKENDS."""
+
+    options: dict = {}
+    """Constructor arguments of the backend class."""
+
+    language_pairs: list[str] = []
+    """Only for translation backends: language pairs to load, e.g. ["de-en", "fr-en"]."""
+
+
+class WarmupResult(BaseModel):
+    backend: str
+    options: dict
+    load_seconds: float | None = None
+    inference_seconds: float | None = None
+    memory_mb: float | None = None
+    error: str | None = None
+
+
+def _faster_whisper(spec: WarmupSpec):
+    from bpm_ai_core.speech_recognition.faster_whisper import FasterWhisperASR
+    return FasterWhisperASR(**spec.options)
+
+
+async def _faster_whisper_inference(model, spec: WarmupSpec):
+    import numpy as np
+
+    def transcribe():
+        segments, _ = model.model.transcribe(np.zeros(16_000, dtype=np.float32))
+        return list(segments)
+    await asyncio.to_thread(transcribe)
+
+
+def _transformers_classifier(spec: WarmupSpec):
+    from bpm_ai_core.classification.transformers_classifier import TransformersClassifier, _get_pipeline
+    classifier = TransformersClassifier(**spec.options)
+    _get_pipeline(classifier.model)
+    return classifier
+
+
+async def _transformers_classifier_inference(model, spec: WarmupSpec):
+    await asyncio.to_thread(model.classify_with_metadata, "This is a warm-up.", ["test", "other"])
+
+
+def _transformers_qa(spec: WarmupSpec):
+    from bpm_ai_core.question_answering.transformers_qa import TransformersExtractiveQA, _get_pipeline
+    qa = TransformersExtractiveQA(**spec.options)
+    _get_pipeline(qa.model)
+    return qa
+
+
+async def _transformers_qa_inference(model, spec: WarmupSpec):
+    await model._do_answer("This is a warm-up.", "What is this?")
+
+
+def _spacy_pos(spec: WarmupSpec):
+    from bpm_ai_core.pos.spacy_pos_tagger import SpacyPOSTagger
+    return SpacyPOSTagger(**spec.options)
+
+
+async def _spacy_pos_inference(model, spec: WarmupSpec):
+    await asyncio.to_thread(model.tag, "This is a warm-up.")
+
+
+def _easynmt(spec: WarmupSpec):
+    from bpm_ai_core.translation.easy_nmt.easy_nmt import EasyNMT
+    return EasyNMT(**spec.options)
+
+
+def _ctranslate2_nmt(spec: WarmupSpec):
+    from bpm_ai_core.translation.ctranslate2_nmt import CTranslate2NMT
+    return CTranslate2NMT(**spec.options)
+
+
+async def _nmt_inference(model, spec: WarmupSpec):
+    # translation models are loaded per language pair on first use. The source language is passed explicitly,
+    # as language identification of the dummy text would not pick the pair to warm up. Loading (and evicting)
+    # models is guarded by the lock of the shared translator, so this is safe while the model serves requests.
+    for language_pair in spec.language_pairs:
+        source_lang, target_lang = language_pair.split("-")
+        await asyncio.to_thread(model.do_translate, "Test", target_lang, source_lang)
+
+
+BACKENDS = {
+    "faster-whisper": (_faster_whisper, _faster_whisper_inference),
+    "transformers-classifier": (_transformers_classifier, _transformers_classifier_inference),
+    "transformers-qa": (_transformers_qa, _transformers_qa_inference),
+    "spacy-pos": (_spacy_pos, _spacy_pos_inference),
+    "easynmt": (_easynmt, _nmt_inference),
+    "ctranslate2-nmt": (_ctranslate2_nmt, _nmt_inference),
+}
+"""Supported backends: name -> (load function, dummy inference function)."""
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        # peak resident set size, in kilobytes on Linux and bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss / 1024 ** 2 if sys.platform == "darwin" else max_rss / 1024
+
+
+async def warm_up(specs: list[WarmupSpec | dict]) -> list[WarmupResult]:
+    """
+    Loads the given models into the shared model caches and runs a dummy inference on each,
+    so the first real request does not pay download, load and first-inference costs.
+    A failing model is reported in its result and does not stop the others.
+    """
+    results = []
+    for spec in specs:
+        spec = spec if isinstance(spec, WarmupSpec) else WarmupSpec.model_validate(spec)
+        result = WarmupResult(backend=spec.backend, options=spec.options)
+        results.append(result)
+        try:
+            load, inference = BACKENDS[spec.backend]
+        except KeyError:
+            result.error = f"Unknown backend '{spec.backend}', expected one of {list(BACKENDS)}"
+            continue
+        rss_before = _rss_mb()
+        try:
+            start = time.perf_counter()
+            model = await asyncio.to_thread(load, spec)
+            result.load_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            await inference(model, spec)
+            result.inference_seconds = time.perf_counter() - start
+        except Exception as e:
+            logger.exception(f"Warm-up of {spec.backend} failed")
+            result.error = f"{type(e).__name__}: {e}"
+        result.memory_mb = _rss_mb() - rss_before
+        if result.error is None:
+            logger.info(
+                f"Warmed up {spec.backend} {spec.options}: load {result.load_seconds}s, "
+                f"inference {result.inference_seconds}s, memory {result.memory_mb:.0f} MB"
+            )
+    return results
+
+
+def main(argv: list[str] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print(__doc__)
+        return 2
+    config = argv[0]
+    if os.path.isfile(config):
+        with open(config) as f:
+            config = f.read()
+    logging.basicConfig(level=logging.INFO)
+    results = asyncio.run(warm_up(json.loads(config)))
+    print(json.dumps([r.model_dump() for r in results], indent=2))
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,12 @@
+import base64
+import gc
+from io import BytesIO
+
+from PIL import Image
+
 from bpm_ai_core.llm.common.blob import Blob
-from bpm_ai_core.util.image import blob_as_images
+from bpm_ai_core.util.image import blob_as_images, prepare_image, ImageOptions, base64_encode_prepared_image, \
+    base64_encode_image, _encoded_images
 
 
 async def test_blob_to_image_no_conversion():
@@ -30,3 +37,58 @@ async def test_blob_to_image_conversion():
     blob = Blob.from_path_or_url('invoice-sample.pdf')
     images = await blob_as_images(blob, accept_formats=["jpeg"])
     assert images[0].format == "JPEG"
+
+
+def test_prepare_image():
+    image = Image.new("RGBA", (4000, 3000), (255, 0, 0, 0))
+    options = ImageOptions(max_long_side=2048, max_short_side=768, format="JPEG", quality=80)
+
+    data, mimetype = prepare_image(image, options)
+    prepared = Image.open(BytesIO(data))
+
+    assert mimetype == "image/jpeg"
+    assert prepared.format == "JPEG"
+    assert prepared.size == (1024, 768)
+    assert prepared.getpixel((0, 0)) == (255, 255, 255)
+    assert prepare_image(image, options)[0] is data
+
+
+def test_prepare_image_max_pixels():
+    image = Image.new("RGB", (1000, 500))
+
+    data, mimetype = prepare_image(image, ImageOptions(max_pixels=125_000, format="WEBP"))
+    prepared = Image.open(BytesIO(data))
+
+    assert mimetype == "image/webp"
+    assert prepared.size == (500, 250)
+    assert Image.open(BytesIO(prepare_image(image, ImageOptions(format="PNG"))[0])).size == (1000, 500)
+
+
+def test_prepare_image_applies_exif_orientation():
+    # portrait photo stored as landscape, rotated by 90° clockwise for display (Orientation=6)
+    buffer = BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    Image.new("RGB", (3000, 2000)).save(buffer, format="JPEG", exif=exif)
+    image = Image.open(BytesIO(buffer.getvalue()))
+
+    data, _ = prepare_image(image, ImageOptions(max_long_side=1500, format="JPEG"))
+
+    assert Image.open(BytesIO(data)).size == (1000, 1500)
+
+
+def test_base64_encoding_memoized():
+    image = Image.new("RGB", (100, 100))
+    options = ImageOptions(max_long_side=50)
+
+    encoded, mimetype = base64_encode_prepared_image(image, options)
+
+    assert mimetype == "image/jpeg"
+    assert Image.open(BytesIO(base64.b64decode(encoded))).size == (50, 50)
+    assert base64_encode_prepared_image(image, options)[0] is encoded
+    assert base64_encode_image(image) is base64_encode_image(image)
+
+    cached = len(_encoded_images)
+    del image
+    gc.collect()
+    assert len(_encoded_images) == cached - 2
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+LIGHTWEIGHT_MODULES = [
+    "bpm_ai_core.util.language",
+    "bpm_ai_core.util.image",
+    "bpm_ai_core.util.file",
+    "bpm_ai_core.util.storage",
+    "bpm_ai_core.llm.common.blob",
+    "bpm_ai_core.llm.openai_chat",
+    "bpm_ai_core.llm.anthropic_chat",
+    "bpm_ai_core.llm.openai_chat.util",
+    "bpm_ai_core.llm.anthropic_chat.util",
+    "bpm_ai_core.speech_recognition.openai_whisper",
+]
+
+HEAVY_MODULES = ["lingua", "PIL", "pdf2image", "httpx", "openai", "anthropic", "requests", "aiobotocore", "azure"]
+
+
+def _import_times(modules: list[str]) -> tuple[dict[str, int], list[str]]:
+    """
+    Imports the modules in a fresh interpreter with `-X importtime`,
+    returns the cumulative import time per module (in microseconds) and the heavy modules that got imported.
+    """
+    code = (
+        f"import sys\n"
+        f"for m in {modules!r}: __import__(m)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return times, loaded
+
+
+def test_import_does_not_load_heavy_backends():
+    times, loaded = _import_times(LIGHTWEIGHT_MODULES)
+
+    assert loaded == []
+    for module in LIGHTWEIGHT_MODULES:
+        assert module in times
+
+
+def test_import_time():
+    times, _ = _import_times(["bpm_ai_core.llm.common.blob"])
+
+    # generous bound, heavy backends used to add more than a second
+    assert times["bpm_ai_core.llm.common.blob"] < 500_000
@@ -1,4 +1,5 @@
-from bpm_ai_core.util.language import indentify_language
+from bpm_ai_core.util import language as language_util
+from bpm_ai_core.util.language import indentify_language, identify_languages, configure_language_detector
 
 
 def test_language():
@@ -8,3 +9,26 @@ def test_language():
     language = indentify_language(given_text)
 
     assert language == expected_language
+
+
+def test_languages_batched():
+    given_texts = ["Das ist ein Test", "This is a test", "Das ist ein Test", "Questo è un altro test"]
+    expected_languages = ["de", "en", "de", "it"]
+
+    languages = identify_languages(given_texts)
+
+    assert languages == expected_languages
+
+
+def test_language_sampled_and_cached():
+    configure_language_detector(sample_chars=100, cache_size=2)
+    try:
+        long_text = "Das ist ein ziemlich langer deutscher Text. " * 10_000
+
+        assert indentify_language(long_text) == "de"
+        assert list(language_util._cache) == [long_text[:100]]
+
+        identify_languages(["This is a test", "Questo è un altro test"])
+        assert len(language_util._cache) == 2
+    finally:
+        configure_language_detector(sample_chars=2_000, cache_size=10_000)
@@ -0,0 +1,85 @@
+import base64
+from io import BytesIO
+from types import SimpleNamespace
+
+from PIL import Image
+
+from bpm_ai_core.llm.anthropic_chat.tools.prompt_constructors import construct_tool_use_system_prompt
+from bpm_ai_core.llm.anthropic_chat.tools.tool import AnthropicTool
+from bpm_ai_core.llm.anthropic_chat.util import messages_to_anthropic_dicts, add_cache_control, \
+    system_prompt_to_anthropic_blocks, anthropic_usage_dict
+from bpm_ai_core.llm.common.blob import Blob
+from bpm_ai_core.llm.common.message import UserMessage, AssistantMessage
+from bpm_ai_core.llm.openai_chat.util import messages_to_openai_dicts, openai_usage_dict
+
+
+async def test_openai_blob_passthrough():
+    with open("example.png", "rb") as f:
+        png = f.read()
+    messages = [UserMessage(content=["Describe:", Blob.from_path_or_url("example.png")])]
+
+    dicts = await messages_to_openai_dicts(messages)
+
+    assert dicts[0]["content"][0] == {"type": "text", "text": "Describe:"}
+    assert dicts[0]["content"][1]["image_url"]["url"] == f"data:image/png;base64,{base64.b64encode(png).decode()}"
+
+
+async def test_openai_blob_remote_url():
+    messages = [UserMessage(content=["Describe:", Blob.from_path_or_url("https://example.com/scan.jpg")])]
+
+    dicts = await messages_to_openai_dicts(messages)
+
+    assert dicts[0]["content"][1] == {"type": "image_url", "image_url": {"url": "https://example.com/scan.jpg"}}
+
+
+async def test_anthropic_blob_downscaled():
+    blob = Blob.from_path_or_url("sample-invoice.webp")
+    messages = [UserMessage(content=["Describe:", blob])]
+
+    dicts = await messages_to_anthropic_dicts(messages)
+    source = dicts[0]["content"][1]["source"]
+    image = Image.open(BytesIO(base64.b64decode(source["data"])))
+
+    assert source["media_type"] == "image/jpeg"
+    assert image.width * image.height <= 1_150_000
+    assert (await messages_to_anthropic_dicts(messages))[0]["content"][1]["source"]["data"] is source["data"]
+
+
+async def test_anthropic_cache_control():
+    messages = [
+        UserMessage(content="example question"),
+        AssistantMessage(content="example answer"),
+        UserMessage(content="actual question"),
+    ]
+
+    dicts = add_cache_control(await messages_to_anthropic_dicts(messages))
+
+    assert dicts[1]["content"] == [{"type": "text", "text": "example answer", "cache_control": {"type": "ephemeral"}}]
+    assert dicts[2]["content"] == "actual question"
+    assert add_cache_control(dicts[2:]) == dicts[2:]
+    assert system_prompt_to_anthropic_blocks("static", "schema", prompt_caching=True) == [
+        {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "schema"}
+    ]
+
+
+def test_usage_dicts():
+    anthropic_usage = SimpleNamespace(input_tokens=10, output_tokens=5, cache_read_input_tokens=1000, cache_creation_input_tokens=0)
+    openai_usage = SimpleNamespace(prompt_tokens=1500, completion_tokens=5, prompt_tokens_details={"cached_tokens": 1024})
+
+    assert anthropic_usage_dict(anthropic_usage) == {
+        "input_tokens": 1010, "output_tokens": 5, "cache_hit_tokens": 1000, "cache_miss_tokens": 10, "cache_write_tokens": 0
+    }
+    assert openai_usage_dict(openai_usage) == {
+        "input_tokens": 1500, "output_tokens": 5, "cache_hit_tokens": 1024, "cache_miss_tokens": 476
+    }
+
+
+def test_tool_use_system_prompt_cached():
+    def tools():
+        return [AnthropicTool(name="store", description="Stores the result", args_schema={"properties": {"a": {"type": "string"}}})]
+
+    prompt = construct_tool_use_system_prompt(tools())
+
+    assert "<tool_name>store</tool_name>" in prompt
+    assert construct_tool_use_system_prompt(tools()) is prompt
@@ -1,4 +1,13 @@
+import os
+import time
+
+import pytest
+
+from bpm_ai_core.translation.amazon_translate import AmazonTranslate, MAX_REQUEST_BYTES
+from bpm_ai_core.translation.azure_translation import chunk_texts, translate_in_chunks
+from bpm_ai_core.translation.ctranslate2_nmt import CTranslate2NMT
 from bpm_ai_core.translation.easy_nmt.easy_nmt import EasyNMT
+from bpm_ai_core.translation.nmt import NMTModel
 
 
 async def test_translate():
@@ -32,3 +41,165 @@ async def test_translate_multiple():
     translated = await model.translate(given_texts, target_language)
 
     assert translated == expected_translated
+
+
+async def test_translate_multiple_grouped():
+    given_texts = ["Das ist ein Test", "Un altro test", "Das ist noch ein Test", "This is a test"]
+    target_language = "en"
+    expected_translated = ["This is a test", "Another test", "This is another test", "This is a test"]
+
+    model = EasyNMT()
+    translated = await model.translate(given_texts, target_language)
+
+    assert translated == expected_translated
+
+
+async def test_translate_ctranslate2():
+    given_texts = ["Das ist ein Test", "Un altro test"]
+    target_language = "en"
+    expected_translated = ["This is a test", "Another test"]
+
+    model = CTranslate2NMT()
+    translated = await model.translate(given_texts, target_language)
+
+    assert translated == expected_translated
+
+
+async def test_translate_multi_process_pool():
+    given_texts = ["Das ist ein Test", "Un altro test", "Das ist noch ein Test"]
+    target_language = "en"
+    expected_translated = ["This is a test", "Another test", "This is another test"]
+
+    model = EasyNMT()
+    pool = model.start_multi_process_pool(target_devices=["cpu"] * 2, chunk_size=1)
+    try:
+        assert pool.wait_until_ready(timeout=300)
+        assert all(worker["ready"] for worker in pool.health()["workers"])
+
+        translated = await model.translate(given_texts, target_language)
+    finally:
+        model.stop_multi_process_pool()
+
+    assert translated == expected_translated
+    assert model.pool is None
+
+
+async def test_translate_stream():
+    class UpperNMT(NMTModel):
+        def __init__(self):
+            self.batches = []
+
+        async def _do_translate(self, text, target_language):
+            self.batches.append(list(text))
+            return [t.upper() for t in text]
+
+    async def texts():
+        for i in range(7):
+            yield f"text {i}"
+
+    model = UpperNMT()
+    translated = [t async for t in model.translate_stream(texts(), "en", chunk_size=3)]
+
+    assert translated == [f"TEXT {i}" for i in range(7)]
+    assert [len(b) for b in model.batches] == [3, 3, 1]
+
+
+async def test_translate_stream_easynmt():
+    given_texts = ["Das ist ein Test", "Un altro test", "Das ist noch ein Test"]
+    target_language = "en"
+    expected_translated = ["This is a test", "Another test", "This is another test"]
+
+    model = EasyNMT()
+    translated = [t async for t in model.translate_stream(given_texts, target_language, chunk_size=2)]
+
+    assert translated == expected_translated
+
+
+async def test_translate_amazon_packed():
+    class FakeClient:
+        def __init__(self):
+            self.requests = []
+
+        async def translate_text(self, Text, SourceLanguageCode, TargetLanguageCode):
+            self.requests.append((Text, SourceLanguageCode))
+            return {"TranslatedText": Text.upper()}
+
+    model = AmazonTranslate()
+    client = FakeClient()
+
+    async def get_client():
+        return client
+    model._get_client = get_client
+    model._detect_language = lambda text: "de"
+
+    long_text = "Das ist ein Satz. " * 1_000 + "\n\n" + "Noch ein Satz. " * 1_000
+    translated = await model.translate(["a", "b", "", long_text], "en")
+
+    assert translated == ["A", "B", "", long_text.upper()]
+    assert all(source == "auto" for _, source in client.requests)
+    assert all(len(text.encode()) <= MAX_REQUEST_BYTES for text, _ in client.requests)
+    # the long text is split at sentence boundaries
+    assert len(client.requests) > 3
+    assert all(text.endswith(".") for text, _ in client.requests[1:])
+
+
+def test_amazon_packing_language_detection():
+    assert AmazonTranslate._detect_language("Das ist ein Test und noch mehr Text") == "de"
+    # languages lingua does not distinguish are not packed with others
+    assert AmazonTranslate._detect_language("这是一个测试") is None
+    assert AmazonTranslate._detect_language("Bu bir test cümlesidir ve daha fazla metin") is None
+
+
+async def test_translate_amazon():
+    if not os.environ.get("AWS_ACCESS_KEY_ID"):
+        pytest.skip("no API key provided")
+
+    given_texts = ["Das ist ein Test", "Un altro test"]
+    expected_translated = ["This is a test", "Another test"]
+
+    model = AmazonTranslate()
+    translated = await model.translate(given_texts, "en")
+
+    assert translated == expected_translated
+
+
+def test_translate_azure_chunking():
+    texts = ["a" * 10] * 5 + ["b" * 100] + ["c"]
+
+    chunks = chunk_texts(texts, max_elements=3, max_characters=50)
+
+    assert chunks == [["a" * 10] * 3, ["a" * 10] * 2, ["b" * 100], ["c"]]
+    assert [t for c in chunks for t in c] == texts
+
+
+async def test_translate_azure_splits_long_texts():
+    chunks = []
+
+    async def translate_chunk(chunk):
+        chunks.append(chunk)
+        return [t.upper() for t in chunk]
+
+    long_text = "Ein Satz. " * 10 + "\n\n" + "Noch ein Satz. " * 5
+    translated = await translate_in_chunks(["kurz", long_text], translate_chunk, max_characters=60)
+
+    assert translated == ["KURZ", long_text.upper()]
+    assert all(sum(len(t) for t in chunk) <= 60 for chunk in chunks)
+    assert len(chunks) > 2
+
+
+def test_reconstruct_document_large():
+    def split_sentences(text, lang):
+        return [s + "." for s in text.split(".") if s.strip()]
+
+    paragraph = "  Das ist ein Satz. Und noch einer.  Der dritte Satz. "
+    doc = "\n".join([paragraph] * 100_000)  # ~5 MB
+    assert len(doc) > 5_000_000
+
+    start = time.perf_counter()
+    spans = EasyNMT._sentence_spans(doc, "de", "\n", split_sentences)
+    translated = EasyNMT._reconstruct_document(doc, spans, [f"<{doc[s:e]}>" for s, e in spans])
+    elapsed = time.perf_counter() - start
+
+    assert len(spans) == 300_000
+    assert translated.split("\n")[1] == "  <Das ist ein Satz.> <Und noch einer.>  <Der dritte Satz.> "
+    assert elapsed < 10
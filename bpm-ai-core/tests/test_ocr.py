@@ -0,0 +1,91 @@
+import pytest
+
+from bpm_ai_core.llm.common.blob import Blob
+from bpm_ai_core.ocr.ocr import OCR, OCRResult, OCRPage, validate_pages
+from bpm_ai_core.ocr.pdf_text_layer import parse_bbox_layout
+from bpm_ai_core.ocr.tesseract import TesseractOCR
+
+
+class _StaticOCR(OCR):
+    async def _do_process(self, blob: Blob, language: str = None, pages: list[int] | None = None) -> OCRResult:
+        return OCRResult(pages=[
+            OCRPage(text="first", words=["first"], bboxes=[(0.0, 0.0, 0.1, 0.1)]),
+            OCRPage(text="second", words=["second"], bboxes=[(0.0, 0.0, 0.1, 0.1)])
+        ])
+
+
+async def test_ocr_stream_default():
+    ocr = _StaticOCR()
+
+    pages = [page async for page in ocr.process_stream("dummy.pdf")]
+
+    assert [p.text for p in pages] == ["first", "second"]
+
+
+async def test_ocr_stream_tesseract():
+    ocr = TesseractOCR()
+
+    pages = [page async for page in ocr.process_stream("dummy.pdf")]
+    result = await ocr.process("dummy.pdf")
+
+    assert len(pages) == len(result.pages)
+    assert "Dummy" in pages[0].text
+
+
+async def test_ocr_tesseract_pages():
+    ocr = TesseractOCR()
+
+    result = await ocr.process("invoice-sample.pdf", pages=[1])
+
+    assert len(result.pages) == 1
+
+
+def test_validate_pages():
+    validate_pages(None)
+    validate_pages([1, 3], page_count=3)
+
+    with pytest.raises(ValueError):
+        validate_pages([])
+    with pytest.raises(ValueError):
+        validate_pages([0])
+    with pytest.raises(ValueError, match="document has 2 pages"):
+        validate_pages([1, 3], page_count=2)
+
+
+async def test_ocr_empty_pages():
+    ocr = _StaticOCR()
+
+    with pytest.raises(ValueError):
+        await ocr.process("dummy.pdf", pages=[])
+
+
+def test_pdf_text_layer_parsing():
+    xhtml = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml">
+<head><title></title></head>
+<body>
+  <doc>
+    <page width="200.000000" height="100.000000">
+      <flow>
+        <block xMin="10" yMin="10" xMax="90" yMax="20">
+          <line xMin="10" yMin="10" xMax="90" yMax="20">
+            <word xMin="10.000000" yMin="10.000000" xMax="40.000000" yMax="20.000000">Total:</word>
+            <word xMin="50.000000" yMin="10.000000" xMax="90.000000" yMax="20.000000">300.00</word>
+          </line>
+        </block>
+      </flow>
+    </page>
+    <page width="200.000000" height="100.000000">
+    </page>
+  </doc>
+</body>
+</html>"""
+
+    pages = parse_bbox_layout(xhtml, first_page=3)
+
+    assert list(pages.keys()) == [3, 4]
+    assert pages[3].text == "Total: 300.00"
+    assert pages[3].words == ["Total:", "300.00"]
+    assert pages[3].bboxes[1] == (0.25, 0.1, 0.45, 0.2)
+    assert pages[4].words == []
@@ -0,0 +1,53 @@
+from bpm_ai_core.ocr.ocr import OCRPage
+
+
+def _invoice_page() -> OCRPage:
+    return OCRPage(
+        text="Invoice 4711\nNet 250.00 EUR\nTotal: 300.00 EUR",
+        words=["Invoice", "4711", "Net", "250.00", "EUR", "Total:", "300.00", "EUR"],
+        bboxes=[
+            (0.10, 0.10, 0.25, 0.13), (0.30, 0.10, 0.38, 0.13),
+            (0.10, 0.50, 0.16, 0.53), (0.60, 0.50, 0.70, 0.53), (0.72, 0.50, 0.78, 0.53),
+            (0.10, 0.60, 0.20, 0.63), (0.60, 0.605, 0.70, 0.635), (0.72, 0.60, 0.78, 0.63),
+        ]
+    )
+
+
+def test_spatial_index_right_of():
+    index = _invoice_page().spatial_index
+
+    label = index.find("total")[0]
+    right = index.right_of(label)
+
+    assert [w.text for w in right] == ["300.00", "EUR"]
+
+
+def test_spatial_index_inside():
+    index = _invoice_page().spatial_index
+
+    words = index.inside((0.5, 0.45, 0.8, 0.7))
+
+    assert [w.text for w in words] == ["250.00", "EUR", "300.00", "EUR"]
+    assert index.inside((0.5, 0.45, 0.65, 0.7)) == []
+    assert [w.text for w in index.inside((0.5, 0.45, 0.65, 0.7), partial=True)] == ["250.00", "300.00"]
+
+
+def test_spatial_index_nearest():
+    index = _invoice_page().spatial_index
+
+    nearest = index.nearest(0.59, 0.61, k=2)
+
+    assert [w.text for w in nearest] == ["300.00", "250.00"]
+    assert index.nearest(0.99, 0.99, max_distance=0.01) == []
+
+
+def test_spatial_index_lines():
+    page = _invoice_page()
+
+    lines = page.spatial_index.lines()
+
+    assert [[w.text for w in line] for line in lines] == [
+        ["Invoice", "4711"], ["Net", "250.00", "EUR"], ["Total:", "300.00", "EUR"]
+    ]
+    assert page.spatial_index.text_inside((0.0, 0.45, 1.0, 0.7)) == "Net 250.00 EUR\nTotal: 300.00 EUR"
+    assert page.spatial_index is page.spatial_index
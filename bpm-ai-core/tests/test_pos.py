@@ -10,3 +10,13 @@ def test_pos():
     assert tags == [
         ('It', 'PRON'), ("'s ", 'AUX'), ('me', 'PRON'), (', ', 'PUNCT'), ('John ', 'PROPN'), ('Meier', 'PROPN'), ('.', 'PUNCT')
     ]
+
+
+def test_pos_many():
+    texts = ["It's me, John Meier.", "Hello world."]
+
+    tagger = SpacyPOSTagger()
+    tags = tagger.tag_many(texts)
+
+    assert tags == [tagger.tag(text) for text in texts]
+    assert SpacyPOSTagger().nlp is tagger.nlp
@@ -1,4 +1,13 @@
+import io
+import os
+
+import pytest
+
+from bpm_ai_core.llm.common.blob import Blob
+from bpm_ai_core.speech_recognition.asr import ASRModel, TranscriptionSegment, transcribe_chunked
 from bpm_ai_core.speech_recognition.faster_whisper import FasterWhisperASR
+from bpm_ai_core.speech_recognition.openai_whisper import OpenAIWhisperASR, MAX_CHUNK_SECONDS, MAX_FILE_BYTES
+from bpm_ai_core.util.audio import SAMPLING_RATE, split_on_silence, decode_audio, encode_wav, load_audio_blob
 
 
 async def test_faster_whisper():
@@ -11,3 +20,98 @@ async def test_faster_whisper_url():
     fw = FasterWhisperASR()
     text = await fw.transcribe("https://upload.wikimedia.org/wikipedia/commons/d/dd/Armstrong_Small_Step.ogg")
     assert "giant leap for mankind" in text.lower()
+
+
+async def test_faster_whisper_stream():
+    fw = FasterWhisperASR(vad_filter=True)
+    segments = [s async for s in fw.transcribe_stream("test.mp3")]
+
+    assert len(segments) > 0
+    assert segments[0].start >= 0
+    assert all(s.end >= s.start for s in segments)
+    assert "".join(s.text for s in segments).lower().strip() == "looking with a half-fantastic curiosity to see whether the tender grass of early spring"
+
+
+async def test_transcribe_stream_default():
+    class StaticASR(ASRModel):
+        async def _do_transcribe(self, audio, language=None):
+            return "hello world"
+
+    segments = [s async for s in StaticASR().transcribe_stream(io.BytesIO(b""))]
+
+    assert [s.text for s in segments] == ["hello world"]
+
+
+def test_split_on_silence():
+    import numpy as np
+
+    # 1 s tone / 0.5 s silence pattern, 60 s total
+    t = np.arange(SAMPLING_RATE) / SAMPLING_RATE
+    pattern = np.concatenate([np.sin(2 * np.pi * 440 * t), np.zeros(SAMPLING_RATE // 2)]).astype(np.float32)
+    samples = np.tile(pattern, 40)
+
+    chunks = split_on_silence(samples, max_chunk_seconds=10, overlap_seconds=0.2)
+
+    assert chunks[0].start == 0 and chunks[-1].end == len(samples)
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert prev.end - nxt.start == int(0.2 * SAMPLING_RATE) // 2 * 2
+        split = (prev.end + nxt.start) // 2
+        assert np.abs(samples[split - 100:split + 100]).max() == 0  # split inside silence
+    assert all(c.end - c.start <= 10.1 * SAMPLING_RATE for c in chunks)
+
+
+async def test_transcribe_chunked():
+    import numpy as np
+
+    calls = []
+
+    async def transcribe_samples(samples, language=None):
+        # one segment per second of audio
+        calls.append(len(samples))
+        return [TranscriptionSegment(text=f"{len(calls)}.{i} ", start=i, end=i + 1) for i in range(len(samples) // SAMPLING_RATE)]
+
+    samples = np.zeros(95 * SAMPLING_RATE, dtype=np.float32)
+    segments = await transcribe_chunked(samples, transcribe_samples, max_chunk_seconds=30, overlap_seconds=2, max_concurrency=2)
+
+    assert len(calls) == 4
+    starts = [s.start for s in segments]
+    assert starts == sorted(starts)
+    # overlapping speech is kept once
+    assert all(b.start >= a.end - 1e-6 for a, b in zip(segments, segments[1:]))
+    assert segments[-1].end > 94
+
+
+def test_decode_audio():
+    samples = decode_audio("test.mp3")
+
+    assert samples.dtype.name == "float32"
+    assert len(samples) > SAMPLING_RATE
+    assert encode_wav(samples).getbuffer().nbytes == 44 + 2 * len(samples)
+
+
+async def test_load_audio_blob():
+    with open("test.mp3", "rb") as f:
+        expected = f.read()
+
+    audio = await load_audio_blob(Blob.from_path_or_url("test.mp3"), max_memory_bytes=1024)
+
+    assert audio.name == "audio.mp3"
+    assert audio._rolled  # larger than max_memory_bytes, moved to disk
+    assert audio.read() == expected
+    audio.close()
+
+
+async def test_transcribe_path():
+    class SizeASR(ASRModel):
+        async def _do_transcribe(self, audio, language=None):
+            return str(len(audio.read()))
+
+    assert await SizeASR().transcribe("test.mp3") == str(os.path.getsize("test.mp3"))
+
+
+def test_openai_whisper_chunk_size_limit():
+    import numpy as np
+
+    assert encode_wav(np.zeros(MAX_CHUNK_SECONDS * SAMPLING_RATE, dtype=np.float32)).getbuffer().nbytes <= MAX_FILE_BYTES
+    with pytest.raises(ValueError):
+        OpenAIWhisperASR(chunk_seconds=MAX_CHUNK_SECONDS)
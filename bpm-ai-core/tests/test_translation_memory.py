@@ -0,0 +1,50 @@
+from bpm_ai_core.translation.nmt import NMTModel
+from bpm_ai_core.translation.translation_memory import TranslationMemory
+
+
+class _UpperNMT(NMTModel):
+    def __init__(self, translation_memory: TranslationMemory = None):
+        self.translation_memory = translation_memory
+        self.requested = []
+
+    async def _do_translate(self, text: str | list[str], target_language: str) -> str | list[str]:
+        texts = [text] if isinstance(text, str) else text
+        self.requested.extend(texts)
+        translated = [t.upper() for t in texts]
+        return translated[0] if isinstance(text, str) else translated
+
+
+async def test_translation_memory_only_translates_misses():
+    model = _UpperNMT(TranslationMemory())
+
+    assert await model.translate(["hello", "world", "hello"], "de") == ["HELLO", "WORLD", "HELLO"]
+    assert await model.translate(["world", "again"], "de") == ["WORLD", "AGAIN"]
+    assert await model.translate("hello", "de") == "HELLO"
+    assert model.requested == ["hello", "world", "again"]
+
+    await model.translate("hello", "fr")
+    assert model.requested[-1] == "hello"
+
+
+def test_translation_memory_lru():
+    memory = TranslationMemory(max_entries=2)
+
+    memory.put("a", "A", "en", "de", "m")
+    memory.put("b", "B", "en", "de", "m")
+    memory.get("a", "en", "de", "m")
+    memory.put("c", "C", "en", "de", "m")
+
+    assert memory.get("a", "en", "de", "m") == "A"
+    assert memory.get("b", "en", "de", "m") is None
+    assert memory.get("a", "en", "de", "other-model") is None
+
+
+def test_translation_memory_persistence(tmp_path):
+    path = str(tmp_path / "tm.sqlite")
+    memory = TranslationMemory(path=path)
+    memory.put("Sehr geehrte Damen und Herren,", "Dear Sir or Madam,", "de", "en", "m")
+    memory.close()
+
+    memory = TranslationMemory(path=path)
+
+    assert memory.get("Sehr geehrte Damen und Herren,", "de", "en", "m") == "Dear Sir or Madam,"
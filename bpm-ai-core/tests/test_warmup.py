@@ -0,0 +1,20 @@
+from bpm_ai_core.warmup import warm_up, WarmupSpec
+
+
+async def test_warm_up_unknown_backend():
+    results = await warm_up([{"backend": "unknown"}])
+
+    assert results[0].error.startswith("Unknown backend")
+
+
+async def test_warm_up():
+    results = await warm_up([
+        WarmupSpec(backend="spacy-pos", options={"language": "en"}),
+        WarmupSpec(backend="easynmt", language_pairs=["de-en"]),
+    ])
+
+    for result in results:
+        assert result.error is None
+        assert result.load_seconds is not None
+        assert result.inference_seconds is not None
+        assert result.memory_mb is not None
@@ -0,0 +1,55 @@
+import asyncio
+import os
+
+import pytest
+
+from bpm_ai_core.translation.easy_nmt.worker_pool import TranslationWorkerPool
+
+
+class _FakeModel:
+    def do_translate(self, documents, target_lang, source_lang, **kwargs):
+        if "crash" in documents:
+            os._exit(1)
+        return [f"{target_lang}:{d}" for d in documents]
+
+
+def _fake_model_factory(device):
+    return _FakeModel()
+
+
+async def test_worker_pool_translate():
+    pool = TranslationWorkerPool(_fake_model_factory, ["cpu", "cpu"], chunk_size=2).start()
+    try:
+        assert pool.wait_until_ready(timeout=60)
+        result = await pool.translate(["a", "b", "c"], source_lang="de", target_lang="en")
+        assert result == ["en:a", "en:b", "en:c"]
+    finally:
+        pool.stop()
+
+
+async def test_worker_pool_dead_worker_fails_its_jobs():
+    pool = TranslationWorkerPool(_fake_model_factory, ["cpu"]).start()
+    try:
+        assert pool.wait_until_ready(timeout=60)
+        with pytest.raises(RuntimeError, match="died"):
+            await asyncio.wait_for(pool.translate(["crash"], source_lang="de", target_lang="en"), timeout=30)
+        with pytest.raises(RuntimeError, match="died"):
+            pool.submit(["a"], source_lang="de", target_lang="en")
+    finally:
+        pool.stop()
+
+
+async def test_worker_pool_dead_worker_fails_only_its_job():
+    pool = TranslationWorkerPool(_fake_model_factory, ["cpu", "cpu"]).start()
+    try:
+        assert pool.wait_until_ready(timeout=60)
+        with pytest.raises(RuntimeError, match="died"):
+            await asyncio.wait_for(pool.translate(["crash"], source_lang="de", target_lang="en"), timeout=30)
+        assert pool.health()["pending_jobs"] == 0
+
+        # the remaining worker keeps serving jobs
+        result = await asyncio.wait_for(pool.translate(["a"], source_lang="de", target_lang="en"), timeout=30)
+        assert result == ["en:a"]
+        assert [w["alive"] for w in pool.health()["workers"]].count(True) == 1
+    finally:
+        pool.stop()
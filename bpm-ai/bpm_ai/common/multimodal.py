@@ -1,31 +1,181 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from urllib.parse import urlsplit, urlunsplit
+
 from bpm_ai_core.ocr.ocr import OCR
 from bpm_ai_core.speech_recognition.asr import ASRModel
-from bpm_ai_core.util.audio import is_supported_audio_file
-from bpm_ai_core.util.image import is_supported_img_file
+from bpm_ai_core.tracing.tracing import Tracing
+from bpm_ai_core.util.file import is_supported_audio_file, is_supported_img_file
+
+DEFAULT_MAX_CONCURRENCY = 4
+"""Max number of attachments processed (OCR or ASR) at the same time per task."""
+
+
+class ResultCache:
+    """
+    LRU cache of OCR and ASR results that can be shared across tasks, keyed by processor and attachment reference.
+    Only use it for attachments whose content does not change under the same URL.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+
+    def get(self, key: tuple) -> str | None:
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: tuple, result: str):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _reference_key(value: str) -> str:
+    """
+    Identifies the attachment a value refers to: remote references by normalized URL, local files by content hash.
+    """
+    parsed = urlsplit(value.strip())
+    if parsed.scheme in ("http", "https", "s3"):
+        netloc = parsed.netloc.lower().removesuffix(":80" if parsed.scheme == "http" else ":443")
+        return urlunsplit((parsed.scheme.lower(), netloc, parsed.path or "/", parsed.query, ""))
+    if os.path.isfile(value):
+        with open(value, "rb") as f:
+            return "sha256:" + hashlib.file_digest(f, "sha256").hexdigest()
+    return value
+
+
+def _processor_key(processor) -> tuple:
+    # processors of the same type and simple configuration produce the same results
+    config = sorted((k, v) for k, v in vars(processor).items() if isinstance(v, (str, int, float, bool, type(None))))
+    return type(processor).__qualname__, tuple(config)
 
 
 def prepare_images_for_llm_prompt(input_data: dict):
     """
-    For multi-modal LLMs. Will be turned into PIL Image(s) as part of the prompt processing.
+    For multi-modal LLMs. Will be turned into Blob(s) as part of the prompt processing.
     """
     return {
-        k: f"[# image {v} #]"
+        k: f"[# blob {v} #]"
         if (isinstance(v, str) and is_supported_img_file(v))
         else v for k, v in input_data.items()
     }
 
 
-async def ocr_images(input_data: dict, ocr: OCR | None = None):
-    return {
-        k: await ocr.images_to_text(v)
-        if (ocr and isinstance(v, str) and is_supported_img_file(v))
-        else v for k, v in input_data.items()
-    }
+async def _process_values(
+        name: str,
+        input_data: dict,
+        is_supported: Callable[[str], bool],
+        processor,
+        process: Callable[[str], Awaitable[str]],
+        semaphore: asyncio.Semaphore,
+        cache: ResultCache | None = None
+) -> dict:
+    """
+    Concurrently replaces all supported values by their processed result, keeping the order of keys.
+    Values referring to the same attachment are processed once and the result is shared by all their keys.
+    """
+    async def process_value(keys: list[str], value: str, cache_key: tuple) -> str:
+        if cache is not None and (result := cache.get(cache_key)) is not None:
+            return result
+        async with semaphore:
+            start = time.perf_counter()
+            error_msg = None
+            try:
+                result = await process(value)
+            except Exception as e:
+                error_msg = str(e)
+                raise
+            finally:
+                Tracing.tracers().event(
+                    name,
+                    inputs={"keys": keys, "value": value},
+                    outputs={"seconds": round(time.perf_counter() - start, 3)},
+                    error_msg=error_msg
+                )
+        if cache is not None:
+            cache.put(cache_key, result)
+        return result
 
+    keys = [k for k, v in input_data.items() if isinstance(v, str) and is_supported(v)]
+    reference_keys = await asyncio.gather(*[asyncio.to_thread(_reference_key, input_data[k]) for k in keys])
+    keys_by_reference: dict[str, list[str]] = {}
+    for key, reference_key in zip(keys, reference_keys):
+        keys_by_reference.setdefault(reference_key, []).append(key)
 
-async def transcribe_audio(input_data: dict, asr: ASRModel | None = None) -> dict:
-    return {
-        k: await asr.transcribe(v)
-        if (asr and isinstance(v, str) and is_supported_audio_file(v))
-        else v for k, v in input_data.items()
-    }
\ No newline at end of file
+    processor_key = _processor_key(processor)
+    results = await asyncio.gather(*[
+        process_value(ref_keys, input_data[ref_keys[0]], (name, processor_key, reference_key))
+        for reference_key, ref_keys in keys_by_reference.items()
+    ])
+    output = dict(input_data)
+    for ref_keys, result in zip(keys_by_reference.values(), results):
+        for key in ref_keys:
+            output[key] = result
+    return output
+
+
+async def _ocr(ocr: OCR, value: str) -> str:
+    return (await ocr.process(value)).full_text
+
+
+async def ocr_images(
+        input_data: dict,
+        ocr: OCR | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: ResultCache | None = None
+):
+    if not ocr:
+        return input_data
+    return await _process_values(
+        "ocr-item", input_data, is_supported_img_file, ocr, lambda v: _ocr(ocr, v), asyncio.Semaphore(max_concurrency), cache
+    )
+
+
+async def transcribe_audio(
+        input_data: dict,
+        asr: ASRModel | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: ResultCache | None = None
+) -> dict:
+    if not asr:
+        return input_data
+    return await _process_values(
+        "asr-item", input_data, is_supported_audio_file, asr, asr.transcribe, asyncio.Semaphore(max_concurrency), cache
+    )
+
+
+async def ocr_images_and_transcribe_audio(
+        input_data: dict,
+        ocr: OCR | None = None,
+        asr: ASRModel | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: ResultCache | None = None
+) -> dict:
+    """
+    Runs OCR on all images and ASR on all audio files concurrently, sharing one concurrency limit,
+    so preprocessing takes as long as the slowest attachment rather than the sum of all.
+    If a cache is given, results are reused across calls.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = []
+    if ocr:
+        tasks.append(_process_values("ocr-item", input_data, is_supported_img_file, ocr, lambda v: _ocr(ocr, v), semaphore, cache))
+    if asr:
+        tasks.append(_process_values("asr-item", input_data, is_supported_audio_file, asr, asr.transcribe, semaphore, cache))
+    results = await asyncio.gather(*tasks)
+    # OCR and ASR work on disjoint keys, so the processed values of both can be merged
+    output = dict(input_data)
+    for result in results:
+        output.update({k: v for k, v in result.items() if v is not input_data[k]})
+    return output
@@ -11,7 +11,7 @@ from bpm_ai_core.tracing.decorators import trace
 
 from bpm_ai.common.errors import MissingParameterError
 from bpm_ai.common.json_utils import json_to_md
-from bpm_ai.common.multimodal import transcribe_audio, prepare_images_for_llm_prompt, ocr_images
+from bpm_ai.common.multimodal import prepare_images_for_llm_prompt, ocr_images_and_transcribe_audio, ResultCache
 from bpm_ai.compose.util import remove_stop_words, type_to_prompt_type_str, decode_if_needed
 
 TEMPLATE_VAR_PATTERN = r'\{\s*([^{}\s]+(?:\s*[^{}\s]+)*)\s*\}'
@@ -33,7 +33,8 @@ async def compose_llm(
     template: str,
     properties: TextProperties,
     ocr: OCR | None = None,
-    asr: ASRModel | None = None
+    asr: ASRModel | None = None,
+    cache: ResultCache | None = None
 ) -> dict:
     if template is None:
         raise MissingParameterError("template is required")
@@ -45,11 +46,10 @@ async def compose_llm(
     def format_vars(template: str, f: Callable[[str], str]):
         return re.sub(TEMPLATE_VAR_PATTERN, lambda m: f(m.group(1)), template)
 
-    if llm.supports_images():
+    images_for_llm = llm.supports_images()
+    if images_for_llm:
         input_data = prepare_images_for_llm_prompt(input_data)
-    else:
-        input_data = await ocr_images(input_data, ocr)
-    input_data = await transcribe_audio(input_data, asr)
+    input_data = await ocr_images_and_transcribe_audio(input_data, ocr=None if images_for_llm else ocr, asr=asr, cache=cache)
 
     # all variables found in the template
     template_vars = re.findall(TEMPLATE_VAR_PATTERN, template)
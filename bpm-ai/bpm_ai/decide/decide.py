@@ -11,7 +11,7 @@ from bpm_ai_core.tracing.decorators import trace
 
 from bpm_ai.common.errors import MissingParameterError
 from bpm_ai.common.json_utils import json_to_md
-from bpm_ai.common.multimodal import transcribe_audio, prepare_images_for_llm_prompt, ocr_images
+from bpm_ai.common.multimodal import prepare_images_for_llm_prompt, ocr_images_and_transcribe_audio, ResultCache
 from bpm_ai.decide.schema import get_cot_decision_output_schema, get_decision_output_schema
 
 
@@ -24,7 +24,8 @@ async def decide_llm(
     possible_values: list[Any] | None = None,
     strategy: str | None = None,
     ocr: OCR | None = None,
-    asr: ASRModel | None = None
+    asr: ASRModel | None = None,
+    cache: ResultCache | None = None
 ) -> dict:
     if not instructions or instructions.isspace():
         raise MissingParameterError("question/instruction is required")
@@ -46,12 +47,10 @@ async def decide_llm(
         callable=lambda **x: x
     )
 
-    if llm.supports_images():
+    images_for_llm = llm.supports_images()
+    if images_for_llm:
         input_data = prepare_images_for_llm_prompt(input_data)
-    else:
-        input_data = await ocr_images(input_data, ocr)
-
-    input_data = await transcribe_audio(input_data, asr)
+    input_data = await ocr_images_and_transcribe_audio(input_data, ocr=None if images_for_llm else ocr, asr=asr, cache=cache)
 
     input_md = json_to_md(input_data).strip()
 
@@ -80,7 +79,8 @@ async def decide_classifier(
     question: str | None = None,
     possible_values: list[Any] | None = None,
     ocr: OCR | None = None,
-    asr: ASRModel | None = None
+    asr: ASRModel | None = None,
+    cache: ResultCache | None = None
 ) -> dict:
     if not output_type or output_type.isspace():
         raise MissingParameterError("output type is required")
@@ -93,8 +93,7 @@ async def decide_classifier(
     if all(value is None for value in input_data.values()):
         return {"decision": None, "reasoning": "No input values present."}
 
-    input_data = await ocr_images(input_data, ocr)
-    input_data = await transcribe_audio(input_data, asr)
+    input_data = await ocr_images_and_transcribe_audio(input_data, ocr=ocr, asr=asr, cache=cache)
 
     input_md = json_to_md(input_data).strip()
 
@@ -17,7 +17,7 @@ from bpm_ai_core.util.language import indentify_language
 
 from bpm_ai.common.errors import MissingParameterError
 from bpm_ai.common.json_utils import json_to_md
-from bpm_ai.common.multimodal import transcribe_audio, prepare_images_for_llm_prompt, ocr_images
+from bpm_ai.common.multimodal import prepare_images_for_llm_prompt, ocr_images_and_transcribe_audio, ResultCache
 
 
 @trace("bpm-ai-extract", ["llm"])
@@ -28,16 +28,16 @@ async def extract_llm(
     multiple: bool = False,
     multiple_description: str = "",
     ocr: OCR | None = None,
-    asr: ASRModel | None = None
+    asr: ASRModel | None = None,
+    cache: ResultCache | None = None
 ) -> dict | list[dict]:
     if all(value is None for value in input_data.values()):
         return input_data
 
-    if output_schema and llm.supports_images():
+    images_for_llm = output_schema and llm.supports_images()
+    if images_for_llm:
         input_data = prepare_images_for_llm_prompt(input_data)
-    else:
-        input_data = await ocr_images(input_data, ocr)
-    input_data = await transcribe_audio(input_data, asr)
+    input_data = await ocr_images_and_transcribe_audio(input_data, ocr=None if images_for_llm else ocr, asr=asr, cache=cache)
 
     if not output_schema:
         return input_data
@@ -134,13 +134,13 @@ async def extract_qa(
     multiple: bool = False,
     multiple_description: str = "",
     ocr: OCR | None = None,
-    asr: ASRModel | None = None
+    asr: ASRModel | None = None,
+    cache: ResultCache | None = None
 ) -> dict | list[dict]:
     if all(value is None for value in input_data.values()):
         return input_data
 
-    input_data = await ocr_images(input_data, ocr)
-    input_data = await transcribe_audio(input_data, asr)
+    input_data = await ocr_images_and_transcribe_audio(input_data, ocr=ocr, asr=asr, cache=cache)
 
     if not output_schema:
         return input_data
@@ -8,7 +8,7 @@ from bpm_ai_core.tracing.decorators import trace
 
 from bpm_ai.common.errors import MissingParameterError
 from bpm_ai.common.json_utils import json_to_md
-from bpm_ai.common.multimodal import transcribe_audio, prepare_images_for_llm_prompt, ocr_images
+from bpm_ai.common.multimodal import prepare_images_for_llm_prompt, ocr_images_and_transcribe_audio, ResultCache
 
 
 @trace("bpm-ai-generic", ["llm"])
@@ -18,7 +18,8 @@ async def generic_llm(
     instructions: str,
     output_schema: dict[str, str | dict],
     ocr: OCR | None = None,
-    asr: ASRModel | None = None
+    asr: ASRModel | None = None,
+    cache: ResultCache | None = None
 ) -> dict:
     if not instructions or instructions.isspace():
         raise MissingParameterError("instructions are required")
@@ -32,11 +33,10 @@ async def generic_llm(
         callable=lambda **x: x
     )
 
-    if llm.supports_images():
+    images_for_llm = llm.supports_images()
+    if images_for_llm:
         input_data = prepare_images_for_llm_prompt(input_data)
-    else:
-        input_data = await ocr_images(input_data, ocr)
-    input_data = await transcribe_audio(input_data, asr)
+    input_data = await ocr_images_and_transcribe_audio(input_data, ocr=None if images_for_llm else ocr, asr=asr, cache=cache)
 
     input_md = json_to_md(input_data).strip()
 
@@ -8,7 +8,7 @@ from bpm_ai_core.tracing.decorators import trace
 from bpm_ai_core.translation.nmt import NMTModel
 
 from bpm_ai.common.errors import BpmAiError, MissingParameterError, LanguageNotFoundError
-from bpm_ai.common.multimodal import transcribe_audio, prepare_images_for_llm_prompt, ocr_images
+from bpm_ai.common.multimodal import prepare_images_for_llm_prompt, ocr_images_and_transcribe_audio, ResultCache
 from bpm_ai.translate.schema import get_translation_output_schema
 
 
@@ -18,7 +18,8 @@ async def translate_llm(
         input_data: dict[str, str | dict | None],
         target_language: str,
         ocr: OCR | None = None,
-        asr: ASRModel | None = None
+        asr: ASRModel | None = None,
+        cache: ResultCache | None = None
 ) -> dict:
     input_items = {k: v for k, v in input_data.items() if v is not None}
     if not input_items:
@@ -34,11 +35,10 @@ async def translate_llm(
         callable=lambda **x: x
     )
 
-    if llm.supports_images():
+    images_for_llm = llm.supports_images()
+    if images_for_llm:
         input_items = prepare_images_for_llm_prompt(input_items)
-    else:
-        input_items = await ocr_images(input_items, ocr)
-    input_items = await transcribe_audio(input_items, asr)
+    input_items = await ocr_images_and_transcribe_audio(input_items, ocr=None if images_for_llm else ocr, asr=asr, cache=cache)
 
     prompt = Prompt.from_file(
         "translate",
@@ -61,7 +61,8 @@ async def translate_nmt(
         input_data: dict[str, str | dict | None],
         target_language: str,
         ocr: OCR | None = None,
-        asr: ASRModel | None = None
+        asr: ASRModel | None = None,
+        cache: ResultCache | None = None
 ) -> dict:
     input_items = {k: v for k, v in input_data.items() if v is not None}
     if not input_items:
@@ -70,8 +71,7 @@ async def translate_nmt(
     if not target_language or target_language.isspace():
         raise MissingParameterError("target language is required")
 
-    input_items = await ocr_images(input_items, ocr)
-    input_items = await transcribe_audio(input_items, asr)
+    input_items = await ocr_images_and_transcribe_audio(input_items, ocr=ocr, asr=asr, cache=cache)
 
     try:
         import langcodes
@@ -82,7 +82,7 @@ async def translate_nmt(
         raise LanguageNotFoundError(f"Could not identify target language '{target_language}'.")
 
     texts_to_translate = list(input_items.values())
-    texts_translated = nmt.translate(texts_to_translate, target_language_code)
+    texts_translated = await nmt.translate(texts_to_translate, target_language_code)
     input_items_translated = {k: texts_translated[i] for i, k in enumerate(input_items.keys())}
 
     return {k: input_items_translated.get(k, None) for k in input_data.keys()}
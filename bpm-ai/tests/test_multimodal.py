@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from bpm_ai_core.ocr.ocr import OCR, OCRResult, OCRPage
+from bpm_ai_core.speech_recognition.asr import ASRModel
+
+from bpm_ai.common.multimodal import ocr_images_and_transcribe_audio, ResultCache, ocr_images
+
+
+class SlowOCR(OCR):
+    async def _do_process(self, blob, language=None, pages=None) -> OCRResult:
+        await asyncio.sleep(0.2)
+        return OCRResult(pages=[OCRPage(text=f"text of {blob.path}", words=[], bboxes=[])])
+
+
+class CountingOCR(SlowOCR):
+    def __init__(self):
+        self.calls = []
+
+    async def _do_process(self, blob, language=None, pages=None) -> OCRResult:
+        self.calls.append(blob.path)
+        return await super()._do_process(blob, language, pages)
+
+
+class SlowASR(ASRModel):
+    async def _do_transcribe(self, audio, language=None) -> str:
+        await asyncio.sleep(0.2)
+        return f"transcript of {audio.name}"
+
+
+async def test_ocr_and_asr_concurrently():
+    input_data = {
+        "scan1": "https://example.com/scan1.png",
+        "scan2": "https://example.com/scan2.jpg",
+        "voice": "test.mp3",
+        "text": "some text",
+    }
+
+    start = time.perf_counter()
+    result = await ocr_images_and_transcribe_audio(input_data, ocr=SlowOCR(), asr=SlowASR(), max_concurrency=4)
+    elapsed = time.perf_counter() - start
+
+    assert list(result.keys()) == list(input_data.keys())
+    assert result["scan1"] == "text of https://example.com/scan1.png"
+    assert result["scan2"] == "text of https://example.com/scan2.jpg"
+    assert result["voice"] == "transcript of audio.mp3"
+    assert result["text"] == "some text"
+    assert elapsed < 0.5
+
+
+async def test_ocr_deduplicates_references():
+    input_data = {
+        "invoice": "https://example.com/invoice.png",
+        "original_document": "HTTPS://Example.com:443/invoice.png#page=1",
+        "other": "https://example.com/other.png",
+    }
+    ocr = CountingOCR()
+
+    result = await ocr_images(input_data, ocr=ocr)
+
+    assert len(ocr.calls) == 2
+    assert result["invoice"] == result["original_document"] == "text of https://example.com/invoice.png"
+    assert result["other"] == "text of https://example.com/other.png"
+
+
+async def test_ocr_result_cache():
+    cache = ResultCache()
+    input_data = {"invoice": "https://example.com/invoice.png"}
+    ocr = CountingOCR()
+
+    first = await ocr_images(input_data, ocr=ocr, cache=cache)
+    second = await ocr_images(input_data, ocr=CountingOCR(), cache=cache)
+    third = await ocr_images(input_data, ocr=ocr, cache=cache)
+
+    assert first == second == third
+    assert len(ocr.calls) == 1
+    assert len(cache) == 1